@@ -1,8 +1,545 @@
+import hashlib
 import json
-from io import StringIO
+import operator
+import random
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterator, Literal
+from urllib.parse import urljoin, urlsplit, urlunsplit
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from aker_utilities.columnar_sink import ColumnarDataset, ColumnarSink
+from aker_utilities.events import EventHook, emit_event
+from aker_utilities.pandas_utils import compact_dtypes, memory_usage_mb
+from aker_utilities.response_cache import CACHE_HEADER, ResponseCache
+
+# Fastest available JSON decoder for the fast transport profile
+try:
+    from orjson import loads as fast_json_loads
+except ImportError:
+    try:
+        from msgspec.json import decode as fast_json_loads
+    except ImportError:
+        from json import loads as fast_json_loads
+
+# SAP OData v2 serializes Edm.DateTime as "/Date(1700000000000)/" or with an offset
+ODATA_DATE_PATTERN = re.compile(r"^/Date\((-?\d+)([+-]\d{4})?\)/$")
+ISO_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# Transient statuses worth a retry of the same request
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# (field, operator, value) filter of `Extractor.get_records`, see `compile_odata_filter`
+ODataFilter = tuple[str, str, Any]
+FILTER_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
+
+
+def _parse_watermark(value: Any) -> tuple[str, Any] | None:
+    """
+    Return (type, comparable value) of a watermark field value, None if it is empty.
+    Types are "number", "datetime" and "string".
+    """
+    if value is None or isinstance(value, bool):
+        return None
+
+    if isinstance(value, (int, float)):
+        return ("number", value)
+
+    value = str(value)
+    if match := ODATA_DATE_PATTERN.match(value):
+        return ("datetime", datetime(1970, 1, 1) + timedelta(milliseconds=int(match[1])))
+
+    if ISO_DATE_PATTERN.match(value):
+        try:
+            return ("datetime", datetime.fromisoformat(value).replace(tzinfo=None))
+        except ValueError:
+            pass
+
+    return ("string", value)
+
+
+def _is_page_too_large(exception: requests.RequestException) -> bool:
+    """Timeouts and these statuses are worth a retry with a smaller page."""
+    if isinstance(exception, requests.Timeout):
+        return True
+
+    response = exception.response
+    return response is not None and response.status_code in (408, 413, 500, 502, 504)
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """Write aside and move, so readers never see a partially written file."""
+    temp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    temp.write_bytes(content)
+    temp.replace(path)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_metadata_document(document: bytes) -> dict[str, dict[str, str]]:
+    """
+    Return {entity set: {property: Edm type}} of an OData `$metadata` (EDMX) document.
+    XML namespaces are ignored, so both OData v2 and v4 documents can be read.
+    """
+    root = ET.fromstring(document)
+
+    entity_types: dict[str, dict[str, str]] = dict()
+    entity_sets: dict[str, str] = dict()
+    for schema in (i for i in root.iter() if _local_name(i.tag) == "Schema"):
+        namespace = schema.get("Namespace", "")
+        for element in schema.iter():
+            tag = _local_name(element.tag)
+            if tag == "EntityType":
+                entity_types[f"{namespace}.{element.get('Name')}"] = {
+                    i.get("Name", ""): i.get("Type", "")
+                    for i in element
+                    if _local_name(i.tag) == "Property"
+                }
+            elif tag == "EntitySet":
+                entity_sets[element.get("Name", "")] = element.get("EntityType", "")
+
+    return {k: entity_types.get(v, dict()) for k, v in entity_sets.items()}
+
+
+def _merge_odata_filter(odata_query: str | None, condition: str) -> str:
+    """Add condition to `$filter` of the query, or append a `$filter` if it has none."""
+    if not odata_query:
+        return f"$filter={condition}"
+
+    options = odata_query.split("&")
+    for i, option in enumerate(options):
+        if option.startswith("$filter="):
+            options[i] = f"$filter=({option[len('$filter='):]}) and ({condition})"
+            return "&".join(options)
+
+    return f"{odata_query}&$filter={condition}"
+
+
+def _retry_delay(
+    attempt: int,
+    backoff_base: float,
+    backoff_max: float,
+    retry_after: str | None = None,
+) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0 based): Retry-After of the service
+    when it gives seconds, otherwise exponential backoff with +-50% jitter, so parallel
+    workers do not retry in lockstep.
+    """
+    if retry_after is not None and retry_after.strip().isdigit():
+        return min(float(retry_after), backoff_max)
+
+    return min(backoff_max, backoff_base * 2**attempt) * random.uniform(0.5, 1.5)
+
+
+def _merge_odata_select(odata_query: str | None, columns: list[str]) -> str:
+    """Set `$select` of the query to the columns, replacing a `$select` it has."""
+    select = f"$select={','.join(columns)}"
+    if not odata_query:
+        return select
+
+    options = [i for i in odata_query.split("&") if not i.startswith("$select=")]
+    return "&".join(options + [select])
+
+
+def _odata_literal(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, datetime):
+        return f"datetime'{value.isoformat(timespec='seconds')}'"
+
+    return f"'{str(value).replace(chr(39), chr(39) * 2)}'"
+
+
+def _check_filters(filters: list[ODataFilter]) -> None:
+    """Raise ValueError for a filter operator `compile_odata_filter` does not support."""
+    for _, op, _ in filters:
+        if op != "in" and op not in FILTER_OPERATORS:
+            supported = ", ".join([*FILTER_OPERATORS, "in"])
+            raise ValueError(f"Unsupported filter operator: {op}, use one of {supported}")
+
+
+def compile_odata_filter(filters: list[ODataFilter]) -> str:
+    """
+    Compile (field, operator, value) filters into a `$filter` expression, all filters
+    must match. Operators are eq, ne, gt, ge, lt, le and in, which takes a list.
+
+    Example:
+        >>> compile_odata_filter([("notType", "in", ["M1", "M2"]), ("prio", "le", 2)])
+        "(notType eq 'M1' or notType eq 'M2') and prio le 2"
+    """
+    _check_filters(filters)
+    conditions: list[str] = list()
+    for field, op, value in filters:
+        if op == "in":
+            alternatives = [f"{field} eq {_odata_literal(i)}" for i in value]
+            conditions.append(f"({' or '.join(alternatives)})")
+        else:
+            conditions.append(f"{field} {op} {_odata_literal(value)}")
+
+    return " and ".join(conditions)
+
+
+def _comparable(value: Any) -> Any:
+    """Value as compared by client-side filters, OData dates become datetimes."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+
+    parsed = _parse_watermark(value)
+    return parsed[1] if parsed is not None else None
+
+
+def _coerce_numbers(actual: Any, expected: Any) -> tuple[Any, Any]:
+    """Numeric strings compared with a number, e.g. SAP's "0002" le 2, become numbers."""
+    pair = [actual, expected]
+    for i, other in [(0, expected), (1, actual)]:
+        if isinstance(pair[i], str) and isinstance(other, (int, float)):
+            for cast in (int, float):
+                try:
+                    pair[i] = cast(pair[i])
+                    break
+                except ValueError:
+                    continue
+
+    return pair[0], pair[1]
+
+
+def _later_watermark(value: tuple[str, Any], high: tuple[str, Any]) -> bool:
+    """
+    True if watermark `value` is later than `high`. Both are parsed again, so a string
+    from the state file compares with a parsed datetime or number, and values that
+    still have different types are compared as str.
+    """
+    (actual, expected) = (value[1], high[1])
+    if not isinstance(actual, datetime):
+        actual = (_parse_watermark(actual) or value)[1]
+    if not isinstance(expected, datetime):
+        expected = (_parse_watermark(expected) or high)[1]
+
+    (actual, expected) = _coerce_numbers(actual, expected)
+    try:
+        return actual > expected
+    except TypeError:
+        return str(actual) > str(expected)
+
+
+def _match_filters(record: dict, filters: list[ODataFilter]) -> bool:
+    """
+    Client-side counterpart of `compile_odata_filter` for a decoded record. Raises
+    ValueError if a value can not be compared with the filter value.
+    """
+    for field, op, value in filters:
+        actual = _comparable(record.get(field))
+        if op == "in":
+            if not any(
+                operator.eq(*_coerce_numbers(actual, _comparable(i))) for i in value
+            ):
+                return False
+            continue
+
+        expected = _comparable(value)
+        if actual is None or expected is None:
+            # Only eq null / ne null can match a missing value
+            if not FILTER_OPERATORS[op](actual is None, expected is None):
+                return False
+            continue
+
+        (actual, expected) = _coerce_numbers(actual, expected)
+        try:
+            if not FILTER_OPERATORS[op](actual, expected):
+                return False
+        except TypeError as e:
+            raise ValueError(
+                f"Can not filter {field}: {actual!r} {op} {expected!r}"
+            ) from e
+
+    return True
+
+
+class PageSpool:
+    def __init__(self, path: Path, description: dict[str, Any] | None = None):
+        """
+        Local spool of completed pages of a single extraction. Pages are written as
+        they arrive, so a failed extraction can continue after the last good page
+        instead of offset 0. The spool is removed once the extraction completes.
+
+        ```
+        spool/notifications-0f3a9c2e1b7d/
+            manifest.json     {"description": {...}, "pages": [{"skip": 0, ...}]}
+            page-000000000000.json
+            page-000000050000.json
+        ```
+
+        Args:
+            path (Path): Spool directory of the extraction
+            description (dict[str, Any] | None, optional): Kept in the manifest to
+                tell spools apart, e.g. url and query. Defaults to None.
+        """
+        self.path = path
+        self.manifest = self.path / "manifest.json"
+        try:
+            self.state: dict[str, Any] = json.loads(self.manifest.read_text())
+        except FileNotFoundError:
+            self.state = {"description": description or dict(), "pages": list()}
+
+    @property
+    def pages(self) -> list[dict[str, Any]]:
+        return self.state["pages"]
+
+    def resume_point(self) -> tuple[int, str | None, bool]:
+        """Return (skip, next link, complete) to continue the extraction from."""
+        if len(self.pages) == 0:
+            return 0, None, False
+
+        last = self.pages[-1]
+        server_driven = any(i["next_url"] is not None for i in self.pages)
+        complete = server_driven and last["next_url"] is None
+        return last["skip"] + last["rows"], last["next_url"], complete
+
+    def iter_pages(self) -> Iterator[tuple[int, list[dict], dict[str, Any]]]:
+        """Yield spooled (skip, records, stats) in page order."""
+        for page in self.pages:
+            file = self.path / page["file"]
+            content = file.read_bytes()
+            stats = {
+                "url": file.as_uri(),
+                "status": 200,
+                "latency": 0.0,
+                "bytes": len(content),
+                "requests": 0,
+                "next_url": page["next_url"],
+                "spooled": True,
+            }
+            yield page["skip"], fast_json_loads(content), stats
+
+    def write(self, skip: int, records: list[dict], next_url: str | None) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = f"page-{skip:012d}.json"
+        _write_atomic(self.path / file, json.dumps(records).encode())
+
+        self.pages.append(
+            {"skip": skip, "rows": len(records), "next_url": next_url, "file": file}
+        )
+        _write_atomic(self.manifest, json.dumps(self.state, indent=4).encode())
+
+    def clear(self) -> None:
+        if not self.path.exists():
+            return None
+
+        for file in self.path.iterdir():
+            file.unlink()
+        self.path.rmdir()
+
+    def __str__(self) -> str:
+        return f"Page spool: {self.path} ({len(self.pages)} pages)"
+
+    def __repr__(self) -> str:
+        return f"Page spool: {self.path} ({len(self.pages)} pages)"
+
+
+class ExtractorStateStore:
+    def __init__(self, path: Path):
+        """
+        Local JSON state store that keeps the high watermark and the adaptive page size
+        per endpoint between runs, similar to the local `state-store` of Cognite DB
+        extractor.
+
+        ```
+        {
+            "notifications-maintenance-notifications": {
+                "field": "notChangeDate",
+                "type": "datetime",
+                "high": "2024-11-20T00:00:00",
+                "page_size": 80000
+            }
+        }
+        ```
+
+        Args:
+            path (Path): JSON file, created on first save if it does not exist
+        """
+        self.path = path
+        try:
+            self.states: dict[str, dict[str, Any]] = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            self.states = dict()
+
+    def get_watermark(self, table_name: str) -> tuple[str, Any] | None:
+        """Return stored (type, high watermark) for the table, None if not stored."""
+        state = self.states.get(table_name, dict())
+        if "high" not in state:
+            return None
+
+        if state["type"] == "datetime":
+            return ("datetime", datetime.fromisoformat(state["high"]))
+
+        return (state["type"], state["high"])
+
+    def set_watermark(
+        self, table_name: str, field: str, watermark: tuple[str, Any]
+    ) -> None:
+        (kind, high) = watermark
+        self.states.setdefault(table_name, dict()).update(
+            {
+                "field": field,
+                "type": kind,
+                "high": high.isoformat() if isinstance(high, datetime) else high,
+            }
+        )
+
+    def get_page_size(self, table_name: str) -> int | None:
+        return self.states.get(table_name, dict()).get("page_size")
+
+    def set_page_size(self, table_name: str, page_size: int) -> None:
+        self.states.setdefault(table_name, dict())["page_size"] = page_size
+
+    def save(self) -> None:
+        """Write the states to a temporary file first, so a crash keeps the old file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f"{self.path.name}.{threading.get_ident()}.tmp")
+        temp.write_text(json.dumps(self.states, indent=4))
+        temp.replace(self.path)
+
+    def __str__(self) -> str:
+        return f"Extractor state store: {self.path}"
+
+    def __repr__(self) -> str:
+        return f"Extractor state store: {self.path}"
+
+
+class MetadataCache:
+    def __init__(self, path: Path, ttl: timedelta = timedelta(days=1)):
+        """
+        On disk cache of OData `$metadata` documents, one file per service root. A
+        document older than `ttl` is treated as missing and downloaded again.
+
+        Args:
+            path (Path): Cache directory, created on first write if it does not exist
+            ttl (timedelta, optional): Defaults to timedelta(days=1).
+        """
+        self.path = path
+        self.ttl = ttl
+
+    def _file(self, service_root: str) -> Path:
+        return self.path / f"{hashlib.sha1(service_root.encode()).hexdigest()}.xml"
+
+    def get(self, service_root: str) -> bytes | None:
+        """Return the cached document of the service, None if missing or expired."""
+        file = self._file(service_root)
+        try:
+            age = datetime.now().timestamp() - file.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        if age > self.ttl.total_seconds():
+            return None
+
+        return file.read_bytes()
+
+    def set(self, service_root: str, document: bytes) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self._file(service_root), document)
+
+    def __str__(self) -> str:
+        return f"Metadata cache: {self.path} (ttl {self.ttl})"
+
+    def __repr__(self) -> str:
+        return f"Metadata cache: {self.path} (ttl {self.ttl})"
+
+
+class AdaptivePageSize:
+    # Upper bound of a decoded page, keeps a single page well within memory
+    MAX_PAGE_BYTES: int = 100_000_000
+
+    def __init__(
+        self,
+        size: int,
+        min_size: int,
+        max_size: int,
+        target_seconds: float = 20.0,
+    ):
+        """
+        Page size that grows or shrinks `$top` towards the target latency per page,
+        within min and max size. Size changes at most by a factor of 2 per page. Safe
+        to share between the threads fetching pages of an endpoint.
+
+        Args:
+            size (int): Initial page size
+            min_size (int): _description_
+            max_size (int): _description_
+            target_seconds (float, optional): Target latency per page. Defaults to 20.0.
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.size = self._clamp(size)
+        self._lock = threading.Lock()
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    def update(self, rows: int, top: int, seconds: float, nbytes: int) -> None:
+        """Adjust size after a successful page of `rows` requested with `$top=top`."""
+        factor = self.target_seconds / max(seconds, 0.001)
+        if rows > 0 and nbytes > 0:
+            factor = min(factor, self.MAX_PAGE_BYTES / (nbytes / rows) / top)
+
+        # A short page is the end of the collection and says nothing about capacity
+        if rows < top:
+            factor = min(factor, 1.0)
+
+        with self._lock:
+            self.size = self._clamp(top * min(max(factor, 0.5), 2.0))
+
+    def shrink(self, failed: int | None = None) -> bool:
+        """
+        Halve the size after a failed page, False if it is already at min size. The
+        halved size also becomes the max size, so the size does not grow back into a
+        page the service has rejected. If another page has already shrunk the size
+        below the `failed` page size, it is kept as it is.
+        """
+        with self._lock:
+            if failed is not None and self.size < failed:
+                return True
+
+            if self.size <= self.min_size:
+                return False
+
+            self.size = self._clamp(self.size // 2)
+            self.max_size = self.size
+            return True
+
+    def __str__(self) -> str:
+        return f"Adaptive page size: {self.size} [{self.min_size}, {self.max_size}]"
+
+    def __repr__(self) -> str:
+        return f"Adaptive page size: {self.size} [{self.min_size}, {self.max_size}]"
 
 
 class Extractor:
@@ -13,6 +550,27 @@ class Extractor:
         data_keywords: list[str] | None = None,
         page_keywords: tuple[str, str] | None = None,
         is_odata: bool = False,
+        page_size: int = 50_000,
+        max_workers: int = 1,
+        schemas: dict[str, dict[str, str]] | None = None,
+        state_store: Path | None = None,
+        watermark_fields: dict[str, str] | None = None,
+        next_keywords: list[str] | None = None,
+        fast_transport: bool = False,
+        adaptive_page_size: bool = False,
+        page_size_bounds: dict[str, tuple[int, int]] | None = None,
+        target_page_seconds: float = 20.0,
+        timeout: float | None = None,
+        hooks: list[EventHook] | None = None,
+        metadata_cache: Path | None = None,
+        metadata_ttl: timedelta = timedelta(days=1),
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        spool_dir: Path | None = None,
+        response_cache: Path | None = None,
+        response_cache_ttl: timedelta | None = timedelta(hours=12),
+        response_cache_max_bytes: int = 2_000_000_000,
     ):
         """
         _summary_
@@ -26,6 +584,64 @@ class Extractor:
 
             data_keywords (list[str] | None, optional): Defaults: ["d", "results"]
             page_keywords (tuple[str, str] | None, optional): Defaults: ("$skip", "$top")
+            page_size (int, optional): Rows requested per page. Defaults to 50_000.
+            max_workers (int, optional): Number of pages fetched in parallel on the
+                session. Defaults to 1, which walks the pages one after another.
+            schemas (dict[str, dict[str, str]] | None, optional): Column to dtype mapping
+                per table name. Only the given columns are kept, in the given order, and
+                cast once per page. Defaults to None, which keeps all columns as decoded.
+                Example:
+                {"functional-location-object-type": {"objectType": "string"}}
+            state_store (Path | None, optional): JSON file where high watermarks are kept
+                for incremental extraction. Defaults to None.
+            watermark_fields (dict[str, str] | None, optional): Change-date or key column
+                per table name used as watermark in incremental extraction.
+                Example:
+                {"notifications-maintenance-notifications": "notChangeDate"}
+            next_keywords (list[str] | None, optional): Path to the next page link in the
+                response. Defaults: ["d", "__next"], ["@odata.nextLink"] and
+                ["odata.nextLink"] are looked up. Next links are followed instead of
+                `$skip` offsets when the first page carries one.
+            fast_transport (bool, optional): Ask for every content encoding urllib3 can
+                decode (gzip, deflate and br/zstd when brotli/zstandard are installed)
+                and decode response bytes with orjson or msgspec when installed.
+                Defaults to False.
+            adaptive_page_size (bool, optional): Start from `page_size`, or the size
+                remembered in `state_store`, and grow or shrink `$top` per page towards
+                `target_page_seconds`. Failed pages (timeout, 408, 413, 5xx) are retried
+                with half the size. Defaults to False.
+            page_size_bounds (dict[str, tuple[int, int]] | None, optional): (min, max)
+                page size per table name for adaptive page size.
+                Defaults to (1_000, 500_000) for all tables.
+            target_page_seconds (float, optional): Defaults to 20.0.
+            timeout (float | None, optional): Seconds to wait for a page response.
+                Defaults to None, which waits forever.
+            hooks (list[EventHook] | None, optional): Callables receiving a "page" event
+                per page (table, url, status, latency, bytes, rows, rows_per_sec) and an
+                "endpoint" summary per table, e.g. `JsonLinesEventWriter` or
+                `EventCollector`. Defaults to None.
+            metadata_cache (Path | None, optional): Directory where `$metadata`
+                documents are cached for column discovery, see `get_column_types`.
+                Defaults to None, which keeps them in memory only.
+            metadata_ttl (timedelta, optional): Max age of a cached `$metadata`
+                document. Defaults to timedelta(days=1).
+            max_retries (int, optional): Retries of a page failing with 429, 5xx or a
+                connection error, waiting Retry-After or a jittered exponential backoff.
+                Defaults to 3.
+            backoff_base (float, optional): Seconds before the first retry, doubled per
+                retry. Defaults to 1.0.
+            backoff_max (float, optional): Max seconds between retries. Defaults to 60.
+            spool_dir (Path | None, optional): Directory where completed pages are
+                spooled, see `PageSpool`. A failed extraction started again with the
+                same arguments continues after the last spooled page. Defaults to None.
+            response_cache (Path | None, optional): Directory where page and count
+                responses are cached by url, for development runs that pull the same
+                endpoint again and again, see `ResponseCache`. Defaults to None.
+            response_cache_ttl (timedelta | None, optional): Age until a cached
+                response is revalidated with its ETag/Last-Modified, None to never
+                revalidate. Defaults to timedelta(hours=12).
+            response_cache_max_bytes (int, optional): Size cap of the response cache,
+                least recently used responses are evicted. Defaults to 2_000_000_000.
         """
         self.api_key = api_key
 
@@ -44,29 +660,819 @@ class Extractor:
         else:
             self.page_keywords = page_keywords
 
+        if next_keywords is None:
+            self.next_keywords = [
+                ["d", "__next"],
+                ["@odata.nextLink"],
+                ["odata.nextLink"],
+            ]
+        else:
+            self.next_keywords = [next_keywords]
+
         self.is_odata = is_odata
+        self.page_size = page_size
+        self.max_workers = max(1, max_workers)
+        self.schemas = schemas if schemas is not None else dict()
+        self.state_store = ExtractorStateStore(state_store) if state_store else None
+        self.watermark_fields = watermark_fields if watermark_fields is not None else {}
+        self.adaptive_page_size = adaptive_page_size
+        self.page_size_bounds = page_size_bounds if page_size_bounds is not None else {}
+        self.target_page_seconds = target_page_seconds
+        self.timeout = timeout
+        self.hooks = hooks if hooks is not None else list()
+        self.metadata_cache = (
+            MetadataCache(metadata_cache, metadata_ttl) if metadata_cache else None
+        )
+        self._metadata: dict[str, dict[str, dict[str, str]]] = dict()
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.spool_dir = spool_dir
+        self.response_cache = (
+            ResponseCache(response_cache, response_cache_ttl, response_cache_max_bytes)
+            if response_cache
+            else None
+        )
+        # Query options rejected by the service per table, applied client side instead
+        self._unsupported_options: dict[str, set[str]] = defaultdict(set)
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Cache-Control": "no-cache",
-                self.auth_keyword: self.api_key,
-                "Accept": "application/json",
-            }
+        self.fast_transport = fast_transport
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+
+    def _request_headers(self) -> dict[str, str]:
+        headers = {
+            "Cache-Control": "no-cache",
+            self.auth_keyword: self.api_key,
+            "Accept": "application/json",
+        }
+        if self.fast_transport:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+        return headers
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled requests session, created on first use."""
+        with self._session_lock:
+            if self._session is None:
+                self._session = requests.Session()
+                # Default pool keeps 10 connections per host, room for parallel pages
+                adapter = HTTPAdapter(pool_maxsize=max(10, self.max_workers))
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+                self._session.headers.update(self._request_headers())
+
+            return self._session
+
+    def _build_url(
+        self,
+        api_domain: str,
+        skip: int | None,
+        top: int,
+        odata_query: str | None = None,
+    ) -> str:
+        (skip_keyword, top_keyword) = self.page_keywords
+
+        if skip is None:
+            url = f"{api_domain}?{top_keyword}={top}"
+        else:
+            url = f"{api_domain}?{skip_keyword}={skip}&{top_keyword}={top}"
+
+        if self.is_odata and odata_query:
+            url = f"{url}&{odata_query}"
+
+        return url
+
+    def _next_link(self, payload: Any, url: str) -> str | None:
+        """
+        Return absolute next link of the page payload, None if there is no next page.
+        A link pointing to another host, i.e. the SAP backend behind the APIM gateway,
+        is rebased on the host of the requested url.
+        """
+        for path in self.next_keywords:
+            temp = payload
+            try:
+                for key in path:
+                    temp = temp[key]
+            except (KeyError, TypeError, IndexError):
+                continue
+
+            if not temp:
+                continue
+
+            next_url = urlsplit(urljoin(url, temp))
+            requested = urlsplit(url)
+            if next_url.netloc != requested.netloc:
+                next_url = requested._replace(query=next_url.query)
+
+            return urlunsplit(next_url)
+
+        return None
+
+    def _get(self, url: str) -> requests.Response:
+        """GET on the session, through the response cache when there is one."""
+        if self.response_cache is None:
+            return self.session.get(url, timeout=self.timeout)
+
+        return self.response_cache.get(self.session, url, timeout=self.timeout)
+
+    def _decode(self, response: requests.Response) -> Any:
+        if self.fast_transport:
+            return fast_json_loads(response.content)
+
+        return response.json()
+
+    def _request_page(self, url: str) -> tuple[list[dict], str | None, dict[str, Any]]:
+        """
+        Return records, next link and stats (url, status, latency, bytes, next_url) of
+        a page. Transient failures, 429, 5xx and connection errors, are retried.
+        """
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self._get(url)
+            except requests.ConnectionError as e:
+                if attempt == self.max_retries:
+                    raise
+                self._wait_for_retry(url, attempt, repr(e))
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                retry_after = response.headers.get("Retry-After")
+                self._wait_for_retry(url, attempt, response.status_code, retry_after)
+                continue
+
+            response.raise_for_status()
+            break
+
+        payload = self._decode(response)
+        next_url = self._next_link(payload, url)
+
+        stats: dict[str, Any] = {
+            "url": url,
+            "status": response.status_code,
+            "latency": time.perf_counter() - start,
+            "bytes": len(response.content),
+            "requests": 1,
+            "next_url": next_url,
+            "cache": response.headers.get(CACHE_HEADER),
+        }
+
+        temp = payload
+        for key in self.data_keywords:
+            temp = temp[key]
+
+        return temp, next_url, stats
+
+    def _wait_for_retry(
+        self, url: str, attempt: int, reason: Any, retry_after: str | None = None
+    ) -> None:
+        time.sleep(self._announce_retry(url, attempt, reason, retry_after))
+
+    def _announce_retry(
+        self, url: str, attempt: int, reason: Any, retry_after: str | None = None
+    ) -> float:
+        """Report retry number `attempt` (0 based) and return the seconds to wait."""
+        delay = _retry_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+        print(f"\nRetry {attempt + 1}/{self.max_retries} in {delay:.1f} s ({reason})")
+        if self.hooks:
+            emit_event(
+                self.hooks,
+                "retry",
+                url=url,
+                attempt=attempt + 1,
+                reason=reason,
+                delay=delay,
+            )
+        return delay
+
+    def _get_page(self, url: str) -> list[dict]:
+        return self._request_page(url)[0]
+
+    def _request_range(
+        self,
+        api_domain: str,
+        skip: int,
+        top: int,
+        odata_query: str | None = None,
+        sizer: AdaptivePageSize | None = None,
+    ) -> tuple[list[dict], str | None, dict[str, Any]]:
+        """
+        Request rows [skip, skip + top). If the page fails with a timeout or a status
+        hinting at a too large page, the adaptive size is halved and the same range is
+        requested in smaller pages, so offsets of the pages planned after it still hold.
+        """
+        records: list[dict] = list()
+        stats: dict[str, Any] = dict()
+        size: int = top
+        while True:
+            step = min(size, top - len(records))
+            url = self._build_url(api_domain, skip + len(records), step, odata_query)
+            try:
+                page, next_url, page_stats = self._request_page(url)
+            except requests.RequestException as e:
+                if sizer is None or not _is_page_too_large(e) or not sizer.shrink(step):
+                    raise
+                print(f"\nPage of {step} rows failed ({e}), retry with {sizer.size}")
+                size = min(step, sizer.size)
+                continue
+
+            if len(stats) == 0:
+                (records, stats) = (page, page_stats)
+            else:
+                records.extend(page)
+                stats["latency"] += page_stats["latency"]
+                stats["bytes"] += page_stats["bytes"]
+                stats["requests"] += 1
+
+            if len(page) < step or len(records) >= top or next_url is not None:
+                return records, next_url, stats
+
+    def _page_sizer(self, table_name: str) -> AdaptivePageSize | None:
+        if not self.adaptive_page_size:
+            return None
+
+        stored = self.state_store.get_page_size(table_name) if self.state_store else None
+        (min_size, max_size) = self.page_size_bounds.get(
+            table_name, (min(1_000, self.page_size), max(500_000, self.page_size))
+        )
+        return AdaptivePageSize(
+            size=stored if stored is not None else self.page_size,
+            min_size=min_size,
+            max_size=max_size,
+            target_seconds=self.target_page_seconds,
         )
 
-    def get_records(
+    def get_record_count(
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None = None,
+    ) -> int | None:
+        """
+        Return total number of records served by the endpoint, or None if the service
+        does not expose a count.
+
+        OData v2 `/$count` is tried first, then `$inlinecount=allpages` (v2) and
+        `$count=true` (v4) on a single row request.
+
+        Args:
+            endpoint_tuple (tuple[str, str, str]): (api_domain, table_name, table_key)
+            odata_query (str | None, optional): Filter applied to the count when the
+                extractor is OData. Defaults to None.
+
+        Returns:
+            int | None: Record count or None if it could not be determined
+        """
+        api_domain = endpoint_tuple[0]
+        query = f"?{odata_query}" if self.is_odata and odata_query else ""
+
+        try:
+            response = self._get(f"{api_domain}/$count{query}")
+            if response.ok:
+                return int(response.text.strip())
+        except (requests.RequestException, ValueError):
+            pass
+
+        for count_option in ("$inlinecount=allpages", "$count=true"):
+            try:
+                response = self._get(
+                    f"{self._build_url(api_domain, None, 1, odata_query)}&{count_option}"
+                )
+                if not response.ok:
+                    continue
+                return self._count_from_payload(response.json())
+            except (requests.RequestException, ValueError, KeyError, TypeError):
+                continue
+
+        return None
+
+    def _count_from_payload(self, payload: dict) -> int:
+        """Inline count of a `$inlinecount=allpages` (v2) or `$count=true` (v4) page."""
+        if "@odata.count" in payload:
+            return int(payload["@odata.count"])
+        for key in self.data_keywords[:-1]:
+            payload = payload[key]
+
+        return int(payload["__count"])
+
+    def _iter_next_links(
+        self,
+        records: list[dict],
+        next_url: str | None,
+        stats: dict[str, Any],
+        row_cap: int | None = None,
+        skip: int = 0,
+    ) -> Iterator[tuple[int, list[dict], dict[str, Any]]]:
+        """Yield (skip, records, stats) of the first page and follow next links."""
+        while True:
+            if row_cap is not None:
+                records = records[: row_cap - skip]
+            yield skip, records, stats
+
+            skip += len(records)
+            if next_url is None or (row_cap is not None and skip >= row_cap):
+                break
+
+            records, next_url, stats = self._request_page(next_url)
+
+    def _iter_pages_concurrently(
         self,
         endpoint_tuple: tuple[str, str, str],
         odata_query: str | None = None,
         limit: int | None = None,
+        sizer: AdaptivePageSize | None = None,
+        start: int = 0,
+    ) -> Iterator[tuple[int, list[dict], dict[str, Any]]]:
+        """
+        Fetch pages in parallel on the session and yield (skip, records, stats) in page
+        order, from row `start` on.
+
+        Pages are planned from the record count when the service exposes one, otherwise
+        the collection is probed `max_workers` pages ahead until a short page arrives.
+        If the first page carries a next link, links are followed one after another
+        since they can not be requested ahead.
+        """
+        api_domain = endpoint_tuple[0]
+        row_cap = limit if limit is not None and limit > 0 else None
+
+        def page_size(skip: int) -> int:
+            top = sizer.size if sizer is not None else self.page_size
+            return top if row_cap is None else min(top, row_cap - skip)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            count = pool.submit(self.get_record_count, endpoint_tuple, odata_query)
+
+            top = page_size(start)
+            if top <= 0:
+                return None
+
+            first_page = pool.submit(
+                self._request_range, api_domain, start, top, odata_query, sizer
+            )
+            (records, next_url, stats) = first_page.result()
+            if next_url is not None:
+                yield from self._iter_next_links(records, next_url, stats, row_cap, start)
+                return None
+
+            planned = count.result()
+            if planned is not None and row_cap is not None:
+                planned = min(planned, row_cap)
+
+            fetched: Future = Future()
+            fetched.set_result((records, next_url, stats))
+            pending: deque = deque([(start, top, fetched)])
+            skip: int = start + top
+            done: bool = False
+
+            while True:
+                while not done and len(pending) < self.max_workers:
+                    top = page_size(skip)
+                    if top <= 0 or (planned is not None and skip >= planned):
+                        break
+
+                    future = pool.submit(
+                        self._request_range, api_domain, skip, top, odata_query, sizer
+                    )
+                    pending.append((skip, top, future))
+                    skip += top
+
+                if not pending:
+                    break
+
+                page_skip, top, future = pending.popleft()
+                (records, _, stats) = future.result()
+                if sizer is not None and stats["requests"] == 1:
+                    sizer.update(len(records), top, stats["latency"], stats["bytes"])
+                yield page_skip, records, stats
+
+                if len(records) < top:
+                    if planned is None:
+                        # Probing: short page marks the end of the collection
+                        done = True
+                        for _, _, rest in pending:
+                            rest.cancel()
+                        pending.clear()
+                elif planned is not None and page_skip + top >= planned:
+                    # Last planned page came back full, collection may have grown since
+                    # it was counted so keep probing
+                    planned = None
+
+    def _iter_pages(
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None = None,
+        limit: int | None = None,
+        sizer: AdaptivePageSize | None = None,
+        start: int = 0,
+    ) -> Iterator[tuple[int, list[dict], dict[str, Any]]]:
+        """
+        Walk pages one after another from row `start` on and yield (skip, records,
+        stats). Next links are followed when the first page carries one, `$skip/$top`
+        offsets are used otherwise.
+        """
+        api_domain = endpoint_tuple[0]
+        row_cap = limit if limit is not None and limit > 0 else None
+
+        skip: int = start
+        while True:
+            top = sizer.size if sizer is not None else self.page_size
+            if row_cap is not None:
+                top = min(top, row_cap - skip)
+            if top <= 0:
+                break
+
+            (records, next_url, stats) = self._request_range(
+                api_domain, skip, top, odata_query, sizer
+            )
+            if skip == start and next_url is not None:
+                yield from self._iter_next_links(records, next_url, stats, row_cap, skip)
+                return None
+
+            if sizer is not None and stats["requests"] == 1:
+                sizer.update(len(records), top, stats["latency"], stats["bytes"])
+            yield skip, records, stats
+
+            skip += len(records)
+            if len(records) < top:
+                break
+
+    def _to_frame(
+        self,
+        records: list[dict],
+        schema: dict[str, str] | None = None,
+        columns: list[str] | None = None,
     ) -> pd.DataFrame:
+        """
+        Build the page frame straight from the decoded records, no re-serialization.
+        """
+        if schema is None:
+            return pd.DataFrame.from_records(records, columns=columns)
+
+        return pd.DataFrame.from_records(records, columns=list(schema)).astype(schema)
+
+    def _watermark_query(
+        self, table_name: str, odata_query: str | None = None
+    ) -> tuple[str, str | None]:
+        """
+        Return watermark field of the table and the query filtered on the stored high
+        watermark. Datetime watermarks are compared with `ge`, since SAP change dates
+        are often day precise, number and string watermarks with `gt`.
+        """
+        if self.state_store is None or table_name not in self.watermark_fields:
+            raise ValueError(
+                f"Incremental extraction of {table_name} needs a state_store and a "
+                "watermark field for the table"
+            )
+        if not self.is_odata:
+            raise ValueError("Incremental extraction needs is_odata=True")
+
+        field = self.watermark_fields[table_name]
+        watermark = self.state_store.get_watermark(table_name)
+        if watermark is None:
+            return field, odata_query
+
+        (kind, high) = watermark
+        if kind == "datetime":
+            condition = f"{field} ge datetime'{high.isoformat(timespec='seconds')}'"
+        elif kind == "number":
+            condition = f"{field} gt {high}"
+        else:
+            condition = f"{field} gt '{str(high).replace(chr(39), chr(39) * 2)}'"
+
+        return field, _merge_odata_filter(odata_query, condition)
+
+    def _page_spool(
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None,
+        limit: int | None,
+        columns: list[str] | None,
+        filters: list[ODataFilter] | None,
+    ) -> PageSpool | None:
+        """Spool of the extraction, the same arguments always give the same spool."""
+        if self.spool_dir is None:
+            return None
+
+        description = {
+            "url": endpoint_tuple[0],
+            "query": odata_query,
+            "limit": limit if limit is not None and limit > 0 else None,
+            "columns": columns,
+            "filters": filters,
+        }
+        key = hashlib.sha1(json.dumps(description, default=str).encode()).hexdigest()
+        path = self.spool_dir / f"{endpoint_tuple[1]}-{key[:12]}"
+
+        return PageSpool(path, json.loads(json.dumps(description, default=str)))
+
+    @staticmethod
+    def _project(records: list[dict], columns: list[str] | None) -> list[dict]:
+        """Keep only the columns, e.g. SAP adds `__metadata` to a `$select`."""
+        if columns is None or len(records) == 0 or list(records[0]) == columns:
+            return records
+
+        return [{k: i.get(k) for k in columns} for i in records]
+
+    def _iter_query_pages(
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None = None,
+        limit: int | None = None,
+        sizer: AdaptivePageSize | None = None,
+        start: tuple[int, str | None] = (0, None),
+    ) -> Iterator[tuple[int, list[dict], dict[str, Any]]]:
+        """Page iterator from (skip, next link) on, next link None for offsets."""
+        (skip, next_url) = start
+        if next_url is not None:
+            return self._iter_resumed_links(next_url, skip, limit)
+
+        paginate = limit is None or limit <= 0 or limit > self.page_size
+        if self.max_workers > 1 and paginate:
+            return self._iter_pages_concurrently(
+                endpoint_tuple, odata_query, limit, sizer, skip
+            )
+
+        return self._iter_pages(endpoint_tuple, odata_query, limit, sizer, skip)
+
+    def _iter_resumed_links(
+        self, next_url: str, skip: int, limit: int | None = None
+    ) -> Iterator[tuple[int, list[dict], dict[str, Any]]]:
+        row_cap = limit if limit is not None and limit > 0 else None
+        if row_cap is not None and skip >= row_cap:
+            return None
+
+        (records, next_url, stats) = self._request_page(next_url)  # type: ignore
+        yield from self._iter_next_links(records, next_url, stats, row_cap, skip)
+
+    def _pushdown_pages(
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None,
+        limit: int | None,
+        sizer: AdaptivePageSize | None,
+        columns: list[str] | None,
+        filters: list[ODataFilter] | None,
+        watermark_field: str | None = None,
+        start: tuple[int, str | None] = (0, None),
+    ) -> tuple[Iterator[tuple[int, list[dict], dict[str, Any]]], list[ODataFilter]]:
+        """
+        Return page iterator with `$select`/`$filter` pushed down to the service and the
+        filters left to apply client side. Options rejected with 400/501 on the first
+        page are dropped one plan after another, and remembered for the table.
+        """
+        table_name = endpoint_tuple[1]
+        unsupported = self._unsupported_options[table_name]
+        selects = [True, False] if columns and "$select" not in unsupported else [False]
+        wheres = [True, False] if filters and "$filter" not in unsupported else [False]
+        if not self.is_odata:
+            (selects, wheres) = ([False], [False])
+
+        # The watermark can only be tracked if its field comes back
+        select_columns = list(columns or [])
+        if watermark_field is not None and watermark_field not in select_columns:
+            select_columns.append(watermark_field)
+
+        plans = [(select, where) for where in wheres for select in selects]
+        for n, (select, where) in enumerate(plans):
+            query = odata_query
+            if where:
+                query = _merge_odata_filter(query, compile_odata_filter(filters or []))
+            if select:
+                query = _merge_odata_select(query, select_columns)
+
+            pages = self._iter_query_pages(endpoint_tuple, query, limit, sizer, start)
+            try:
+                first = next(pages, None)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if n == len(plans) - 1 or status not in (400, 501):
+                    raise
+                print(f"\n{table_name}: query options rejected ({e}), retry without")
+                continue
+
+            if columns and not select:
+                unsupported.add("$select")
+            if filters and not where:
+                unsupported.add("$filter")
+
+            if first is not None:
+                pages = chain([first], pages)
+            return pages, [] if where or filters is None else filters
+
+        raise RuntimeError(f"No query plan left for {table_name}")
+
+    @staticmethod
+    def _empty_summary() -> dict[str, Any]:
+        return {
+            "pages": 0,
+            "rows": 0,
+            "bytes": 0,
+            "latency": 0.0,
+            "slowest_page_url": None,
+            "slowest_page_latency": 0.0,
+        }
+
+    def _page_event(
+        self,
+        summary: dict[str, Any],
+        table_name: str,
+        skip: int,
+        records: list[dict],
+        stats: dict[str, Any],
+    ) -> None:
+        """Emit a "page" event and roll it up into the endpoint summary."""
+        if not self.hooks:
+            return None
+
+        page = emit_event(
+            self.hooks,
+            "page",
+            table=table_name,
+            skip=skip,
+            rows=len(records),
+            rows_per_sec=len(records) / max(stats["latency"], 1e-9),
+            **stats,
+        )
+
+        summary["pages"] += 1
+        for key in ("rows", "bytes", "latency"):
+            summary[key] += page[key]
+        if page["latency"] >= summary["slowest_page_latency"]:
+            summary["slowest_page_url"] = page["url"]
+            summary["slowest_page_latency"] = page["latency"]
+
+    def _endpoint_event(
+        self, summary: dict[str, Any], table_name: str, start: float
+    ) -> None:
+        """Emit the "endpoint" summary, `start` is the perf_counter of the first page."""
+        if not self.hooks:
+            return None
+
+        seconds = time.perf_counter() - start
+        emit_event(
+            self.hooks,
+            "endpoint",
+            table=table_name,
+            seconds=seconds,
+            rows_per_sec=summary["rows"] / max(seconds, 1e-9),
+            **summary,
+        )
+
+    def iter_records(
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None = None,
+        limit: int | None = None,
+        as_records: bool = False,
+        incremental: bool = False,
+        columns: list[str] | None = None,
+        filters: list[ODataFilter] | None = None,
+    ) -> Iterator[pd.DataFrame | list[dict]]:
+        """
+        Yield records of the given api endpoint page by page, so that callers can
+        process large endpoints without holding the whole table in memory.
+
+        Pages are fetched in parallel when the extractor has `max_workers` > 1, but they
+        are always yielded in the original page order. Empty pages are not yielded.
+
+        Args:
+            endpoint_tuple (tuple[str, str, str]): (api_domain, table_name, table_key)
+            odata_query (str | None, optional): Appended to the url if `is_odata`.
+            limit (int | None, optional): Max number of rows, None or <= 0 for no limit
+            as_records (bool, optional): Yield list of dicts as decoded from the
+                response instead of a DataFrame. Defaults to False.
+            incremental (bool, optional): Only fetch records changed since the high
+                watermark stored for the table, see `watermark_fields`. The new high
+                watermark is saved once all pages are fetched without a limit.
+                Defaults to False.
+            columns (list[str] | None, optional): Only these columns, sent as `$select`
+                and projected client side as well. Defaults to None.
+            filters (list[ODataFilter] | None, optional): (field, operator, value)
+                filters sent as `$filter`, see `compile_odata_filter`. If the service
+                rejects `$select` or `$filter` with 400/501, the option is applied
+                client side instead, then `limit` counts rows before filtering.
+                Raises ValueError for an unsupported operator. Defaults to None.
+
+        Example:
+            >>> notif = APIM_SAP.notifications_maintenance_notifications
+            >>> for page in apim.iter_records(notif):
+            >>>     cdf.insert_records_into_raw("e2e-maintenance-sap", notif[1], page)
+
+        Yields:
+            pd.DataFrame | list[dict]: Records of a single page
+        """
+        _check_filters(filters or [])
+        table_name = endpoint_tuple[1]
+        schema = self.schemas.get(table_name)
+        print(f"\n{'# '+ table_name +' ':->100}")
+
+        watermark_field: str | None = None
+        watermark: tuple[str, Any] | None = None
+        if incremental:
+            watermark_field, odata_query = self._watermark_query(table_name, odata_query)
+            watermark = self.state_store.get_watermark(table_name)  # type: ignore
+
+        start = time.perf_counter()
+        summary = self._empty_summary()
+
+        sizer = self._page_sizer(table_name)
+        spool = self._page_spool(endpoint_tuple, odata_query, limit, columns, filters)
+        (skip, next_url, complete) = (0, None, False)
+        if spool is not None:
+            (skip, next_url, complete) = spool.resume_point()
+            if skip > 0:
+                print(f"Resuming {table_name} from row {skip}, {spool}")
+
+        client_filters: list[ODataFilter] = list()
+        pages: Iterator = iter([])
+        if not complete:
+            (pages, client_filters) = self._pushdown_pages(
+                endpoint_tuple,
+                odata_query,
+                limit,
+                sizer,
+                columns,
+                filters,
+                watermark_field,
+                (skip, next_url),
+            )
+        if spool is not None:
+            pages = chain(spool.iter_pages(), pages)
+
+        for skip, records, stats in pages:
+            print(f"Rows -> {skip:>8} : {skip + len(records):<8} fetched", end="\r")
+            self._page_event(summary, table_name, skip, records, stats)
+            if spool is not None and not stats.get("spooled"):
+                spool.write(skip, records, stats.get("next_url"))
+
+            # Spooled pages may have been fetched with or without $filter pushed down,
+            # filtering twice does not change them
+            page_filters = filters if stats.get("spooled") else client_filters
+            if page_filters:
+                records = [i for i in records if _match_filters(i, page_filters)]
+            if len(records) == 0:
+                continue
+
+            if watermark_field is not None:
+                for i in records:
+                    value = _parse_watermark(i.get(watermark_field))
+                    if value is None:
+                        continue
+                    if watermark is None or _later_watermark(value, watermark):
+                        watermark = value
+
+            if as_records:
+                yield self._project(records, columns)
+            else:
+                yield self._to_frame(records, schema, columns)
+
+        # Make sure logging on console starts a new line for next print after execution
+        print("\n")
+
+        self._endpoint_event(summary, table_name, start)
+        if spool is not None:
+            spool.clear()
+
+        if self.state_store is not None:
+            # A limited pull does not guarantee the max watermark has been seen
+            if watermark_field is not None and watermark is not None:
+                if limit is None or limit <= 0:
+                    self.state_store.set_watermark(
+                        table_name, watermark_field, watermark
+                    )
+            if sizer is not None:
+                self.state_store.set_page_size(table_name, sizer.size)
+            self.state_store.save()
+
+    def get_records(
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None = None,
+        limit: int | None = None,
+        incremental: bool = False,
+        sink: Path | None = None,
+        sink_format: Literal["parquet", "arrow"] = "parquet",
+        columns: list[str] | None = None,
+        filters: list[ODataFilter] | None = None,
+    ) -> pd.DataFrame | ColumnarDataset:
         """
         Return desired amount of records for given api endpoints.
 
         Args:
             endpoint_tuple (tuple[str, str, str]): _description_
             limit (int):  Default to 25 in SDK, set <= 0 for no limit
+            incremental (bool): Only return the delta since the stored high watermark,
+                see `iter_records`. Defaults to False.
+            sink (Path | None): Write pages straight into this directory as they arrive
+                instead of building a DataFrame, see `ColumnarSink`. Only one page is
+                held in memory and a lazy `ColumnarDataset` is returned.
+                Defaults to None.
+            sink_format (Literal["parquet", "arrow"]): Partitioned Parquet dataset or
+                Arrow IPC stream. Defaults to "parquet".
+            columns (list[str] | None): Only fetch these columns, see `iter_records`.
+            filters (list[ODataFilter] | None): Only fetch records matching all
+                (field, operator, value) filters, see `iter_records`.
 
         ```
         APIM_SAP_ENDPOINTS: dict[str, tuple[str, str, str]] = dict(
@@ -86,82 +1492,48 @@ class Extractor:
             >>> apim.get_records([APIM_SAP_ENDPOINTS["functional-location-object-type"]])
 
         Returns:
-            dict[str, pd.DataFrame]: _description_
+            pd.DataFrame | ColumnarDataset: ColumnarDataset if a sink is given
         """
-        (api_domain, table_name, table_key) = endpoint_tuple
-        (skip_keyword, top_keyword) = self.page_keywords
-
-        print(f"\n{'# '+ table_name +' ':->100}")
-        api_limit: int = 50_000
-        temp_df: pd.DataFrame = pd.DataFrame()
-
-        if limit is None or limit > api_limit:
-            row_count: int = api_limit  # this is set to kick start while loop
-            total_row_fetched: int = 0
-            skip: int = 0
-            while row_count == api_limit:
-                if limit is not None and limit > 0:
-                    top_n = min(api_limit, limit - total_row_fetched)
-                else:
-                    top_n = api_limit
-
-                if self.is_odata and odata_query is not None:
-                    url = (
-                        f"{api_domain}?{skip_keyword}={skip}&{top_keyword}={top_n}"
-                        f"&{odata_query}"
-                    )
-                else:
-                    url = f"{api_domain}?{skip_keyword}={skip}&{top_keyword}={top_n}"
-
-                temp = self.session.get(url)
-
-                temp = temp.json()
-                for key in self.data_keywords:
-                    temp = temp[key]
-
-                temp_df = pd.concat(
-                    [
-                        temp_df,
-                        pd.read_json(StringIO(json.dumps(temp)), dtype=False),
-                    ]
-                )
-
-                row_count = len(temp)
-                print(f"Rows -> {skip:>8} : {skip + row_count:<8} fetched", end="\r")
-
-                skip += row_count
-                total_row_fetched += row_count
-        else:
-            if self.is_odata and odata_query is not None:
-                url = f"{api_domain}?{top_keyword}={limit}&{odata_query}"
-            else:
-                url = f"{api_domain}?{top_keyword}={limit}"
-
-            temp = self.session.get(url)
+        if sink is not None:
+            # Frames are only built when a schema asks for pandas dtypes
+            with ColumnarSink(sink, sink_format) as writer:
+                for page in self.iter_records(
+                    endpoint_tuple=endpoint_tuple,
+                    odata_query=odata_query,
+                    limit=limit,
+                    as_records=endpoint_tuple[1] not in self.schemas,
+                    incremental=incremental,
+                    columns=columns,
+                    filters=filters,
+                ):
+                    writer.write(page)
 
-            temp = temp.json()
-            for key in self.data_keywords:
-                temp = temp[key]
+            return writer.dataset
 
-            temp_df = pd.concat(
-                [
-                    temp_df,
-                    pd.read_json(StringIO(json.dumps(temp)), dtype=False),
-                ]
-            )
+        # Pages are concatenated once at the end instead of growing a frame per page
+        pages: list[pd.DataFrame] = list(
+            self.iter_records(
+                endpoint_tuple=endpoint_tuple,
+                odata_query=odata_query,
+                limit=limit,
+                incremental=incremental,
+                columns=columns,
+                filters=filters,
+            )  # type: ignore
+        )
 
-            row_count = len(temp)
-            print(f"Rows -> {'0':>8} : {row_count:<8} fetched", end="\r")
+        if len(pages) == 0:
+            return pd.DataFrame()
 
-        # Make sure logging on console starts a new line for next print after execution
-        print("\n")
-        return temp_df
+        return pd.concat(pages, ignore_index=True)
 
     def get_records_from_multiple_endpoints(
         self,
         list_of_endpoint_tuples: list[tuple[str, str, str]],
         list_of_odata_query: list[str] | None = None,
         limit: int | None = None,
+        incremental: bool = False,
+        compact: bool = False,
     ) -> dict[str, pd.DataFrame]:
         """
         Return table records for given list of api endpoints in alphetical order.
@@ -170,6 +1542,11 @@ class Extractor:
         Args:
             list_of_endpoint_tuples (list[tuple[str, str, str]]):
             limit: Default to 25 in SDK, set <= 0 for no limit
+            incremental: Only return the delta of endpoints with a watermark field,
+                others are fetched in full. Defaults to False.
+            compact: Return compact dtypes instead of all columns as str, see
+                `compact_dtypes`. Memory before and after is printed and sent to hooks
+                as a "compact" event. Defaults to False.
 
         Example:
             # For multiple table extraction
@@ -191,17 +1568,120 @@ class Extractor:
         api_data_dict: dict[str, pd.DataFrame] = dict()
         for endpoint_tuple, odata_query in sorted(endpoint_query_pairs):
             temp_df = self.get_records(
-                endpoint_tuple=endpoint_tuple, odata_query=odata_query, limit=limit
+                endpoint_tuple=endpoint_tuple,
+                odata_query=odata_query,
+                limit=limit,
+                incremental=incremental and endpoint_tuple[1] in self.watermark_fields,
             )
 
             # table_name = api_endpoint[1]
-            api_data_dict[endpoint_tuple[1]] = temp_df.astype(dtype=str)
+            api_data_dict[endpoint_tuple[1]] = self._finalize_frame(
+                endpoint_tuple[1], temp_df, compact
+            )
 
         return api_data_dict
 
+    def _finalize_frame(
+        self, table_name: str, df: pd.DataFrame, compact: bool = False
+    ) -> pd.DataFrame:
+        """All columns as str, or compact dtypes reporting memory before and after."""
+        if not compact:
+            return df.astype(dtype=str)
+
+        before = memory_usage_mb(df)
+        df = compact_dtypes(df)
+        after = memory_usage_mb(df)
+        print(f"Memory -> {table_name}: {before:.1f} MB : {after:.1f} MB compact")
+        if self.hooks:
+            emit_event(
+                self.hooks,
+                "compact",
+                table=table_name,
+                memory_before_mb=before,
+                memory_after_mb=after,
+            )
+
+        return df
+
+    @staticmethod
+    def _service_root(api_domain: str) -> tuple[str, str]:
+        """Split the endpoint url into (service root, entity set name)."""
+        path = urlsplit(api_domain).path.rstrip("/")
+        (service_path, _, entity_set) = path.rpartition("/")
+        service_root = urlunsplit(urlsplit(api_domain)._replace(path=service_path))
+
+        return service_root, entity_set.split("(", 1)[0]
+
+    def _get_metadata(self, service_root: str) -> dict[str, dict[str, str]]:
+        """Return parsed `$metadata` of the service, from memory, cache or service."""
+        if service_root in self._metadata:
+            return self._metadata[service_root]
+
+        document = self.metadata_cache.get(service_root) if self.metadata_cache else None
+        if document is None:
+            response = self.session.get(
+                f"{service_root}/$metadata",
+                headers={"Accept": "application/xml"},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            document = response.content
+            if self.metadata_cache is not None:
+                self.metadata_cache.set(service_root, document)
+
+        self._metadata[service_root] = parse_metadata_document(document)
+        return self._metadata[service_root]
+
+    def get_column_types(self, endpoint_tuple: tuple[str, str, str]) -> dict[str, str]:
+        """
+        Return column name and Edm type of the given api endpoint as declared in the
+        `$metadata` document of its service, without pulling any records.
+
+        Args:
+            endpoint_tuple (tuple[str, str, str]): (api_domain, table_name, table_key)
+
+        Example:
+            >>> apim.get_column_types(APIM_SAP_ENDPOINTS["functional_location"])
+            {"objectType": "Edm.String", "changedOn": "Edm.DateTime", ...}
+
+        Returns:
+            dict[str, str]: Column and Edm type in the declared order
+        """
+        (service_root, entity_set) = self._service_root(endpoint_tuple[0])
+        entity_sets = self._get_metadata(service_root)
+        if entity_set not in entity_sets:
+            raise ValueError(f"{entity_set} is not declared in {service_root}/$metadata")
+
+        return entity_sets[entity_set]
+
+    def get_column_types_from_multiple_endpoints(
+        self,
+        list_of_endpoint_tuples: list[tuple[str, str, str]],
+        max_workers: int = 8,
+    ) -> dict[str, dict[str, str]]:
+        """
+        Return column name and Edm type per table name, see `get_column_types`. The
+        `$metadata` document of every service is read once, services in parallel.
+
+        Args:
+            list_of_endpoint_tuples (list[tuple[str, str, str]]):
+            max_workers (int, optional): Services read in parallel. Defaults to 8.
+
+        Returns:
+            dict[str, dict[str, str]]: _description_
+        """
+        service_roots = {self._service_root(i[0])[0] for i in list_of_endpoint_tuples}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            list(pool.map(self._get_metadata, sorted(service_roots)))
+
+        return {
+            i[1]: self.get_column_types(i) for i in sorted(list_of_endpoint_tuples)
+        }
+
     def get_columns(
         self,
         endpoint_tuple: tuple[str, str, str],
+        from_metadata: bool = False,
     ) -> list[str]:
         """
         Return table columns for given list of api endpoints in alphabetical order.
@@ -210,6 +1690,8 @@ class Extractor:
         Args:
             list_of_endpoint_tuples (list[tuple[str, str, str, str, str, str]]):
             List of values used for easy extraction from self.sap_endpoints dictionary,
+            from_metadata (bool): Read the columns from the `$metadata` document of the
+                service instead of downloading a record. Defaults to False.
 
         Example:
             # For single table extraction
@@ -220,6 +1702,9 @@ class Extractor:
         Returns:
             list[str]: _description_
         """
+        if from_metadata:
+            return sorted(self.get_column_types(endpoint_tuple), key=str.casefold)
+
         tempdf = self.get_records(endpoint_tuple=endpoint_tuple, limit=1)
 
         return sorted(tempdf.columns.tolist(), key=str.casefold)
@@ -227,6 +1712,7 @@ class Extractor:
     def get_columns_from_multiple_endpoints(
         self,
         list_of_endpoint_tuples: list[tuple[str, str, str]],
+        from_metadata: bool = False,
     ) -> dict[str, list[str]]:
         """
         Return table columns for given list of api endpoints in alphabetical order.
@@ -235,6 +1721,8 @@ class Extractor:
         Args:
             list_of_endpoint_tuples (list[tuple[str, str, str, str, str, str]]):
             List of values used for easy extraction from self.sap_endpoints dictionary,
+            from_metadata (bool): Read the columns from the `$metadata` documents, once
+                per service and services in parallel. Defaults to False.
 
         Example:
             # For multiple table extraction
@@ -245,6 +1733,12 @@ class Extractor:
         Returns:
             dict[str, list[str]]: _description_
         """
+        if from_metadata:
+            column_types = self.get_column_types_from_multiple_endpoints(
+                list_of_endpoint_tuples
+            )
+            return {k: sorted(v, key=str.casefold) for k, v in column_types.items()}
+
         col_dict: dict[str, list[str]] = dict()
         for endpoint_tuple in sorted(list_of_endpoint_tuples):
             # table_name = api_endpoint[1]
@@ -0,0 +1,485 @@
+import asyncio
+import json
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable
+
+import aiohttp
+import pandas as pd
+
+from aker_utilities.api_extractor import (
+    RETRY_STATUS_CODES,
+    AdaptivePageSize,
+    Extractor,
+    fast_json_loads,
+)
+from aker_utilities.events import EventHook
+
+
+async def _gather_or_cancel(*aws: Awaitable) -> list:
+    """`asyncio.gather`, but the other tasks are cancelled when one of them fails."""
+    tasks = [asyncio.ensure_future(i) for i in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class AsyncExtractor(Extractor):
+    def __init__(
+        self,
+        api_key: str,
+        auth_keyword: str | None = None,
+        data_keywords: list[str] | None = None,
+        page_keywords: tuple[str, str] | None = None,
+        is_odata: bool = False,
+        page_size: int = 50_000,
+        max_workers: int = 4,
+        schemas: dict[str, dict[str, str]] | None = None,
+        fast_transport: bool = False,
+        limit_per_host: int = 8,
+        max_connections: int = 32,
+        hooks: list[EventHook] | None = None,
+        adaptive_page_size: bool = False,
+        page_size_bounds: dict[str, tuple[int, int]] | None = None,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        timeout: float | None = None,
+    ):
+        """
+        Asyncio based Extractor, endpoints and their pages are fetched concurrently over
+        a single pooled HTTP client. Methods are coroutines returning the same types as
+        `Extractor`, but only take the arguments listed in their docstrings: there is
+        no incremental, columns, filters, sink or spool support here.
+
+        Args:
+            api_key (str): _description_
+            auth_keyword (str | None, optional): Defaults: "Ocp-Apim-Subscription-Key"
+            data_keywords (list[str] | None, optional): Defaults: ["d", "results"]
+            page_keywords (tuple[str, str] | None, optional): Defaults: ("$skip", "$top")
+            page_size (int, optional): Rows requested per page. Defaults to 50_000.
+            max_workers (int, optional): Pages probed ahead per endpoint when the record
+                count is not exposed by the service. Defaults to 4.
+            schemas (dict[str, dict[str, str]] | None, optional): See `Extractor`.
+            fast_transport (bool, optional): See `Extractor`.
+            limit_per_host (int, optional): Max open connections per host. Defaults to 8.
+            max_connections (int, optional): Max open connections in the pool.
+                Defaults to 32.
+            hooks (list[EventHook] | None, optional): See `Extractor`.
+            adaptive_page_size (bool, optional): Halve the page size when a page is
+                rejected as too large, see `Extractor`. Defaults to False.
+            page_size_bounds (dict[str, tuple[int, int]] | None, optional): See
+                `Extractor`.
+            max_retries (int, optional): Retries of a page on 429, 5xx and connection
+                errors. Defaults to 3.
+            backoff_base (float, optional): See `Extractor`. Defaults to 1.0.
+            backoff_max (float, optional): See `Extractor`. Defaults to 60.0.
+            timeout (float | None, optional): Seconds to wait for a page response.
+                Defaults to None, which waits forever like `Extractor` instead of the
+                aiohttp default of 300 s.
+
+        Example:
+            ```python
+            async def main():
+                async with AsyncExtractor(api_key=key) as apim:
+                    return await apim.get_records_from_multiple_endpoints(
+                        list(APIM_SAP_ENDPOINT.values())
+                    )
+
+            api_data_dict = asyncio.run(main())
+            ```
+        """
+        super().__init__(
+            api_key=api_key,
+            auth_keyword=auth_keyword,
+            data_keywords=data_keywords,
+            page_keywords=page_keywords,
+            is_odata=is_odata,
+            page_size=page_size,
+            max_workers=max_workers,
+            schemas=schemas,
+            fast_transport=fast_transport,
+            hooks=hooks,
+            adaptive_page_size=adaptive_page_size,
+            page_size_bounds=page_size_bounds,
+            max_retries=max_retries,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max,
+            timeout=timeout,
+        )
+        self.limit_per_host = limit_per_host
+        self.max_connections = max_connections
+        self.client: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "AsyncExtractor":
+        self.client = self._create_client()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    def _create_client(self) -> aiohttp.ClientSession:
+        # aiohttp negotiates the encodings it can decode itself, br when brotli is there
+        headers = {
+            k: v for k, v in self._request_headers().items() if k != "Accept-Encoding"
+        }
+        return aiohttp.ClientSession(
+            headers=headers,
+            connector=aiohttp.TCPConnector(
+                limit=self.max_connections, limit_per_host=self.limit_per_host
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    @asynccontextmanager
+    async def _client_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Reuse the open client, or open one for the duration of a single call."""
+        if self.client is not None:
+            yield self.client
+            return
+
+        async with self:
+            yield self.client  # type: ignore
+
+    async def _request_page_async(
+        self, client: aiohttp.ClientSession, url: str
+    ) -> tuple[list[dict], str | None, dict[str, Any]]:
+        """
+        Return records, next link and stats of a page, see `Extractor._request_page`.
+        429, 5xx and connection errors are retried, other errors are raised as
+        `aiohttp.ClientResponseError`.
+        """
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                async with client.get(url) as response:
+                    body = await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._announce_retry(url, attempt, repr(e)))
+                continue
+
+            if response.status in RETRY_STATUS_CODES and attempt < self.max_retries:
+                retry_after = response.headers.get("Retry-After")
+                delay = self._announce_retry(url, attempt, response.status, retry_after)
+                await asyncio.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            break
+
+        payload = fast_json_loads(body) if self.fast_transport else json.loads(body)
+        stats: dict[str, Any] = {
+            "url": url,
+            "status": response.status,
+            "latency": time.perf_counter() - start,
+            "bytes": len(body),
+            "requests": 1,
+        }
+
+        temp = payload
+        for key in self.data_keywords:
+            temp = temp[key]
+
+        return temp, self._next_link(payload, url), stats
+
+    async def _request_range_async(
+        self,
+        client: aiohttp.ClientSession,
+        api_domain: str,
+        skip: int,
+        top: int,
+        odata_query: str | None = None,
+        sizer: AdaptivePageSize | None = None,
+    ) -> tuple[list[dict], str | None, dict[str, Any]]:
+        """
+        Request rows [skip, skip + top), halving the adaptive size and requesting the
+        same range in smaller pages when a page is too large, see `_request_range`.
+        """
+        records: list[dict] = list()
+        stats: dict[str, Any] = dict()
+        size: int = top
+        while True:
+            step = min(size, top - len(records))
+            url = self._build_url(api_domain, skip + len(records), step, odata_query)
+            try:
+                page, next_url, page_stats = await self._request_page_async(client, url)
+            except (aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+                too_large = not isinstance(e, aiohttp.ClientResponseError) or (
+                    e.status in (408, 413, 500, 502, 504)
+                )
+                if sizer is None or not too_large or not sizer.shrink(step):
+                    raise
+                print(f"\nPage of {step} rows failed ({e}), retry with {sizer.size}")
+                size = min(step, sizer.size)
+                continue
+
+            if len(stats) == 0:
+                (records, stats) = (page, page_stats)
+            else:
+                records.extend(page)
+                stats["latency"] += page_stats["latency"]
+                stats["bytes"] += page_stats["bytes"]
+                stats["requests"] += 1
+
+            if len(page) < step or len(records) >= top or next_url is not None:
+                return records, next_url, stats
+
+    async def _get_record_count_async(
+        self,
+        client: aiohttp.ClientSession,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None = None,
+    ) -> int | None:
+        """Record count or None, tried like `Extractor.get_record_count`."""
+        api_domain = endpoint_tuple[0]
+        query = f"?{odata_query}" if self.is_odata and odata_query else ""
+
+        try:
+            async with client.get(f"{api_domain}/$count{query}") as response:
+                if response.ok:
+                    return int((await response.text()).strip())
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            pass
+
+        for count_option in ("$inlinecount=allpages", "$count=true"):
+            url = f"{self._build_url(api_domain, None, 1, odata_query)}&{count_option}"
+            try:
+                async with client.get(url) as response:
+                    if not response.ok:
+                        continue
+                    payload = json.loads(await response.read())
+                return self._count_from_payload(payload)
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                ValueError,
+                KeyError,
+                TypeError,
+            ):
+                continue
+
+        return None
+
+    async def get_records(  # type: ignore[override]
+        self,
+        endpoint_tuple: tuple[str, str, str],
+        odata_query: str | None = None,
+        limit: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Return desired amount of records for given api endpoint, see
+        `Extractor.get_records`. All planned pages are requested at once and the pool
+        limits how many of them are in flight per host.
+
+        Args:
+            endpoint_tuple (tuple[str, str, str]): (api_domain, table_name, table_key)
+            odata_query (str | None, optional): Appended to the url if `is_odata`.
+            limit (int | None, optional): Max number of rows, None or <= 0 for no limit
+
+        Returns:
+            pd.DataFrame: Records in the original page order
+        """
+        (api_domain, table_name, table_key) = endpoint_tuple
+        row_cap = limit if limit is not None and limit > 0 else None
+        start = time.perf_counter()
+        summary = self._empty_summary()
+        sizer = self._page_sizer(table_name)
+
+        def page_size() -> int:
+            return sizer.size if sizer is not None else self.page_size
+
+        async with self._client_session() as client:
+            top = page_size() if row_cap is None else min(page_size(), row_cap)
+            planned, (records, next_url, stats) = await _gather_or_cancel(
+                self._get_record_count_async(client, endpoint_tuple, odata_query),
+                self._request_range_async(
+                    client, api_domain, 0, top, odata_query, sizer
+                ),
+            )
+
+            pages: list[list[dict]] = list()
+            server_driven: bool = next_url is not None
+            if server_driven:
+                # Server-driven paging, links can only be followed one after another
+                fetched: int = 0
+                while True:
+                    if row_cap is not None:
+                        records = records[: row_cap - fetched]
+                    self._page_event(summary, table_name, fetched, records, stats)
+                    pages.append(records)
+                    fetched += len(records)
+                    if next_url is None or (row_cap is not None and fetched >= row_cap):
+                        break
+                    records, next_url, stats = await self._request_page_async(
+                        client, next_url
+                    )
+
+                planned = 0
+
+            elif planned is not None and row_cap is not None:
+                planned = min(planned, row_cap)
+
+            requested: list[tuple[int, int]] = [(0, top)]
+            results: list[list[dict]] = [] if server_driven else [records]
+            results_stats: list[dict[str, Any]] = [stats]
+            skip: int = top
+            while len(results) > 0:
+                done: bool = False
+                for (page_skip, top), records, stats in zip(
+                    requested, results, results_stats
+                ):
+                    self._page_event(summary, table_name, page_skip, records, stats)
+                    pages.append(records)
+                    if len(records) < top and planned is None:
+                        # Probing: short page marks the end of the collection
+                        done = True
+                        break
+
+                if planned is not None and skip >= planned:
+                    if len(results[-1]) < requested[-1][1]:
+                        done = True
+                    # Otherwise last planned page came back full, collection may have
+                    # grown since it was counted so keep probing
+                    planned = None
+
+                if done:
+                    break
+
+                if planned is not None:
+                    n_pages = math.ceil(max(planned - skip, 0) / page_size())
+                else:
+                    n_pages = self.max_workers
+
+                requested = list()
+                for _ in range(n_pages):
+                    top = page_size()
+                    if row_cap is not None:
+                        top = min(top, row_cap - skip)
+                    if top <= 0:
+                        break
+                    requested.append((skip, top))
+                    skip += top
+
+                responses = await _gather_or_cancel(
+                    *(
+                        self._request_range_async(
+                            client, api_domain, i, top, odata_query, sizer
+                        )
+                        for i, top in requested
+                    )
+                )
+                results = [i[0] for i in responses]
+                results_stats = [i[2] for i in responses]
+
+        schema = self.schemas.get(table_name)
+        frames = [self._to_frame(records, schema) for records in pages if records]
+        print(f"{'# '+ table_name +' ':-<90} {sum(len(i) for i in pages):>8} rows")
+        self._endpoint_event(summary, table_name, start)
+
+        if len(frames) == 0:
+            return pd.DataFrame()
+
+        return pd.concat(frames, ignore_index=True)
+
+    async def get_records_from_multiple_endpoints(  # type: ignore[override]
+        self,
+        list_of_endpoint_tuples: list[tuple[str, str, str]],
+        list_of_odata_query: list[str] | None = None,
+        limit: int | None = None,
+        compact: bool = False,
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Return table records for given list of api endpoints in alphabetical order.
+        Endpoints are fetched concurrently over the shared pool.
+
+        Args:
+            list_of_endpoint_tuples (list[tuple[str, str, str]]):
+            list_of_odata_query (list[str] | None, optional): One query per endpoint
+            limit: Set None or <= 0 for no limit
+            compact: Compact dtypes instead of all columns as str, see `Extractor`.
+
+        Returns:
+            dict[str, pd.DataFrame]: Table name and records, all columns as str
+        """
+        if list_of_odata_query is None:
+            columns = ["" for i in list_of_endpoint_tuples]
+            endpoint_query_pairs = list(zip(list_of_endpoint_tuples, columns))
+        else:
+            assert len(list_of_endpoint_tuples) == len(list_of_odata_query)
+            endpoint_query_pairs = list(zip(list_of_endpoint_tuples, list_of_odata_query))
+
+        endpoint_query_pairs = sorted(endpoint_query_pairs)
+
+        async with self._client_session():
+            results = await _gather_or_cancel(
+                *(
+                    self.get_records(
+                        endpoint_tuple=endpoint_tuple,
+                        odata_query=odata_query,
+                        limit=limit,
+                    )
+                    for endpoint_tuple, odata_query in endpoint_query_pairs
+                )
+            )
+
+        api_data_dict: dict[str, pd.DataFrame] = dict()
+        for (endpoint_tuple, _), temp_df in zip(endpoint_query_pairs, results):
+            api_data_dict[endpoint_tuple[1]] = self._finalize_frame(
+                endpoint_tuple[1], temp_df, compact
+            )
+
+        return api_data_dict
+
+    async def get_columns(  # type: ignore[override]
+        self,
+        endpoint_tuple: tuple[str, str, str],
+    ) -> list[str]:
+        """
+        Return table columns for given api endpoint in alphabetical order.
+
+        Args:
+            endpoint_tuple (tuple[str, str, str]): (api_domain, table_name, table_key)
+
+        Returns:
+            list[str]: _description_
+        """
+        tempdf = await self.get_records(endpoint_tuple=endpoint_tuple, limit=1)
+
+        return sorted(tempdf.columns.tolist(), key=str.casefold)
+
+    async def get_columns_from_multiple_endpoints(  # type: ignore[override]
+        self,
+        list_of_endpoint_tuples: list[tuple[str, str, str]],
+    ) -> dict[str, list[str]]:
+        """
+        Return table columns for given list of api endpoints in alphabetical order.
+
+        Args:
+            list_of_endpoint_tuples (list[tuple[str, str, str]]):
+
+        Returns:
+            dict[str, list[str]]: _description_
+        """
+        endpoint_tuples = sorted(list_of_endpoint_tuples)
+
+        async with self._client_session():
+            results = await _gather_or_cancel(
+                *(self.get_columns(endpoint_tuple) for endpoint_tuple in endpoint_tuples)
+            )
+
+        return {i[1]: columns for i, columns in zip(endpoint_tuples, results)}
+
+    def __str__(self) -> str:
+        return f"Async API Extractor: {self.__class__.__name__}"
+
+    def __repr__(self) -> str:
+        return f"Async API Extractor: {self.__class__.__name__}"
@@ -1,12 +1,18 @@
 import atexit
+import hashlib
 import json
 import os
-import uuid
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Iterator, Literal
 
+import numpy as np
 import pandas as pd
 from cognite.client._cognite_client import CogniteClient
 from cognite.client.config import ClientConfig
@@ -24,13 +30,149 @@ from cognite.client.data_classes.transformations import (
 from cognite.client.data_classes.transformations.notifications import (
     TransformationNotification,
 )
+from cognite.client.exceptions import CogniteAPIError, CogniteConnectionError
 from msal import PublicClientApplication, SerializableTokenCache
 
-from aker_utilities.api_extractor import Extractor
+from aker_utilities.api_extractor import RETRY_STATUS_CODES, Extractor, _retry_delay
+from aker_utilities.columnar_sink import ColumnarDataset, ColumnarSink
+from aker_utilities.events import EventHook, emit_event
 from aker_utilities.IO_utils import write_dict_to_yaml
+from aker_utilities.pandas_utils import (
+    hash_columns,
+    iter_dataframe,
+    join_columns,
+    memory_usage_mb,
+    read_dataframe,
+    uuid4_strings,
+)
 from aker_utilities.regex_utils import get_table_name_by_regex, validate_email
 
 
+class RateLimiter:
+    def __init__(self, per_second: float | None = None):
+        """
+        Spread calls shared by many threads over time, at most `per_second` a second.
+
+        Args:
+            per_second (float | None, optional): None for no limit. Defaults to None.
+        """
+        self.per_second = per_second
+        self._next: float = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next call slot."""
+        if not self.per_second:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + 1 / self.per_second
+        time.sleep(slot - now)
+
+    def __str__(self) -> str:
+        return f"Rate limiter: {self.per_second} calls/s"
+
+    def __repr__(self) -> str:
+        return f"Rate limiter: {self.per_second} calls/s"
+
+
+class ChunkJournal:
+    def __init__(self, path: Path | None = None):
+        """
+        JSON lines journal of completed chunks, so a restarted bulk operation skips the
+        chunks done by the previous run. Chunks are identified by a hash of their table
+        and keys, the same keys always give the same chunk ids.
+
+        Args:
+            path (Path | None, optional): Journal file, kept in memory only if None.
+                Defaults to None.
+        """
+        self.path = Path(path) if path is not None else None
+        self.completed: set[str] = set()
+        self._lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    self.completed.add(json.loads(line)["chunk"])
+
+    @staticmethod
+    def chunk_id(table: str, keys: list[str]) -> str:
+        return hashlib.sha1("\n".join([table, *map(str, keys)]).encode()).hexdigest()
+
+    def record(self, chunk: str, **fields: Any) -> None:
+        """Mark the chunk as completed, fields are written along for inspection."""
+        line = json.dumps({"chunk": chunk, **fields}, default=str)
+        with self._lock:
+            self.completed.add(chunk)
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+    def clear(self) -> None:
+        with self._lock:
+            self.completed.clear()
+            if self.path is not None:
+                self.path.unlink(missing_ok=True)
+
+    def __contains__(self, chunk: str) -> bool:
+        return chunk in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def __str__(self) -> str:
+        return f"Chunk journal: {self.path} ({len(self)} chunks completed)"
+
+    def __repr__(self) -> str:
+        return f"Chunk journal: {self.path} ({len(self)} chunks completed)"
+
+
+class SeenKeys:
+    def __init__(self):
+        """
+        Compact set of keys seen over the chunks of a streamed run, to find duplicates
+        across chunks. Keys are kept as 64 bit hashes in sorted arrays of doubling
+        sizes, about 8 bytes per key instead of a Python set of strings.
+        """
+        self._runs: list[np.ndarray] = list()
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.contains(pd.Index([key]))[0])
+
+    def contains(self, keys: pd.Index) -> np.ndarray:
+        """Boolean mask of the keys that were added before."""
+        hashes = pd.util.hash_array(keys.astype(str).to_numpy(dtype=object))
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            found |= run[positions] == hashes
+
+        return found
+
+    def add(self, keys: pd.Index) -> None:
+        if len(keys) == 0:
+            return None
+
+        run = np.unique(pd.util.hash_array(keys.astype(str).to_numpy(dtype=object)))
+        # Merge runs of similar size, so a key is only re-sorted log(n) times
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.union1d(self._runs.pop(), run)
+        self._runs.append(run)
+
+    def __len__(self) -> int:
+        return sum(len(i) for i in self._runs)
+
+    def __str__(self) -> str:
+        return f"Seen keys: {len(self)}"
+
+    def __repr__(self) -> str:
+        return f"Seen keys: {len(self)}"
+
+
 class CDF:
     def __init__(
         self,
@@ -48,6 +190,7 @@ class CDF:
         tenant_id: str,
         client_secret: str | None = None,
         port: int = 53000,
+        hooks: list[EventHook] | None = None,
     ):
         """
 
@@ -59,10 +202,15 @@ class CDF:
             tenant_id (str): Tenant ID for Azure AD
             client_secret (str | None, optional): For non interactive auth
             port (int, optional): Defaults to 53000.
+            hooks (list[EventHook] | None, optional): Callables receiving a "table"
+                event per table read by `get_records_from_multiple_tables`, see
+                `aker_utilities.events`. Defaults to None.
         """
         self.client_name = client_name
         self.project = project
         self.port = port
+        self.hooks: list[EventHook] = list(hooks) if hooks else list()
+        self.failed_tables: dict[str, Exception] = dict()
         self.client = self._set_client_connection(
             client_name=self.client_name,
             project=self.project,
@@ -221,7 +369,10 @@ class CDF:
         max_last_updated_time: int | None = None,
         columns: list[str] | None = None,
         limit: int | None = None,
-    ) -> pd.DataFrame:
+        partitions: int | None = None,
+        sink: Path | None = None,
+        sink_format: Literal["parquet", "arrow"] = "parquet",
+    ) -> pd.DataFrame | ColumnarDataset:
         """
         _summary_
 
@@ -232,11 +383,35 @@ class CDF:
             max_last_updated_time (int | None, optional): _description_. Defaults to None.
             columns (list[str] | None, optional): _description_. Defaults to None.
             limit (int | None, optional): _description_. Defaults to None.
+            partitions (int | None, optional): Read the table over this many RAW
+                cursor partitions in parallel. Defaults to None.
+            sink (Path | None, optional): Write chunks straight into this directory
+                as they arrive instead of building a DataFrame, see `iter_records`
+                and `ColumnarSink`. Row keys are written as the "key" column and a
+                lazy `ColumnarDataset` is returned. Defaults to None.
+            sink_format (Literal["parquet", "arrow"], optional): Partitioned Parquet
+                dataset or Arrow IPC stream. Defaults to "parquet".
 
         Returns:
-            pd.DataFrame: _description_
+            pd.DataFrame | ColumnarDataset: ColumnarDataset if a sink is given
         """
         print(f"\n{'# Fetching records from ' + table_name + ' ':->100}")
+        if sink is not None:
+            with ColumnarSink(sink, sink_format) as writer:
+                for chunk in self.iter_records(
+                    db_name=db_name,
+                    table_name=table_name,
+                    min_last_updated_time=min_last_updated_time,
+                    max_last_updated_time=max_last_updated_time,
+                    columns=columns,
+                    limit=limit,
+                    partitions=partitions or 1,
+                ):
+                    writer.write(chunk.rename_axis("key").reset_index())
+            print(f"\nRows -> {writer.rows:>8} written to {writer.dataset.path}")
+
+            return writer.dataset
+
         records = self.client.raw.rows.retrieve_dataframe(
             db_name,
             table_name,
@@ -244,11 +419,61 @@ class CDF:
             max_last_updated_time,
             columns,
             limit,
+            partitions,
         )
         print(f"Rows -> {len(records):>8} fetched")
 
         return records
 
+    def iter_records(
+        self,
+        db_name: str,
+        table_name: str,
+        min_last_updated_time: int | None = None,
+        max_last_updated_time: int | None = None,
+        columns: list[str] | None = None,
+        limit: int | None = None,
+        partitions: int = 8,
+        chunk_size: int = 10_000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield records of the given table chunk by chunk, each chunk is read from one of
+        `partitions` RAW cursor partitions fetched in parallel. Rows are not ordered
+        across chunks and at most about 2 x partitions x chunk_size rows are held in
+        memory, so tables larger than memory can be processed or written to Parquet.
+
+        Args:
+            db_name (str): _description_
+            table_name (str): _description_
+            min_last_updated_time (int | None, optional): _description_. Defaults to None.
+            max_last_updated_time (int | None, optional): _description_. Defaults to None.
+            columns (list[str] | None, optional): _description_. Defaults to None.
+            limit (int | None, optional): _description_. Defaults to None.
+            partitions (int, optional): Number of cursor partitions read in parallel,
+                capped at the max_workers of the Cognite client. Defaults to 8.
+            chunk_size (int, optional): Rows per chunk. Defaults to 10_000.
+
+        Yields:
+            pd.DataFrame: Chunk of records with the row keys as index
+        """
+        fetched = 0
+        for rows in self.client.raw.rows(
+            db_name,
+            table_name,
+            chunk_size=chunk_size,
+            limit=limit,
+            min_last_updated_time=min_last_updated_time,
+            max_last_updated_time=max_last_updated_time,
+            columns=columns,
+            partitions=partitions,
+        ):
+            fetched += len(rows)
+            print(f"Rows -> {fetched:>8} fetched", end="\r")
+            # Rows without columns come back with columns None
+            yield pd.DataFrame(
+                [i.columns or dict() for i in rows], index=[i.key for i in rows]
+            )
+
     def get_records_from_multiple_tables(
         self,
         db_name: str,
@@ -257,9 +482,13 @@ class CDF:
         max_last_updated_time: int | None = None,
         columns: list[str] | None = None,
         limit: int | None = None,
+        max_workers: int = 1,
+        ignore_errors: bool = False,
     ) -> dict[str, pd.DataFrame]:
         """
-        _summary_
+        Return records of the given tables, read by up to `max_workers` tables at a
+        time. Every table is read even if another one fails, failed tables are kept in
+        `failed_tables` and reported in a "table" event like the successful ones.
 
         Args:
             db_name (str): _description_
@@ -268,12 +497,17 @@ class CDF:
             max_last_updated_time (int | None, optional): _description_. Defaults to None.
             columns (list[str] | None, optional): _description_. Defaults to None.
             limit (int | None, optional): _description_. Defaults to None.
+            max_workers (int, optional): Number of tables read at a time.
+                Defaults to 1.
+            ignore_errors (bool, optional): Return the tables that could be read
+                instead of raising when some failed. Defaults to False.
 
         Raises:
             TypeError: _description_
+            RuntimeError: If a table could not be read and `ignore_errors` is False
 
         Returns:
-            dict[str, pd.DataFrame]: _description_
+            dict[str, pd.DataFrame]: Records per table, in the order of `tables`
         """
         if tables is None:
             cdf_tables = self.get_tables(db_name=db_name)
@@ -282,20 +516,64 @@ class CDF:
         else:
             raise TypeError("Check given tables, must be either one of list or None")
 
-        # Get Table and column dictionary
-        records_dict: dict[str, pd.DataFrame] = dict()
+        def _read_table(tbl: str) -> pd.DataFrame:
+            start = time.perf_counter()
+            try:
+                records = self.get_records(
+                    db_name=db_name,
+                    table_name=tbl,
+                    min_last_updated_time=min_last_updated_time,
+                    max_last_updated_time=max_last_updated_time,
+                    columns=columns,
+                    limit=limit,
+                )
+            except Exception as e:
+                emit_event(
+                    self.hooks,
+                    "table",
+                    db_name=db_name,
+                    table=tbl,
+                    status="failed",
+                    rows=0,
+                    seconds=time.perf_counter() - start,
+                    error=repr(e),
+                )
+                raise
 
-        for tbl in cdf_tables:
-            records_dict[tbl] = self.get_records(
+            emit_event(
+                self.hooks,
+                "table",
                 db_name=db_name,
-                table_name=tbl,
-                min_last_updated_time=min_last_updated_time,
-                max_last_updated_time=max_last_updated_time,
-                columns=columns,
-                limit=limit,
+                table=tbl,
+                status="ok",
+                rows=len(records),
+                seconds=time.perf_counter() - start,
+                error=None,
             )
+            return records
+
+        # Get Table and column dictionary
+        records_dict: dict[str, pd.DataFrame] = dict()
+        self.failed_tables = dict()
 
-        return records_dict
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(_read_table, tbl): tbl for tbl in cdf_tables}
+            for n, future in enumerate(as_completed(futures), start=1):
+                tbl = futures[future]
+                try:
+                    records_dict[tbl] = future.result()
+                except Exception as e:
+                    self.failed_tables[tbl] = e
+                    print(f"\nTable -> {tbl} failed: {e!r}")
+                print(f"Tables -> {n:>4}/{len(cdf_tables)} done", end="\r")
+
+        if self.failed_tables and not ignore_errors:
+            raise RuntimeError(
+                f"{len(self.failed_tables)} of {len(cdf_tables)} tables could not be "
+                f"read: {', '.join(self.failed_tables)}"
+            ) from next(iter(self.failed_tables.values()))
+
+        return {tbl: records_dict[tbl] for tbl in cdf_tables if tbl in records_dict}
 
     def get_columns(self, db_name: str, table_name: str) -> list[str]:
         """
@@ -354,6 +632,190 @@ class CDF:
         print(f"Deleting given records from {db_name}:{table_name} ...")
         self.client.raw.rows.delete(db_name=db_name, table_name=table_name, key=key)
 
+    def _call_with_retries(
+        self,
+        call: Callable[[], Any],
+        limiter: RateLimiter,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> int:
+        """Run a client call, retry throttling and transient errors, return attempts."""
+        for attempt in range(max_retries + 1):
+            limiter.wait()
+            try:
+                call()
+                return attempt + 1
+            except (CogniteAPIError, CogniteConnectionError) as e:
+                retryable = isinstance(e, CogniteConnectionError) or (
+                    e.code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt == max_retries:
+                    raise
+
+                delay = _retry_delay(attempt, backoff_base, backoff_max)
+                print(f"\nRetry {attempt + 1}/{max_retries} in {delay:.1f} s ({e!r})")
+                time.sleep(delay)
+
+        return max_retries + 1
+
+    def _run_chunks(
+        self,
+        event: str,
+        db_name: str,
+        chunks: list[tuple[str, str, int, Callable[[], Any]]],
+        journal: ChunkJournal,
+        limiter: RateLimiter,
+        max_workers: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> tuple[dict[str, int], list[tuple[str, Exception]]]:
+        """
+        Run (chunk id, table, size, call) chunks on a thread pool, record completed ones
+        in the journal and emit an `event` per chunk. A failed chunk does not stop the
+        others, return the size done per table and the failures.
+        """
+
+        def _run(chunk_id: str, table_name: str, size: int, call: Callable) -> None:
+            start = time.perf_counter()
+            try:
+                attempts = self._call_with_retries(
+                    call, limiter, max_retries, backoff_base, backoff_max
+                )
+            except Exception as e:
+                emit_event(
+                    self.hooks,
+                    event,
+                    db_name=db_name,
+                    table=table_name,
+                    status="failed",
+                    size=size,
+                    seconds=time.perf_counter() - start,
+                    error=repr(e),
+                )
+                raise
+
+            journal.record(chunk_id, table=table_name, size=size)
+            emit_event(
+                self.hooks,
+                event,
+                db_name=db_name,
+                table=table_name,
+                status="ok",
+                size=size,
+                attempts=attempts,
+                seconds=time.perf_counter() - start,
+                error=None,
+            )
+
+        done: dict[str, int] = defaultdict(int)
+        failed: list[tuple[str, Exception]] = list()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(_run, *i): i for i in chunks}
+            for n, future in enumerate(as_completed(futures), start=1):
+                (_, table_name, size, _) = futures[future]
+                try:
+                    future.result()
+                    done[table_name] += size
+                except Exception as e:
+                    failed.append((table_name, e))
+                    print(f"\nChunk of {table_name} failed: {e!r}")
+                print(f"Chunks -> {n:>6}/{len(chunks)} done", end="\r")
+
+        return dict(done), failed
+
+    def delete_records_in_chunks(
+        self,
+        db_name: str,
+        table_keys: dict[str, list[str]],
+        chunk_size: int = 10_000,
+        max_workers: int = 4,
+        requests_per_second: float | None = None,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        journal: Path | None = None,
+    ) -> dict[str, int]:
+        """
+        Delete the given keys per table in chunks, up to `max_workers` chunks at a time.
+        Throttled and transient failures are retried with backoff, other failures are
+        reported and the remaining chunks still run. Completed chunks are written to
+        the journal, so a restart with the same keys only deletes what is left. The
+        journal is removed once every chunk is done.
+
+        Args:
+            db_name (str): _description_
+            table_keys (dict[str, list[str]]): Keys to delete per table, e.g. the
+                result of `get_stale_records`
+            chunk_size (int, optional): Keys per delete request. Defaults to 10_000.
+            max_workers (int, optional): Chunks deleted at a time. Defaults to 4.
+            requests_per_second (float | None, optional): Cap of delete requests a
+                second over all workers, None for no cap. Defaults to None.
+            max_retries (int, optional): Retries of a chunk. Defaults to 3.
+            backoff_base (float, optional): Seconds before the first retry, doubled
+                every retry. Defaults to 1.0.
+            backoff_max (float, optional): Max seconds between retries. Defaults to 60.
+            journal (Path | None, optional): Journal file of completed chunks.
+                Defaults to None.
+
+        Raises:
+            RuntimeError: If some chunks could not be deleted, rerun to resume
+
+        Returns:
+            dict[str, int]: Number of keys deleted per table by this run
+
+        Example:
+            >>> stale = cdf.get_stale_records("e2e-maintenance-sap", None, ...)
+            >>> cdf.delete_records_in_chunks(
+            >>>     "e2e-maintenance-sap", stale, journal=Path("delete-journal.jsonl")
+            >>> )
+        """
+        chunk_journal = ChunkJournal(journal)
+
+        chunks: list[tuple[str, str, int, Callable[[], Any]]] = list()
+        for table_name, keys in table_keys.items():
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i : i + chunk_size]
+                chunk_id = ChunkJournal.chunk_id(table_name, chunk)
+                if chunk_id not in chunk_journal:
+                    call = partial(
+                        self.client.raw.rows.delete,
+                        db_name=db_name,
+                        table_name=table_name,
+                        key=chunk,
+                    )
+                    chunks.append((chunk_id, table_name, len(chunk), call))
+
+        total = sum(len(i) for i in table_keys.values())
+        print(
+            f"Deleting {sum(i[2] for i in chunks)} of {total} keys from {db_name} "
+            f"in {len(chunks)} chunks ..."
+        )
+
+        (done, failed) = self._run_chunks(
+            "delete",
+            db_name,
+            chunks,
+            chunk_journal,
+            RateLimiter(requests_per_second),
+            max_workers,
+            max_retries,
+            backoff_base,
+            backoff_max,
+        )
+
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} of {len(chunks)} chunks could not be deleted from "
+                f"{', '.join(sorted(set(i[0] for i in failed)))}, rerun to resume"
+            ) from failed[0][1]
+
+        chunk_journal.clear()
+        deleted = {i: done.get(i, 0) for i in table_keys}
+        print(f"\n{sum(deleted.values())} keys deleted from {db_name}")
+        return deleted
+
     def delete_tables(self, db_name: str, tables: str | list[str] | None) -> None:
         """
         _summary_
@@ -405,6 +867,166 @@ class CDF:
             dbname, table_name, dataframe, ensure_parent
         )
 
+    def insert_dataframe_in_chunks(
+        self,
+        db_name: str,
+        table_name: str,
+        dataframe: pd.DataFrame,
+        chunk_rows: int = 100_000,
+        chunk_bytes: int | None = None,
+        max_workers: int = 1,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        journal: Path | ChunkJournal | None = None,
+        ensure_parent: bool = False,
+    ) -> int:
+        """
+        Insert the dataframe into a RAW table in chunks, up to `max_workers` chunks at
+        a time, the index is used as row keys. Throttled and transient failures are
+        retried with backoff. Completed chunks are identified by a hash of their
+        content and written to the journal, so a restart with the same data skips them
+        and continues with the first unconfirmed chunk.
+
+        Args:
+            db_name (str): _description_
+            table_name (str): _description_
+            dataframe (pd.DataFrame): _description_
+            chunk_rows (int, optional): Rows per chunk. Defaults to 100_000.
+            chunk_bytes (int | None, optional): Size per chunk instead, rows per chunk
+                are estimated from the in-memory size of the frame. Defaults to None.
+            max_workers (int, optional): Chunks inserted at a time. Defaults to 1.
+            max_retries (int, optional): Retries of a chunk. Defaults to 3.
+            backoff_base (float, optional): Seconds before the first retry, doubled
+                every retry. Defaults to 1.0.
+            backoff_max (float, optional): Max seconds between retries. Defaults to 60.
+            journal (Path | ChunkJournal | None, optional): Checkpoint of completed
+                chunks. A file is removed once every chunk is done, a `ChunkJournal` is
+                left to the caller, e.g. to span several frames. Defaults to None.
+            ensure_parent (bool, optional): Create database/table if they don't
+                already exist. Defaults to False.
+
+        Raises:
+            RuntimeError: If some chunks could not be inserted, rerun to resume
+
+        Returns:
+            int: Number of rows inserted by this run
+        """
+        chunk_journal = (
+            journal if isinstance(journal, ChunkJournal) else ChunkJournal(journal)
+        )
+
+        if chunk_bytes is not None and len(dataframe) > 0:
+            row_bytes = memory_usage_mb(dataframe) * 1e6 / len(dataframe)
+            chunk_rows = max(1, int(chunk_bytes // max(row_bytes, 1)))
+
+        chunks: list[tuple[str, str, int, Callable[[], Any]]] = list()
+        for i in range(0, len(dataframe), chunk_rows):
+            chunk = dataframe.iloc[i : i + chunk_rows]
+            content = pd.util.hash_pandas_object(chunk).to_numpy().tobytes()
+            chunk_id = ChunkJournal.chunk_id(
+                f"{db_name}/{table_name}", [hashlib.sha1(content).hexdigest()]
+            )
+            if chunk_id not in chunk_journal:
+                call = partial(
+                    self.insert_records_into_raw,
+                    db_name,
+                    table_name,
+                    chunk,
+                    ensure_parent,
+                )
+                chunks.append((chunk_id, table_name, len(chunk), call))
+
+        print(
+            f"Pushing {sum(i[2] for i in chunks)} of {len(dataframe)} rows to "
+            f"{db_name}:{table_name} in {len(chunks)} chunks of {chunk_rows} rows ..."
+        )
+
+        (done, failed) = self._run_chunks(
+            "push",
+            db_name,
+            chunks,
+            chunk_journal,
+            RateLimiter(),
+            max_workers,
+            max_retries,
+            backoff_base,
+            backoff_max,
+        )
+
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} of {len(chunks)} chunks could not be pushed to "
+                f"{db_name}:{table_name}, rerun to resume"
+            ) from failed[0][1]
+
+        if not isinstance(journal, ChunkJournal):
+            chunk_journal.clear()
+        print(f"\nRows -> {done.get(table_name, 0):>8} pushed")
+        return done.get(table_name, 0)
+
+    def _get_stale_keys(
+        self,
+        db_name: str,
+        table: str,
+        field: str,
+        records_before: datetime,
+        export_details: bool = False,
+        partitions: int = 4,
+        missing_is_stale: bool = False,
+    ) -> tuple[list[str], list[str]]:
+        """Return stale keys of a table and their "key | field" details if asked for."""
+        print(f"\n{table} analyze start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+        # Only the key and the field are fetched, parsed once per chunk. The cutoff is
+        # at most records_before - 6 h, so only rows older than that are kept while
+        # the max ingestion time is tracked for the final cutoff
+        upper_cutoff = records_before - timedelta(hours=6)
+        max_ingestion: pd.Timestamp | None = None
+        n_rows: int = 0
+        candidates: list[pd.DataFrame] = list()
+        for chunk in self.iter_records(
+            db_name, table, columns=[field], partitions=partitions
+        ):
+            raw = chunk.get(field, pd.Series(None, index=chunk.index, dtype=object))
+            if missing_is_stale:
+                raw = raw.fillna("1900-01-01T00:00:00")
+            else:
+                raw = raw.dropna()
+            parsed = pd.DataFrame(
+                {"ingestion": pd.to_datetime(raw, format="ISO8601")}, index=raw.index
+            )
+            if export_details:
+                parsed["raw"] = raw
+
+            n_rows += len(chunk)
+            if len(parsed) > 0:
+                chunk_max = parsed["ingestion"].max()
+                max_ingestion = (
+                    chunk_max if max_ingestion is None else max(max_ingestion, chunk_max)
+                )
+                candidates.append(parsed[parsed["ingestion"] < upper_cutoff])
+
+        keys_to_delete: list[str] = list()
+        details: list[str] = list()
+        if max_ingestion is not None:
+            # Get desired datetime for making comparison, however if this is later than
+            # max_ingestionDT, use max_ingestionDT to protect from deleting all records
+            stale_record_dt_filter = min(
+                records_before, max_ingestion.to_pydatetime()
+            ) - timedelta(hours=6)
+            rows = pd.concat(candidates)
+            stale = rows[rows["ingestion"] < stale_record_dt_filter]
+            keys_to_delete = stale.index.tolist()
+            if export_details:
+                details = (stale.index.astype(str) + " | " + stale["raw"]).tolist()
+
+        print(
+            f"{table} analyze end  : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Row Count:{n_rows}"
+        )
+        return keys_to_delete, details
+
     def get_stale_records(
         self,
         db_name: str,
@@ -412,6 +1034,9 @@ class CDF:
         field: str,
         records_before: datetime,
         export_details: bool = False,
+        max_workers: int = 4,
+        partitions: int = 4,
+        missing_is_stale: bool = False,
     ) -> dict[str, list[str | None]]:
         """
         This function is used to find stale records in a given list of tables in a given
@@ -423,12 +1048,22 @@ class CDF:
 
         Export details option is used to export all the keys with ingestionDT for each
 
+        Only the row keys and the given field are read, chunk by chunk over RAW cursor
+        partitions, and `max_workers` tables are analyzed at a time.
+
         Args:
             db_name (str): _description_
             tables (list[str] | None): _description_
             field (str): _description_
             records_before (datetime): _description_
             export_details (bool, optional): _description_. Defaults to False.
+            max_workers (int, optional): Number of tables analyzed at a time.
+                Defaults to 4.
+            partitions (int, optional): Cursor partitions read in parallel per table,
+                see `iter_records`. Defaults to 4.
+            missing_is_stale (bool, optional): Treat rows without the field as stale,
+                as if it was 1900-01-01. Defaults to False, such rows are never
+                returned for deletion.
 
         Returns:
             dict[str, list[str | None]]: _description_
@@ -442,56 +1077,25 @@ class CDF:
         else:
             list_of_tables = tables
 
-        for table in sorted(list_of_tables):
-            print(
-                f"\n{table} analyze start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            )
-            rows = self.client.raw.rows.list(db_name, table, limit=None)
-
-            max_ingestionDT = max(
-                set(
-                    [
-                        datetime.fromisoformat(
-                            i.columns.get(field, "1900-01-01T00:00:00")
-                        )
-                        for i in rows
-                        if i.columns is not None
-                    ]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                table: executor.submit(
+                    self._get_stale_keys,
+                    db_name,
+                    table,
+                    field,
+                    records_before,
+                    export_details,
+                    partitions,
+                    missing_is_stale,
                 )
-            )
-
-            # Get desired datetime for making comparison, however if this is later than
-            # max_ingestionDT, use max_ingestionDT to protect from deleting all records
-            stale_record_dt_filter = min(records_before, max_ingestionDT) - timedelta(
-                hours=6
-            )
-
-            keys_to_delete = [
-                i.key
-                for i in rows
-                if i.columns is not None
-                and datetime.fromisoformat(i.columns.get(field, "1900-01-01T00:00:00"))
-                < stale_record_dt_filter
-            ]
-
-            if export_details:
-                keys_to_delete_with_ingestionDT = [
-                    " | ".join([str(i.key), i.columns.get(field, "1900-01-01T00:00:00")])
-                    for i in rows
-                    if i.columns is not None
-                    and datetime.fromisoformat(
-                        i.columns.get(field, "1900-01-01T00:00:00")
-                    )
-                    < stale_record_dt_filter
-                ]
-
-                table_keys_with_ingestionDT[table] = keys_to_delete_with_ingestionDT
-
-            table_keys_to_delete[table] = keys_to_delete
-            print(
-                f"{table} analyze end  : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                f"Row Count:{len(rows)}"
-            )
+                for table in sorted(list_of_tables)
+            }
+            for table, future in futures.items():
+                (keys_to_delete, keys_to_delete_with_ingestionDT) = future.result()
+                table_keys_to_delete[table] = keys_to_delete
+                if export_details:
+                    table_keys_with_ingestionDT[table] = keys_to_delete_with_ingestionDT
 
         with open(f"{db_name}_stale_records_{datetime.today().date()}.json", "w") as ff:
             json.dump(table_keys_to_delete, ff, indent=4)
@@ -964,28 +1568,90 @@ class CDF:
         return f"CDF extended SDK: '{self.client_name}' @ '{self.project}' project"
 
 
+def _canonical_value(value: Any) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return str(bool(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+
+    return str(value)
+
+
+def _canonical_strings(series: pd.Series) -> pd.Series:
+    """
+    Values as str the same way before and after a RAW round trip, where missing values
+    are dropped and integers with missing values come back as float or object.
+    """
+    missing = series.isna()
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        strings = series.astype(str)
+    else:
+        strings = series.map(_canonical_value, na_action="ignore").astype(object)
+
+    return strings.where(~missing, "\x00")
+
+
 class PipelineToCDF(ABC):
     def __init__(
         self,
-        source: Extractor | Path,
+        source: Extractor | Path | ColumnarDataset,
         endpoint: tuple[str, str, str] | None,
         uid_key_list: str | list[str] | None,
         cdf: CDF,
         cdf_db_name: str,
         cdf_table: str,
         limit: int | None = None,
+        hash_key: bool = False,
+        chunk_rows: int = 100_000,
+        chunk_bytes: int | None = None,
+        max_workers: int = 1,
+        max_retries: int = 3,
+        checkpoint: Path | None = None,
+        delta: bool = False,
+        delta_snapshot: Path | None = None,
+        delete_vanished: bool = False,
+        reader_engine: Literal["auto", "c", "pyarrow", "openpyxl", "calamine"] = "auto",
+        dtype: dict[str, Any] | None = None,
     ) -> None:
         """
         Pipeline to CDF class to push data to CDF from different sources.
 
         Args:
-            source (Extractor | Path): Path to the file or Extractor object
+            source (Extractor | Path | ColumnarDataset): Path to the file, Extractor
+                object or dataset written by `Extractor.get_records(sink=...)`
             endpoint (tuple[str, str, str] | None): Required if source is Extractor
             uid_key_list (str | list[str] | None): if None, a unique key will be generated
             cdf (CDF): CDF object
             cdf_db_name (str): CDF database name
             cdf_table (str): CDF table name
             limit (int, optional): Number of rows to read via Extractor. Defaults to 0.
+            hash_key (bool, optional): Use a deterministic hash of the uid_key_list
+                columns as key instead of joining their values with "-", see
+                `hash_columns`. Defaults to False.
+            chunk_rows (int, optional): Rows per pushed chunk. Defaults to 100_000.
+            chunk_bytes (int | None, optional): Size per pushed chunk instead of rows,
+                see `CDF.insert_dataframe_in_chunks`. Defaults to None.
+            max_workers (int, optional): Chunks pushed at a time. Defaults to 1.
+            max_retries (int, optional): Retries of a failed chunk. Defaults to 3.
+            checkpoint (Path | None, optional): Journal of pushed chunks, a failed run
+                resumes from the first unconfirmed chunk. Resuming needs the same keys
+                in every run, so it is refused for generated keys (uid_key_list None).
+                Defaults to None.
+            delta (bool, optional): Only push rows that are new or changed since the
+                last run, compared by a content hash per rawKey. Defaults to False.
+            delta_snapshot (Path | None, optional): Parquet file of the rawKey hashes
+                of the last run. If it does not exist yet, hashes are read back from
+                the RAW table. Defaults to None, hashes are always read from RAW.
+            delete_vanished (bool, optional): In delta mode, delete keys that were in
+                the last run but not in this one from the RAW table. Defaults to False.
+            reader_engine (Literal["auto", "c", "pyarrow", "openpyxl", "calamine"],
+                optional): Engine reading file sources, picked by file type and size if
+                "auto", see `read_dataframe` and `iter_dataframe` when streamed.
+                Defaults to "auto".
+            dtype (dict[str, Any] | None, optional): dtype hints per column of file
+                sources, e.g. {"plant": str}. Defaults to None.
         """
         self.source = source
         self.endpoint = endpoint
@@ -994,17 +1660,28 @@ class PipelineToCDF(ABC):
         self.cdf_db_name = cdf_db_name
         self.cdf_table = cdf_table
         self.limit = limit
+        self.hash_key = hash_key
+        self.chunk_rows = chunk_rows
+        self.chunk_bytes = chunk_bytes
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.checkpoint = ChunkJournal(checkpoint)
+        self._resuming: bool = len(self.checkpoint) > 0
+        self.delta = delta
+        self.delta_snapshot = delta_snapshot
+        self.delete_vanished = delete_vanished
+        self.reader_engine = reader_engine
+        self.dtype = dtype
+        self._previous_hashes: pd.Series | None = None
+        self._current_hashes: list[pd.Series] = list()
 
     def get_data(self) -> None:
         if isinstance(self.source, Path):
-            if self.source.suffix == ".csv":
-                self.data = pd.read_csv(
-                    self.source.absolute(), sep=";", encoding="latin-1"
-                )
-            elif self.source.suffix == ".xlsx":
-                self.data = pd.read_excel(self.source.absolute())
-            else:
-                raise ValueError("File format not supported")
+            self.data = read_dataframe(
+                self.source.absolute(), self.reader_engine, self.dtype
+            )
+        elif isinstance(self.source, ColumnarDataset):
+            self.data = self.source.to_pandas()
         elif isinstance(self.source, Extractor) and self.endpoint is not None:
             df = self.source.get_records(
                 endpoint_tuple=self.endpoint,
@@ -1014,9 +1691,38 @@ class PipelineToCDF(ABC):
         else:
             raise ValueError("Invalid source type")
 
+    def iter_data(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield source data in chunks. Extractor sources are yielded page by page as they
+        arrive, columnar datasets batch by batch and files `chunk_rows` rows at a time.
+        """
+        if isinstance(self.source, Path):
+            yield from iter_dataframe(
+                self.source.absolute(), self.chunk_rows, self.reader_engine, self.dtype
+            )
+        elif isinstance(self.source, ColumnarDataset):
+            yield from self.source.iter_batches(self.chunk_rows)
+        elif isinstance(self.source, Extractor) and self.endpoint is not None:
+            yield from self.source.iter_records(  # type: ignore
+                endpoint_tuple=self.endpoint,
+                limit=self.limit,
+            )
+        else:
+            self.get_data()
+            yield self.data
+
     def set_table_key(self) -> None | TypeError:
         if self.uid_key_list is None:
-            self.data["rawKey"] = [str(uuid.uuid4()) for _ in range(len(self.data.index))]
+            if self._resuming:
+                raise ValueError(
+                    f"Can not resume from {self.checkpoint.path} with generated keys, "
+                    "new keys would push the completed chunks again as duplicates. "
+                    "Set uid_key_list, or delete the pushed rows and the checkpoint"
+                )
+            self.data["rawKey"] = uuid4_strings(len(self.data.index))
+
+        elif isinstance(self.uid_key_list, str) and self.hash_key:
+            self.data["rawKey"] = hash_columns(self.data, [self.uid_key_list])
 
         elif isinstance(self.uid_key_list, str):
             self.data["rawKey"] = self.data[self.uid_key_list].astype(str)
@@ -1024,9 +1730,10 @@ class PipelineToCDF(ABC):
 
         elif isinstance(self.uid_key_list, list):
             self.data[self.uid_key_list] = self.data[self.uid_key_list].astype(str)
-            self.data["rawKey"] = self.data[self.uid_key_list].apply(
-                lambda row: "-".join(row.values.astype(str)), axis=1
-            )
+            if self.hash_key:
+                self.data["rawKey"] = hash_columns(self.data, self.uid_key_list)
+            else:
+                self.data["rawKey"] = join_columns(self.data, self.uid_key_list)
         else:
             raise TypeError("'uid_key_list' must be either one of types: None, list, str")
 
@@ -1043,33 +1750,147 @@ class PipelineToCDF(ABC):
                 self.data.drop_duplicates(subset=self.uid_key_list)
             )
 
-    def push_data(self) -> None:
-        start_row: int = 0
-        nrows: int = 100_000
+    def _row_hashes(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Content hash per rawKey over all columns, independent of column order and of
+        the dtypes that change in a RAW round trip, see `_canonical_strings`.
+        """
+        strings = pd.DataFrame(
+            {i: _canonical_strings(data[i]) for i in data.columns}, index=data.index
+        )
+        return hash_columns(strings, sorted(data.columns, key=str))
+
+    def _get_previous_hashes(self) -> pd.Series:
+        """rawKey hashes of the last run, from the snapshot or read back from RAW."""
+        if self._previous_hashes is not None:
+            return self._previous_hashes
 
-        while start_row < len(self.data):
-            self.cdf.insert_records_into_raw(
-                dbname=self.cdf_db_name,
-                table_name=self.cdf_table,
-                dataframe=self.data[start_row : start_row + nrows],  # noqa: E203
-                ensure_parent=True,
-            )
-            print(
-                f"Rows -> {start_row:>7} : "
-                f"{start_row + len(self.data[start_row: start_row + nrows]):<7}"
-                f"pushed successfully"
-            )
+        if self.delta_snapshot is not None and self.delta_snapshot.exists():
+            self._previous_hashes = pd.read_parquet(self.delta_snapshot)["hash"]
+        else:
+            columns = [str(i) for i in self.data.columns]
+            try:
+                frames = list(
+                    self.cdf.iter_records(
+                        self.cdf_db_name, self.cdf_table, columns=columns
+                    )
+                )
+            except CogniteAPIError as e:
+                # First run into a table that does not exist yet
+                if e.code != 404:
+                    raise
+                frames = list()
+            raw = pd.concat(frames) if frames else pd.DataFrame(columns=columns)
+            self._previous_hashes = self._row_hashes(raw.reindex(columns=columns))
+
+        return self._previous_hashes
+
+    def _get_delta(self) -> pd.DataFrame:
+        """Rows of data that are new or changed since the last run."""
+        hashes = self._row_hashes(self.data)
+        self._current_hashes.append(hashes)
+
+        previous = self._get_previous_hashes().reindex(hashes.index)
+        changed = self.data[hashes.ne(previous).to_numpy()]
+        print(
+            f"Delta -> {len(changed)} of {len(self.data)} rows new or changed "
+            f"since the last run"
+        )
+        return changed
+
+    def _finish_delta(self) -> None:
+        """Delete vanished keys if asked for and save the hashes of this run."""
+        if not self.delta:
+            return None
+
+        current = (
+            pd.concat(self._current_hashes)
+            if self._current_hashes
+            else pd.Series(dtype=str)
+        )
+        current = current[~current.index.duplicated(keep="last")]
+        if self.delete_vanished:
+            vanished = self._get_previous_hashes().index.difference(current.index)
+            if len(vanished) > 0:
+                self.cdf.delete_records_in_chunks(
+                    self.cdf_db_name,
+                    {self.cdf_table: vanished.tolist()},
+                    max_workers=self.max_workers,
+                    max_retries=self.max_retries,
+                )
 
-            start_row += nrows
+        if self.delta_snapshot is not None:
+            self.delta_snapshot.parent.mkdir(parents=True, exist_ok=True)
+            snapshot = pd.DataFrame({"hash": current})
+            snapshot.index = snapshot.index.astype(str)
+            snapshot.to_parquet(self.delta_snapshot)
+
+        self._previous_hashes = None
+        self._current_hashes = list()
+
+    def push_data(self, keep_checkpoint: bool = False) -> None:
+        """
+        Push data to CDF in chunks, see `CDF.insert_dataframe_in_chunks`. In delta
+        mode only new or changed rows are pushed.
+
+        Args:
+            keep_checkpoint (bool, optional): Keep the checkpoint and delta hashes
+                after a successful push, e.g. while streaming chunks of one run.
+                Defaults to False.
+        """
+        self.cdf.insert_dataframe_in_chunks(
+            db_name=self.cdf_db_name,
+            table_name=self.cdf_table,
+            dataframe=self._get_delta() if self.delta else self.data,
+            chunk_rows=self.chunk_rows,
+            chunk_bytes=self.chunk_bytes,
+            max_workers=self.max_workers,
+            max_retries=self.max_retries,
+            journal=self.checkpoint,
+            ensure_parent=True,
+        )
+        if not keep_checkpoint:
+            self.checkpoint.clear()
+            self._finish_delta()
 
         print("Data push has been completed!")
 
-    def run_pipeline(self) -> None:
-        self.get_data()
-        self.transform()
-        self.set_table_key()
-        self.validate()
-        self.push_data()
+    def run_pipeline(self, stream: bool = False) -> None:
+        """
+        Run pipeline stages get_data, transform, set_table_key, validate and push_data.
+
+        Args:
+            stream (bool, optional): Run the stages per chunk yielded by `iter_data` so
+                that Extractor pages are pushed to CDF as they arrive, instead of
+                loading all data first. Keys are checked to be unique over all chunks
+                with a compact `SeenKeys` set. Defaults to False.
+        """
+        if not stream:
+            self.get_data()
+            self.transform()
+            self.set_table_key()
+            self.validate()
+            self.push_data()
+            return None
+
+        seen_keys = SeenKeys()
+        for chunk in self.iter_data():
+            self.data = chunk
+            self.transform()
+            self.set_table_key()
+            self.validate()
+            if self.uid_key_list is not None:
+                duplicated = seen_keys.contains(self.data.index)
+                if duplicated.any():
+                    raise ValueError(
+                        f"{duplicated.sum()} keys of the chunk are in earlier chunks, "
+                        f"e.g. '{self.data.index[duplicated][0]}'"
+                    )
+                seen_keys.add(self.data.index)
+            self.push_data(keep_checkpoint=True)
+
+        self.checkpoint.clear()
+        self._finish_delta()
 
     def __str__(self) -> str:
         return f"PipelineToCDF from {self.source}"
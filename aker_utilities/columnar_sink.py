@@ -0,0 +1,314 @@
+from pathlib import Path
+from typing import Iterator, Literal
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ARROW_STREAM_FILE: str = "data.arrows"
+
+
+def _unify_field(old: pa.Field, new: pa.Field) -> pa.Field:
+    try:
+        schema = pa.unify_schemas(
+            [pa.schema([old]), pa.schema([new])], promote_options="permissive"
+        )
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        return pa.field(old.name, pa.string())
+
+    return schema.field(0)
+
+
+def _unify_schemas(old: pa.Schema, new: pa.Schema) -> pa.Schema:
+    """
+    Schema that can hold the records of both schemas. Null columns take the type of
+    the other side, integers are widened or promoted to float and incompatible types
+    fall back to string. Columns only in `new` are appended.
+    """
+    fields = [
+        _unify_field(i, new.field(i.name)) if i.name in new.names else i for i in old
+    ]
+    fields += [i for i in new if i.name not in old.names]
+    return pa.schema(fields)
+
+
+def _mixed_as_string(df: pd.DataFrame) -> pd.DataFrame:
+    """Object columns holding more than one type of value, e.g. 1 and "x", as str."""
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        notna = df[col].notna()
+        if df.loc[notna, col].map(type).nunique() > 1:
+            df.loc[notna, col] = df.loc[notna, col].astype(str)
+
+    return df
+
+
+def _cast_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    columns = list()
+    for field in schema:
+        if field.name not in table.column_names:
+            columns.append(pa.nulls(len(table), field.type))
+            continue
+
+        column = table.column(field.name)
+        try:
+            columns.append(column.cast(field.type))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(
+                f"Column {field.name} of type {column.type} can not be written as "
+                f"{field.type}: {e}"
+            ) from e
+
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class ColumnarDataset:
+    def __init__(
+        self,
+        path: Path,
+        format: Literal["parquet", "arrow"] = "parquet",
+    ):
+        """
+        Lazy handle of records written by `ColumnarSink`. Nothing is read until the
+        records are iterated, so tables larger than memory can be processed in chunks.
+
+        Args:
+            path (Path): Dataset directory
+            format (Literal["parquet", "arrow"], optional): Defaults to "parquet".
+        """
+        self.path = Path(path)
+        self.format = format
+
+    @property
+    def files(self) -> list[Path]:
+        if self.format == "parquet":
+            return sorted(self.path.glob("part-*.parquet"))
+
+        return [i for i in [self.path / ARROW_STREAM_FILE] if i.exists()]
+
+    @property
+    def schema(self) -> pa.Schema:
+        if self.format == "parquet":
+            return pq.read_schema(self.files[0])
+
+        with pa.ipc.open_stream(self.files[0]) as reader:
+            return reader.schema
+
+    @property
+    def rows(self) -> int:
+        if self.format == "parquet":
+            return sum(pq.ParquetFile(i).metadata.num_rows for i in self.files)
+
+        return sum(len(i) for i in self.iter_record_batches())
+
+    def iter_record_batches(self, batch_size: int = 100_000) -> Iterator[pa.RecordBatch]:
+        if self.format == "parquet":
+            for file in self.files:
+                yield from pq.ParquetFile(file).iter_batches(batch_size=batch_size)
+            return None
+
+        for file in self.files:
+            with pa.ipc.open_stream(file) as reader:
+                for batch in reader:
+                    for offset in range(0, len(batch), batch_size):
+                        yield batch.slice(offset, batch_size)
+
+    def iter_batches(self, batch_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Yield records as DataFrames of at most `batch_size` rows.
+
+        Args:
+            batch_size (int, optional): Defaults to 100_000.
+
+        Yields:
+            pd.DataFrame: _description_
+        """
+        for batch in self.iter_record_batches(batch_size):
+            yield batch.to_pandas()
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Read the whole dataset into a single DataFrame."""
+        if len(self.files) == 0:
+            return pd.DataFrame()
+
+        if self.format == "parquet":
+            return pq.ParquetDataset(self.files).read().to_pandas()
+
+        with pa.ipc.open_stream(self.files[0]) as reader:
+            return reader.read_all().to_pandas()
+
+    def __str__(self) -> str:
+        return f"Columnar dataset: {self.path} ({self.format})"
+
+    def __repr__(self) -> str:
+        return f"Columnar dataset: {self.path} ({self.format})"
+
+
+class ColumnarSink:
+    def __init__(
+        self,
+        path: Path,
+        format: Literal["parquet", "arrow"] = "parquet",
+        max_rows_per_file: int = 1_000_000,
+        schema: pa.Schema | None = None,
+    ):
+        """
+        Write pages of records into a Parquet dataset, one row group per page and a new
+        part file every `max_rows_per_file` rows, or into a single Arrow IPC stream.
+
+        Without an explicit `schema` the schema follows the pages: empty columns take
+        the type of the first page with values, integers are promoted to float, mixed
+        types fall back to string and new columns are added. A Parquet page that
+        changes the schema starts a new part file and earlier part files are rewritten
+        to the final schema on `close`, so every part file has the same schema. An
+        Arrow stream can not change its schema, so empty columns of the first page are
+        typed as string and a page that needs another schema raises ValueError.
+        Columns missing on a page are written as null and columns with mixed types
+        within a page as string.
+
+        Args:
+            path (Path): Dataset directory, part files from a previous run are replaced
+            format (Literal["parquet", "arrow"], optional): Defaults to "parquet".
+            max_rows_per_file (int, optional): Defaults to 1_000_000.
+            schema (pa.Schema | None, optional): Fixed schema of the dataset, pages
+                with other columns or values that can not be cast raise ValueError.
+                Defaults to None.
+
+        Example:
+            >>> with ColumnarSink(Path("notifications")) as sink:
+            >>>     for page in apim.iter_records(notif, as_records=True):
+            >>>         sink.write(page)
+            >>> for df in sink.dataset.iter_batches():
+            >>>     ...
+        """
+        if format not in ("parquet", "arrow"):
+            raise ValueError("format must be either one of: 'parquet', 'arrow'")
+
+        self.dataset = ColumnarDataset(path, format)
+        self.max_rows_per_file = max_rows_per_file
+        self.schema: pa.Schema | None = schema
+        self.rows: int = 0
+
+        self._fixed_schema: bool = schema is not None
+
+        self._writer: pq.ParquetWriter | pa.ipc.RecordBatchStreamWriter | None = None
+        self._file_rows: int = 0
+        self._n_files: int = 0
+
+        self.dataset.path.mkdir(parents=True, exist_ok=True)
+        for file in self.dataset.path.glob("part-*.parquet"):
+            file.unlink()
+        (self.dataset.path / ARROW_STREAM_FILE).unlink(missing_ok=True)
+
+    def _to_table(self, page: list[dict] | pd.DataFrame) -> pa.Table:
+        try:
+            if isinstance(page, pd.DataFrame):
+                table = pa.Table.from_pandas(page, preserve_index=False)
+            else:
+                table = pa.Table.from_pylist(page)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            page = _mixed_as_string(pd.DataFrame(page))
+            table = pa.Table.from_pandas(page, preserve_index=False)
+        table = table.replace_schema_metadata(None)
+
+        if self._fixed_schema:
+            extra = [i for i in table.column_names if i not in self.schema.names]
+            if len(extra) > 0:
+                raise ValueError(f"Columns not in the sink schema: {extra}")
+            return _cast_table(table, self.schema)  # type: ignore
+
+        if self.schema is None:
+            schema = table.schema
+            if self.dataset.format == "arrow":
+                schema = pa.schema(
+                    [
+                        pa.field(i.name, pa.string()) if pa.types.is_null(i.type) else i
+                        for i in schema
+                    ]
+                )
+        else:
+            schema = _unify_schemas(self.schema, table.schema)
+
+        if self.schema is not None and not schema.equals(self.schema):
+            if self.dataset.format == "arrow":
+                raise ValueError(
+                    f"Page changes the schema of the Arrow stream from {self.schema} "
+                    f"to {schema}, use the parquet format or an explicit schema"
+                )
+            self._close_writer()
+
+        self.schema = schema
+        return _cast_table(table, schema)
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _align_part_files(self) -> None:
+        """Rewrite part files written before a schema change, one row group at a time"""
+        for file in self.dataset.files:
+            if pq.read_schema(file).equals(self.schema):
+                continue
+
+            temp = file.with_suffix(".tmp")
+            with pq.ParquetFile(file) as reader:
+                with pq.ParquetWriter(temp, self.schema) as writer:
+                    for i in range(reader.num_row_groups):
+                        table = reader.read_row_group(i).replace_schema_metadata(None)
+                        writer.write_table(_cast_table(table, self.schema))
+            temp.replace(file)
+
+    def _open_writer(self) -> None:
+        if self.dataset.format == "parquet":
+            file = self.dataset.path / f"part-{self._n_files:05d}.parquet"
+            self._writer = pq.ParquetWriter(file, self.schema)
+        else:
+            file = self.dataset.path / ARROW_STREAM_FILE
+            self._writer = pa.ipc.new_stream(file, self.schema)
+
+        self._n_files += 1
+        self._file_rows = 0
+
+    def write(self, page: list[dict] | pd.DataFrame) -> None:
+        """
+        Append a page of records, either decoded records or a DataFrame.
+
+        Args:
+            page (list[dict] | pd.DataFrame): _description_
+        """
+        if len(page) == 0:
+            return None
+
+        table = self._to_table(page)
+
+        if self.dataset.format == "parquet":
+            if self._file_rows >= self.max_rows_per_file:
+                self._close_writer()
+
+        if self._writer is None:
+            self._open_writer()
+
+        self._writer.write_table(table)  # type: ignore
+        self._file_rows += len(table)
+        self.rows += len(table)
+
+    def close(self) -> ColumnarDataset:
+        """Close the open file and return the lazy handle of the written dataset."""
+        self._close_writer()
+        if self.dataset.format == "parquet" and self.schema is not None:
+            self._align_part_files()
+
+        return self.dataset
+
+    def __enter__(self) -> "ColumnarSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return f"Columnar sink: {self.dataset.path} ({self.dataset.format})"
+
+    def __repr__(self) -> str:
+        return f"Columnar sink: {self.dataset.path} ({self.dataset.format})"
@@ -0,0 +1,94 @@
+import json
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+# A hook receives every event as a plain dict, see `emit_event`
+EventHook = Callable[[dict[str, Any]], None]
+
+
+def emit_event(hooks: list[EventHook], event: str, **fields: Any) -> dict[str, Any]:
+    """
+    Send an event to all hooks. A failing hook is reported and skipped, instrumentation
+    must never abort an extraction.
+
+    Args:
+        hooks (list[EventHook]): Callables receiving the event dict
+        event (str): Event name, e.g. "page" or "endpoint"
+        **fields: Event fields
+
+    Returns:
+        dict[str, Any]: The event with its "event" and "time" fields
+    """
+    payload: dict[str, Any] = {"event": event, "time": datetime.now().isoformat()}
+    payload.update(fields)
+
+    for hook in hooks:
+        try:
+            hook(payload)
+        except Exception as e:
+            print(f"\nEvent hook {hook!r} failed: {e!r}")
+
+    return payload
+
+
+class JsonLinesEventWriter:
+    def __init__(self, path: Path):
+        """
+        Hook appending every event as a line of JSON, so runs can be compared over
+        time, e.g. with `pd.read_json(path, lines=True)`.
+
+        Args:
+            path (Path): JSON lines file, created if it does not exist
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def __str__(self) -> str:
+        return f"JSON lines event writer: {self.path}"
+
+    def __repr__(self) -> str:
+        return f"JSON lines event writer: {self.path}"
+
+
+class EventCollector:
+    def __init__(self):
+        """Hook keeping events in memory, e.g. for tests or notebooks."""
+        self.events: list[dict[str, Any]] = list()
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def of_type(self, event: str) -> list[dict[str, Any]]:
+        return [i for i in self.events if i["event"] == event]
+
+    def by_table(self, event: str) -> dict[str, list[dict[str, Any]]]:
+        """Events of the given type grouped by their "table" field."""
+        grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for i in self.of_type(event):
+            grouped[i.get("table", "")].append(i)
+
+        return dict(grouped)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events.clear()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __str__(self) -> str:
+        return f"Event collector: {len(self.events)} events"
+
+    def __repr__(self) -> str:
+        return f"Event collector: {len(self.events)} events"
@@ -1,9 +1,37 @@
 import datetime
+import importlib.util
 import math
+import os
+import warnings
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from pandas.errors import OutOfBoundsDatetime
 
 from aker_utilities.path_utils import checkfile
 
+# Integers without leading zeros, SAP codes like "0001" must stay strings
+INTEGER_PATTERN = r"^-?(?:0|[1-9]\d{0,17})$"
+ODATA_DATE_PATTERN = r"^/Date\((-?\d+)(?:[+-]\d{4})?\)/$"
+ISO_DATE_PATTERN = (
+    r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2})?)?$"
+)
+# Smaller CSV files are read faster by the C engine than by starting pyarrow threads
+PYARROW_CSV_MIN_BYTES: int = 20_000_000
+# Reader engines per file type, "auto" picks one by file type and size
+READER_ENGINES: dict[str, tuple[str, ...]] = {
+    ".csv": ("auto", "c", "pyarrow"),
+    ".xlsx": ("auto", "openpyxl", "calamine"),
+    ".parquet": ("auto", "pyarrow"),
+}
+# dtype hints read as strings, e.g. to keep leading zeros of SAP codes
+STRING_DTYPES: tuple = (str, "str", "string", object, "object")
+
 
 def dataframe_diff(df1, df2):
     """
@@ -198,3 +226,393 @@ def sort_groupby_hierarchical(
         )
 
     return df
+
+
+def _parse_iso_dates(values: pd.Series) -> pd.Series:
+    """
+    ISO dates as datetime64[ns], or datetime64[ms] outside its range. Unchanged if some
+    are not real dates, e.g. "0000-00-00", or if their UTC offsets are mixed.
+    """
+    try:
+        with warnings.catch_warnings():
+            # Mixed offsets give an object column of Timestamps, an error in later pandas
+            warnings.simplefilter("ignore", FutureWarning)
+            parsed = pd.to_datetime(values.astype(str), format="ISO8601")
+    except OutOfBoundsDatetime:
+        try:
+            return values.astype(str).astype("datetime64[ms]")
+        except ValueError:
+            return values
+    except ValueError:
+        return values
+
+    return values if parsed.dtype == object else parsed
+
+
+def compact_dtypes(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Return a copy of the frame with compact dtypes instead of Python object columns.
+    Every column is parsed once:
+    - "/Date(ms)/" and ISO dates -> datetime64[ns], datetime64[ms] outside its range,
+      invalid dates or mixed UTC offsets stay strings
+    - strings with unique values / rows <= category_ratio -> category
+    - integer strings without leading zeros -> Int64
+    - other strings -> string[pyarrow]
+
+    Non-string objects, e.g. `__metadata` dicts, are kept as their str representation.
+    Missing values stay missing.
+
+    Args:
+        df (pd.DataFrame): _description_
+        category_ratio (float, optional): Max ratio of unique values for category.
+            Defaults to 0.5.
+
+    Returns:
+        pd.DataFrame: _description_
+    """
+    compact: dict[str, pd.Series] = dict()
+    for col in df.columns:
+        series = df[col]
+        if series.dtype != object:
+            compact[col] = series
+            continue
+
+        notna = series.notna()
+        values = series[notna]
+        if not values.map(type).eq(str).all():
+            values = values.astype(str)
+        values = values.astype("string[pyarrow]")
+
+        if len(values) == 0:
+            parsed = values
+        elif values.str.fullmatch(ODATA_DATE_PATTERN).all():
+            millis = values.str.extract(ODATA_DATE_PATTERN, expand=False).astype("int64")
+            try:
+                parsed = pd.to_datetime(millis, unit="ms")
+            except OutOfBoundsDatetime:
+                # e.g. SAP's open end date 9999-12-31 does not fit in nanoseconds
+                parsed = millis.astype("datetime64[ms]")
+        elif values.str.fullmatch(ISO_DATE_PATTERN).all():
+            parsed = _parse_iso_dates(values)
+        elif values.nunique() / len(series) <= category_ratio:
+            # Low cardinality codes, e.g. plants or types, are categories even if numeric
+            parsed = values.astype(str).astype("category")
+        elif values.str.fullmatch(INTEGER_PATTERN).all():
+            parsed = pd.to_numeric(values.astype(str)).astype("Int64")
+        else:
+            parsed = values
+
+        compact[col] = parsed.reindex(series.index)
+
+    return pd.DataFrame(compact, index=df.index)
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    """Deep memory usage of the frame in MB, including the index"""
+    return df.memory_usage(index=True, deep=True).sum() / 1e6
+
+
+def join_columns(df: pd.DataFrame, columns: list[str], sep: str = "-") -> pd.Series:
+    """
+    Vectorized `sep.join` of the columns as str per row, the same strings as
+    `df[columns].apply(lambda row: sep.join(row.values.astype(str)), axis=1)`.
+    """
+    values = [df[i].astype(str) for i in columns]
+    if len(values) == 1:
+        return values[0]
+
+    return values[0].str.cat(values[1:], sep=sep)
+
+
+def _hex_strings(data: np.ndarray, width: int) -> np.ndarray:
+    """Lowercase hex string of every row of a uint8 array, `width` bytes per row."""
+    return np.frombuffer(data.tobytes().hex().encode(), dtype=f"S{2 * width}").astype(str)
+
+
+def hash_columns(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """
+    Deterministic 16 hex digit key of the columns as str per row, the same values give
+    the same key in every run. Keys are 64 bit hashes, so a collision is unlikely but
+    possible, about 1 in 10 million for 2 million distinct rows.
+
+    Args:
+        df (pd.DataFrame): _description_
+        columns (list[str]): _description_
+
+    Returns:
+        pd.Series: Key per row with the index of the frame
+    """
+    hashes = pd.util.hash_pandas_object(df[columns].astype(str), index=False)
+    data = hashes.to_numpy().astype(">u8").view(np.uint8)
+
+    return pd.Series(_hex_strings(data, 8), index=df.index)
+
+
+def uuid4_strings(n: int) -> np.ndarray:
+    """
+    `n` random version 4 UUID strings built in bulk from `os.urandom`, formatted
+    like `str(uuid.uuid4())` without a Python call per row.
+    """
+    data = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    data[:, 6] = data[:, 6] & 0x0F | 0x40  # version 4
+    data[:, 8] = data[:, 8] & 0x3F | 0x80  # RFC 4122 variant
+
+    digits = np.frombuffer(data.tobytes().hex().encode(), dtype=np.uint8).reshape(n, 32)
+    chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+    # 8-4-4-4-12 digit groups, shifted right by the dashes before them
+    groups = [(0, 8), (8, 12), (12, 16), (16, 20), (20, 32)]
+    for dashes, (start, end) in enumerate(groups):
+        chars[:, start + dashes : end + dashes] = digits[:, start:end]
+
+    return chars.view("S36").reshape(n).astype(str)
+
+
+def _pyarrow_csv_options(
+    dtype: dict[str, Any], sep: str, encoding: str
+) -> dict[str, Any]:
+    """pyarrow CSV options giving the same columns as the C engine."""
+    return dict(
+        read_options=pa_csv.ReadOptions(encoding=encoding),
+        parse_options=pa_csv.ParseOptions(delimiter=sep),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={k: pa.string() for k, v in dtype.items() if v in STRING_DTYPES},
+            strings_can_be_null=True,
+            # An empty list still infers ISO 8601 timestamps, a format that never
+            # matches keeps them as the original strings, as with the C engine
+            timestamp_parsers=["\x01"],
+        ),
+    )
+
+
+def _pyarrow_csv_to_pandas(table: pa.Table, dtype: dict[str, Any]) -> pd.DataFrame:
+    # Dates and times stay strings and empty columns are NaN, as with the C engine
+    for i, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+        elif pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+
+    df = table.to_pandas()
+    return df.astype({k: v for k, v in dtype.items() if v not in STRING_DTYPES})
+
+
+def _check_reader_engine(path: Path, engine: str) -> None:
+    if path.suffix not in READER_ENGINES:
+        raise ValueError("File format not supported")
+    if engine not in READER_ENGINES[path.suffix]:
+        raise ValueError(
+            f"engine for {path.suffix} files must be either one of: "
+            f"{', '.join(repr(i) for i in READER_ENGINES[path.suffix])}"
+        )
+
+
+def _read_csv_pyarrow(
+    path: Path, dtype: dict[str, Any], sep: str, encoding: str
+) -> pd.DataFrame:
+    """Multi-threaded pyarrow CSV read giving the same columns as the C engine."""
+    table = pa_csv.read_csv(path, **_pyarrow_csv_options(dtype, sep, encoding))
+    return _pyarrow_csv_to_pandas(table, dtype)
+
+
+def _iter_csv_pyarrow(
+    path: Path, chunk_rows: int, dtype: dict[str, Any], sep: str, encoding: str
+) -> Iterator[pd.DataFrame]:
+    """
+    Streamed pyarrow CSV read, `chunk_rows` rows at a time. Column types are inferred
+    from the first block, if a later block does not convert to them, e.g. "A12" in a
+    numeric column, the rest of the file is read by the C engine instead.
+    """
+    batches: list[pa.RecordBatch] = list()
+    rows = 0
+    start = 0
+    with pa_csv.open_csv(path, **_pyarrow_csv_options(dtype, sep, encoding)) as reader:
+        while True:
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                break
+            except pa.ArrowInvalid as e:
+                print(f"\npyarrow CSV read failed at row {start} ({e}), continue with C")
+                chunks = pd.read_csv(
+                    path,
+                    sep=sep,
+                    encoding=encoding,
+                    dtype=dtype or None,
+                    chunksize=chunk_rows,
+                    skiprows=range(1, start + 1),
+                )
+                for df in chunks:
+                    df.index = pd.RangeIndex(start, start + len(df))
+                    start += len(df)
+                    yield df
+                return None
+
+            batches.append(batch)
+            rows += len(batch)
+            if rows < chunk_rows:
+                continue
+
+            table = pa.Table.from_batches(batches)
+            for offset in range(0, rows - chunk_rows + 1, chunk_rows):
+                df = _pyarrow_csv_to_pandas(table.slice(offset, chunk_rows), dtype)
+                df.index = pd.RangeIndex(start, start + len(df))
+                start += len(df)
+                yield df
+
+            rest = table.slice(rows - rows % chunk_rows)
+            batches = rest.to_batches()
+            rows = len(rest)
+
+    if rows > 0:
+        df = _pyarrow_csv_to_pandas(pa.Table.from_batches(batches), dtype)
+        df.index = pd.RangeIndex(start, start + len(df))
+        yield df
+
+
+def _iter_excel_openpyxl(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield the first sheet of an xlsx file `chunk_rows` rows at a time, streamed by
+    openpyxl in read-only mode, the first row is the header.
+    """
+    # Optional dependency, as for pd.read_excel
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return None
+
+        chunk: list[tuple] = list()
+        start = 0
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                index = pd.RangeIndex(start, start + len(chunk))
+                yield pd.DataFrame(chunk, columns=header, index=index)
+                start += len(chunk)
+                chunk = list()
+
+        if chunk:
+            index = pd.RangeIndex(start, start + len(chunk))
+            yield pd.DataFrame(chunk, columns=header, index=index)
+    finally:
+        workbook.close()
+
+
+def read_dataframe(
+    path: Path,
+    engine: Literal["auto", "c", "pyarrow", "openpyxl", "calamine"] = "auto",
+    dtype: dict[str, Any] | None = None,
+    sep: str = ";",
+    encoding: str = "latin-1",
+) -> pd.DataFrame:
+    """
+    Read a csv, xlsx or parquet file with the reader engine picked by file type and
+    size when engine is "auto":
+    - csv -> multi-threaded pyarrow from PYARROW_CSV_MIN_BYTES on, else the C engine
+    - xlsx -> calamine if python-calamine is installed, else openpyxl
+    - parquet -> pyarrow
+
+    Args:
+        path (Path): _description_
+        engine (Literal["auto", "c", "pyarrow", "openpyxl", "calamine"], optional):
+            Defaults to "auto".
+        dtype (dict[str, Any] | None, optional): dtype per column, str keeps values
+            like "0001" as they are. Defaults to None.
+        sep (str, optional): csv delimiter. Defaults to ";".
+        encoding (str, optional): csv encoding. Defaults to "latin-1".
+
+    Raises:
+        ValueError: If the file type or the engine for it is not supported
+
+    Returns:
+        pd.DataFrame: _description_
+    """
+    path = Path(path)
+    dtype = dtype or dict()
+    _check_reader_engine(path, engine)
+
+    if path.suffix == ".csv":
+        if engine == "auto":
+            large = path.stat().st_size >= PYARROW_CSV_MIN_BYTES
+            engine = "pyarrow" if large else "c"
+        if engine == "pyarrow":
+            return _read_csv_pyarrow(path, dtype, sep, encoding)
+        return pd.read_csv(path, sep=sep, encoding=encoding, dtype=dtype or None)
+
+    if path.suffix == ".xlsx":
+        if engine == "auto":
+            calamine = importlib.util.find_spec("python_calamine") is not None
+            engine = "calamine" if calamine else "openpyxl"
+        return pd.read_excel(path, engine=engine, dtype=dtype or None)
+
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path).astype(dtype)
+
+    raise ValueError("File format not supported")
+
+
+def iter_dataframe(
+    path: Path,
+    chunk_rows: int = 100_000,
+    engine: Literal["auto", "c", "pyarrow", "openpyxl", "calamine"] = "auto",
+    dtype: dict[str, Any] | None = None,
+    sep: str = ";",
+    encoding: str = "latin-1",
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a csv, xlsx or parquet file `chunk_rows` rows at a time, with the same
+    reader engines and options as `read_dataframe`. When engine is "auto":
+    - csv -> streamed pyarrow from PYARROW_CSV_MIN_BYTES on, else the C engine
+    - xlsx -> openpyxl in read-only mode, calamine reads the whole sheet first
+    - parquet -> pyarrow, batch by batch
+
+    Args:
+        path (Path): _description_
+        chunk_rows (int, optional): Defaults to 100_000.
+        engine (Literal["auto", "c", "pyarrow", "openpyxl", "calamine"], optional):
+            Defaults to "auto".
+        dtype (dict[str, Any] | None, optional): See `read_dataframe`.
+        sep (str, optional): csv delimiter. Defaults to ";".
+        encoding (str, optional): csv encoding. Defaults to "latin-1".
+
+    Raises:
+        ValueError: If the file type or the engine for it is not supported
+
+    Yields:
+        pd.DataFrame: _description_
+    """
+    path = Path(path)
+    dtype = dtype or dict()
+    _check_reader_engine(path, engine)
+
+    if path.suffix == ".csv":
+        if engine == "auto":
+            large = path.stat().st_size >= PYARROW_CSV_MIN_BYTES
+            engine = "pyarrow" if large else "c"
+        if engine == "pyarrow":
+            yield from _iter_csv_pyarrow(path, chunk_rows, dtype, sep, encoding)
+            return None
+        yield from pd.read_csv(
+            path, sep=sep, encoding=encoding, dtype=dtype or None, chunksize=chunk_rows
+        )
+        return None
+
+    if path.suffix == ".xlsx":
+        if engine == "calamine":
+            df = read_dataframe(path, engine, dtype)
+            for start in range(0, len(df), chunk_rows):
+                yield df.iloc[start : start + chunk_rows]
+            return None
+        for chunk in _iter_excel_openpyxl(path, chunk_rows):
+            yield chunk.astype(dtype)
+        return None
+
+    if path.suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas().astype(dtype)
+        return None
+
+    raise ValueError("File format not supported")
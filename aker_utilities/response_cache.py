@@ -0,0 +1,204 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import requests
+
+# Header set on responses served from the cache, "hit" or "revalidated"
+CACHE_HEADER: str = "X-Extractor-Cache"
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: Path,
+        ttl: timedelta | None = timedelta(hours=12),
+        max_bytes: int = 2_000_000_000,
+    ):
+        """
+        On disk cache of successful GET responses keyed by the full url, query included.
+
+        A response younger than `ttl` is served without touching the network. An older
+        one is revalidated with If-None-Match / If-Modified-Since when the service gave
+        an ETag or Last-Modified, and served again on 304 Not Modified. When the cache
+        grows over `max_bytes`, the least recently used responses are evicted.
+
+        ```
+        cache/
+            3f1c...e2.body    response content
+            3f1c...e2.json    {"url", "stored_at", "etag", "last_modified", "headers"}
+        ```
+
+        Args:
+            path (Path): Cache directory, created on first write if it does not exist
+            ttl (timedelta | None, optional): Max age of a response served without
+                revalidation, None to always serve cached responses.
+                Defaults to timedelta(hours=12).
+            max_bytes (int, optional): Size cap of the cached bodies.
+                Defaults to 2_000_000_000.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # key -> (body size, last access), least recently used is evicted first
+        self._index: dict[str, tuple[int, float]] = dict()
+        if self.path.exists():
+            for body in self.path.glob("*.body"):
+                stat = body.stat()
+                self._index[body.stem] = (stat.st_size, stat.st_mtime)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    @property
+    def size(self) -> int:
+        return sum(i[0] for i in self._index.values())
+
+    def _read(self, key: str) -> tuple[dict[str, Any], bytes] | None:
+        try:
+            meta = json.loads((self.path / f"{key}.json").read_text())
+            body = (self.path / f"{key}.body").read_bytes()
+        except FileNotFoundError:
+            return None
+
+        return meta, body
+
+    def _touch(self, key: str) -> None:
+        now = time.time()
+        with self._lock:
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        try:
+            (self.path / f"{key}.body").touch()
+        except FileNotFoundError:
+            pass
+
+    def _response(
+        self, url: str, meta: dict[str, Any], body: bytes, how: str
+    ) -> requests.Response:
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response._content = body
+        response.headers.update(meta["headers"])
+        response.headers[CACHE_HEADER] = how
+        return response
+
+    def get(
+        self, session: requests.Session, url: str, **kwargs: Any
+    ) -> requests.Response:
+        """
+        GET the url through the cache, keyword arguments are passed to `session.get`.
+
+        Args:
+            session (requests.Session): _description_
+            url (str): _description_
+
+        Returns:
+            requests.Response: Fresh, revalidated or new response
+        """
+        key = self._key(url)
+        cached = self._read(key) if key in self._index else None
+
+        headers: dict[str, str] = dict(kwargs.pop("headers", None) or {})
+        if cached is not None:
+            (meta, body) = cached
+            age = time.time() - meta["stored_at"]
+            if self.ttl is None or age <= self.ttl.total_seconds():
+                self._touch(key)
+                return self._response(url, meta, body, "hit")
+
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            (meta, body) = cached
+            meta["stored_at"] = time.time()
+            self._write_meta(key, meta)
+            self._touch(key)
+            return self._response(url, meta, body, "revalidated")
+
+        if response.status_code == 200:
+            self.put(url, response)
+
+        return response
+
+    def _write_meta(self, key: str, meta: dict[str, Any]) -> None:
+        temp = self.path / f"{key}.{threading.get_ident()}.tmp"
+        temp.write_text(json.dumps(meta))
+        temp.replace(self.path / f"{key}.json")
+
+    def put(self, url: str, response: requests.Response) -> None:
+        """Store the response and evict least recently used ones over `max_bytes`."""
+        body = response.content
+        if len(body) > self.max_bytes:
+            return None
+
+        key = self._key(url)
+        meta = {
+            "url": url,
+            "stored_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "headers": {
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() in ("content-type", "etag", "last-modified")
+            },
+        }
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp = self.path / f"{key}.{threading.get_ident()}.body.tmp"
+        temp.write_bytes(body)
+        temp.replace(self.path / f"{key}.body")
+        self._write_meta(key, meta)
+
+        with self._lock:
+            self._index[key] = (len(body), time.time())
+            evicted = self._evict()
+
+        for old in evicted:
+            for suffix in (".body", ".json"):
+                (self.path / f"{old}{suffix}").unlink(missing_ok=True)
+
+    def _evict(self) -> list[str]:
+        """Drop least recently used keys from the index until it fits, lock held."""
+        evicted: list[str] = list()
+        total = self.size
+        for key, (size, _) in sorted(self._index.items(), key=lambda i: i[1][1]):
+            if total <= self.max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+            del self._index[key]
+
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._index)
+            self._index.clear()
+
+        for key in keys:
+            for suffix in (".body", ".json"):
+                (self.path / f"{key}{suffix}").unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __str__(self) -> str:
+        return f"Response cache: {self.path} ({len(self)} responses, {self.size} bytes)"
+
+    def __repr__(self) -> str:
+        return f"Response cache: {self.path} ({len(self)} responses, {self.size} bytes)"
@@ -0,0 +1,155 @@
+# Run with: python -m aker_utilities.tests.api_extractor_bench_manual
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pandas as pd
+
+from aker_utilities.api_extractor import Extractor
+
+PAGE_SIZE: int = 50_000
+REPEAT: int = 5
+EXTRACTOR = Extractor("bench")
+
+
+def sap_like_page(rows: int = PAGE_SIZE) -> bytes:
+    """Synthetic OData v2 page with a SAP flavoured mix of code, text and date fields"""
+    records = [
+        {
+            "__metadata": {"type": "ZEAM_C_NOTIF_Type"},
+            "notNotification": f"{10_000_000 + i}",
+            "notType": ("M1", "M2", "M3")[i % 3],
+            "notPlanningPlant": ("1000", "1100")[i % 2],
+            "notDescription": f"Notification text number {i}",
+            "notPriority": i % 4,
+            "notChangeDate": f"/Date({1_700_000_000_000 + i * 1000})/",
+        }
+        for i in range(rows)
+    ]
+    return json.dumps({"d": {"results": records}}).encode()
+
+
+def decode_round_trip(payload: bytes) -> pd.DataFrame:
+    """Page decoding as it was before, parse -> dump -> parse again"""
+    temp = json.loads(payload)["d"]["results"]
+    return pd.read_json(StringIO(json.dumps(temp)), dtype=False)
+
+
+def decode_direct(payload: bytes, schema: dict[str, str] | None = None) -> pd.DataFrame:
+    """Page decoding as done by Extractor, frame is built from the decoded records"""
+    temp = json.loads(payload)["d"]["results"]
+    return EXTRACTOR._to_frame(temp, schema)
+
+
+def compressed_variants(payload: bytes) -> dict[str, bytes]:
+    """Payload per content encoding, br and zstd only if their libraries are installed"""
+    variants = {"identity": payload, "gzip": gzip.compress(payload, compresslevel=6)}
+    try:
+        import brotli
+
+        variants["br"] = brotli.compress(payload, quality=5)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        variants["zstd"] = zstandard.ZstdCompressor(level=3).compress(payload)
+    except ImportError:
+        pass
+
+    return variants
+
+
+def serve_page(payload: bytes) -> ThreadingHTTPServer:
+    """Serve the page with the best encoding the client accepts"""
+    variants = compressed_variants(payload)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            accepted = self.headers.get("Accept-Encoding", "")
+            encoding = next(
+                (i for i in ["zstd", "br", "gzip"] if i in accepted and i in variants),
+                "identity",
+            )
+            body = variants[encoding]
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if encoding != "identity":
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def transport_per_page(apim: Extractor, url: str) -> tuple[str, int, float, float]:
+    """Return (encoding, bytes on the wire, fetch seconds, decode seconds) of a page"""
+    wire, fetch, decode = 0, 0.0, 0.0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        response = apim.session.get(url)
+        fetch += time.perf_counter() - start
+
+        start = time.perf_counter()
+        apim._decode(response)
+        decode += time.perf_counter() - start
+
+        wire += response.raw.tell()
+
+    encoding = response.headers.get("Content-Encoding", "identity")
+    return encoding, wire // REPEAT, fetch / REPEAT, decode / REPEAT
+
+
+def cpu_seconds_per_page(func, *args) -> float:
+    start = time.process_time()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.process_time() - start) / REPEAT
+
+
+if __name__ == "__main__":
+    payload = sap_like_page()
+    schema = {
+        "notNotification": "string",
+        "notType": "category",
+        "notPlanningPlant": "category",
+        "notDescription": "string",
+        "notPriority": "int8",
+        "notChangeDate": "string",
+    }
+
+    print(f"Page: {PAGE_SIZE} rows, {len(payload) / 1e6:.1f} MB, avg of {REPEAT} runs")
+    baseline = cpu_seconds_per_page(decode_round_trip, payload)
+    direct = cpu_seconds_per_page(decode_direct, payload)
+    direct_schema = cpu_seconds_per_page(decode_direct, payload, schema)
+    for name, seconds in [
+        ("json -> dumps -> read_json", baseline),
+        ("json -> DataFrame", direct),
+        ("json -> DataFrame + schema", direct_schema),
+    ]:
+        speedup = baseline / seconds
+        print(f"{name:<30}: {seconds * 1000:>8.1f} ms CPU/page ({speedup:.1f}x)")
+
+    server = serve_page(payload)
+    url = f"http://127.0.0.1:{server.server_port}/odata/Notifications"
+    print("\nTransport per page")
+    for name, apim in [
+        ("default", Extractor("bench")),
+        ("fast_transport", Extractor("bench", fast_transport=True)),
+    ]:
+        encoding, wire, fetch, decode = transport_per_page(apim, url)
+        print(
+            f"{name:<15}: {encoding:<9} {wire / 1e6:>6.2f} MB on the wire, "
+            f"fetch {fetch * 1000:>6.1f} ms, decode {decode * 1000:>6.1f} ms"
+        )
+    server.shutdown()
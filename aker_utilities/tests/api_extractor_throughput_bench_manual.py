@@ -0,0 +1,91 @@
+# Run with: python -m aker_utilities.tests.api_extractor_throughput_bench_manual
+# Options:  --rows 10000 1000000 5000000 --latency 0.05 --page-size 50000
+import argparse
+import importlib.util
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from aker_utilities.api_extractor import Extractor
+from aker_utilities.tests.odata_stand_in import ODataCollection, ODataStandIn
+
+ENDPOINTS: int = 4
+
+# (name, Extractor arguments)
+CASES: list[tuple[str, dict[str, Any]]] = [
+    ("sequential", dict()),
+    ("max_workers=4", dict(max_workers=4)),
+    ("max_workers=4, fast", dict(max_workers=4, fast_transport=True)),
+]
+
+
+def peak_memory_mb() -> float:
+    """
+    Peak RSS of the process, or the peak of Python allocations traced by tracemalloc
+    where the Unix only resource module is missing (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return tracemalloc.get_traced_memory()[1] / 1024**2
+
+    # ru_maxrss is in bytes on macOS and in kB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(
+    url: str, rows: int, method: str, page_size: int, kwargs: dict[str, Any]
+) -> tuple[float, int, float]:
+    """Return (seconds, rows fetched, peak memory in MB) of a case in a child process"""
+    if importlib.util.find_spec("resource") is None:
+        tracemalloc.start()
+    apim = Extractor("bench", is_odata=True, page_size=page_size, **kwargs)
+
+    start = time.perf_counter()
+    if method == "get_records":
+        df = apim.get_records((f"{url}/Notifications", "notifications", "{id}"))
+        fetched = len(df)
+    else:
+        endpoints = [(f"{url}/Part{i}", f"part-{i}", "{id}") for i in range(ENDPOINTS)]
+        data = apim.get_records_from_multiple_endpoints(endpoints)
+        fetched = sum(len(i) for i in data.values())
+    seconds = time.perf_counter() - start
+
+    return seconds, fetched, peak_memory_mb()
+
+
+def bench(rows: int, latency: float, page_size: int) -> None:
+    collections = {"Notifications": ODataCollection(size=rows)}
+    for i in range(ENDPOINTS):
+        collections[f"Part{i}"] = ODataCollection(size=rows // ENDPOINTS)
+
+    print(f"\n{'# '+ f'{rows:,} rows, {latency * 1000:.0f} ms latency' +' ':-<90}")
+    with ODataStandIn(collections, latency=latency) as server:
+        # A fresh process per case, so peak memory is not carried over between cases
+        context = multiprocessing.get_context("spawn")
+        for method in ["get_records", "get_records_from_multiple_endpoints"]:
+            for name, kwargs in CASES:
+                with context.Pool(1) as pool:
+                    (seconds, fetched, peak) = pool.apply(
+                        run_case, (server.url, rows, method, page_size, kwargs)
+                    )
+                print(
+                    f"{method:<36} {name:<20}: {fetched:>9} rows {seconds:>7.1f} s "
+                    f"{fetched / seconds:>9,.0f} rows/s, peak {peak:>7.0f} MB"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extractor throughput benchmark")
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 1_000_000, 5_000_000]
+    )
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--page-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        bench(rows, args.latency, args.page_size)
@@ -0,0 +1,59 @@
+# Run with: python -m aker_utilities.tests.cdf_utils_bench_manual
+# Options:  --rows 100000 1000000
+import argparse
+import time
+import uuid
+from typing import Callable
+
+import pandas as pd
+
+from aker_utilities.pandas_utils import hash_columns, join_columns, uuid4_strings
+from aker_utilities.tests.odata_stand_in import synthetic_row
+
+KEY_COLUMNS: list[str] = ["notNotification", "notType", "notPlanningPlant"]
+REPEAT: int = 3
+
+
+def apply_join(df: pd.DataFrame) -> pd.Series:
+    """Composite key as built by PipelineToCDF.set_table_key before"""
+    return df[KEY_COLUMNS].apply(lambda row: "-".join(row.values.astype(str)), axis=1)
+
+
+def list_uuid4(df: pd.DataFrame) -> list[str]:
+    """Generated key as built by PipelineToCDF.set_table_key before"""
+    return [str(uuid.uuid4()) for _ in range(len(df.index))]
+
+
+# (name, key builder)
+CASES: list[tuple[str, Callable[[pd.DataFrame], object]]] = [
+    ("apply join (before)", apply_join),
+    ("join_columns", lambda df: join_columns(df, KEY_COLUMNS)),
+    ("hash_columns", lambda df: hash_columns(df, KEY_COLUMNS)),
+    ("uuid4 list (before)", list_uuid4),
+    ("uuid4_strings", lambda df: uuid4_strings(len(df.index))),
+]
+
+
+def bench(rows: int) -> None:
+    df = pd.DataFrame.from_records([synthetic_row(i) for i in range(rows)])
+    df[KEY_COLUMNS] = df[KEY_COLUMNS].astype(str)
+
+    print(f"\n{'# '+ f'{rows:,} rows, best of {REPEAT}' +' ':-<90}")
+    for name, build in CASES:
+        timings = list()
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            build(df)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print(f"{name:<24}: {best:>8.3f} s {rows / best:>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PipelineToCDF key builder benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        bench(rows)
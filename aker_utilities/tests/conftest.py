@@ -0,0 +1,30 @@
+import pytest
+
+from aker_utilities.tests.odata_stand_in import ODataCollection, ODataStandIn
+
+ROWS = [{"id": i, "name": f"row-{i}"} for i in range(1_050)]
+SERVER_PAGE_SIZE = 300
+MAX_TOP = 200
+
+
+@pytest.fixture(scope="session")
+def server_url():
+    collections = {
+        "Rows": ODataCollection(ROWS),
+        # Server-driven paging, the next link points to the backend behind gateway
+        "Paged": ODataCollection(
+            ROWS, server_page_size=SERVER_PAGE_SIZE, next_host="http://sap-backend:8000"
+        ),
+        "Capped": ODataCollection(ROWS, max_top=MAX_TOP),
+        "NoSelect": ODataCollection(ROWS, unsupported_options={"$select"}),
+        "NoQuery": ODataCollection(ROWS, unsupported_options={"$select", "$filter"}),
+        "NoCount": ODataCollection(ROWS, unsupported_options={"$count"}),
+    }
+
+    with ODataStandIn(collections, default=ODataCollection(ROWS)) as server:
+        yield server.url
+
+
+@pytest.fixture
+def endpoint(server_url):
+    return (f"{server_url}/Rows", "rows", "{id}")
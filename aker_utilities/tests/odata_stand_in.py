@@ -0,0 +1,326 @@
+import hashlib
+import json
+import operator
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlparse
+
+OPERATORS = {
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+    "eq": operator.eq,
+    "ne": operator.ne,
+}
+FILTER_PATTERN = re.compile(
+    r"(\w+) (gt|ge|lt|le|eq|ne) (datetime'[^']*'|'(?:[^']|'')*'|-?\d+(?:\.\d+)?)"
+)
+ODATA_DATE_PATTERN = re.compile(r"^/Date\((-?\d+)\)/$")
+EPOCH = datetime(1970, 1, 1)
+EDMX = """<?xml version="1.0" encoding="utf-8"?>
+<edmx:Edmx Version="1.0" xmlns:edmx="http://schemas.microsoft.com/ado/2007/06/edmx">
+<edmx:DataServices>
+<Schema Namespace="STAND_IN_SRV" xmlns="http://schemas.microsoft.com/ado/2008/09/edm">
+{types}
+<EntityContainer Name="STAND_IN_SRV_Entities" IsDefaultEntityContainer="true">
+{sets}
+</EntityContainer>
+</Schema>
+</edmx:DataServices>
+</edmx:Edmx>"""
+
+
+def synthetic_row(i: int) -> dict[str, Any]:
+    """SAP flavoured notification row, the same index always gives the same row"""
+    return {
+        "id": i,
+        "notNotification": f"{10_000_000 + i}",
+        "notType": ("M1", "M2", "M3")[i % 3],
+        "notPlanningPlant": ("1000", "1100")[i % 2],
+        "notDescription": f"Notification text number {i}",
+        "notPriority": i % 4,
+        "notChangeDate": f"/Date({1_700_000_000_000 + i * 1000})/",
+    }
+
+
+def _edm_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "Edm.Boolean"
+    if isinstance(value, int):
+        return "Edm.Int64"
+    if isinstance(value, float):
+        return "Edm.Double"
+    if isinstance(value, str) and ODATA_DATE_PATTERN.match(value):
+        return "Edm.DateTime"
+    return "Edm.String"
+
+
+def metadata_document(collections: dict[str, "ODataCollection"]) -> bytes:
+    """EDMX `$metadata` document, property types are taken from the first row"""
+    types, sets = list(), list()
+    for name, collection in collections.items():
+        properties = "".join(
+            f'<Property Name="{k}" Type="{_edm_type(v)}"/>'
+            for k, v in (collection.row(0) if collection.size else {}).items()
+        )
+        types.append(f'<EntityType Name="{name}Type">{properties}</EntityType>')
+        sets.append(f'<EntitySet Name="{name}" EntityType="STAND_IN_SRV.{name}Type"/>')
+
+    return EDMX.format(types="\n".join(types), sets="\n".join(sets)).encode()
+
+
+def _literal(value: str) -> Any:
+    """Python value of an OData literal: number, 'string' or datetime'...'"""
+    if value.startswith("datetime'"):
+        return datetime.fromisoformat(value[9:-1])
+    if value.startswith("'"):
+        return value[1:-1].replace("''", "'")
+    return float(value) if "." in value else int(value)
+
+
+def _comparable(value: Any) -> Any:
+    if isinstance(value, str) and (match := ODATA_DATE_PATTERN.match(value)):
+        return EPOCH + timedelta(milliseconds=int(match.group(1)))
+    return value
+
+
+def parse_filter(odata_filter: str | None) -> Callable[[dict], bool]:
+    """
+    Return a predicate for `$filter` made of `field op literal` comparisons joined with
+    `and`, enough to stand in for watermark and key range filters.
+    """
+    if not odata_filter:
+        return lambda row: True
+
+    conditions = [
+        (field, OPERATORS[op], _literal(value))
+        for field, op, value in FILTER_PATTERN.findall(odata_filter)
+    ]
+
+    def predicate(row: dict) -> bool:
+        return all(op(_comparable(row[field]), value) for field, op, value in conditions)
+
+    return predicate
+
+
+class ODataCollection:
+    def __init__(
+        self,
+        rows: list[dict] | None = None,
+        size: int = 0,
+        make_row: Callable[[int], dict] = synthetic_row,
+        server_page_size: int | None = None,
+        next_host: str | None = None,
+        max_top: int | None = None,
+        unsupported_options: set[str] | None = None,
+        failures: dict[int, int] | None = None,
+    ):
+        """
+        Collection served by `ODataStandIn`, either the given rows or `size` synthetic
+        rows made on request, so millions of rows do not have to be held in memory.
+
+        Args:
+            rows (list[dict] | None, optional): Explicit rows. Defaults to None.
+            size (int, optional): Number of synthetic rows if no rows are given.
+            make_row (Callable[[int], dict], optional): Row of an index.
+                Defaults to `synthetic_row`.
+            server_page_size (int | None, optional): Serve server-driven pages of this
+                size with a `d/__next` link instead of `$skip/$top`. Defaults to None.
+            next_host (str | None, optional): Host put in next links, e.g. the backend
+                behind a gateway. Defaults to the host of the request.
+            max_top (int | None, optional): Reject larger `$top` with 413.
+                Defaults to None.
+            unsupported_options (set[str] | None, optional): Query options rejected
+                with 400, e.g. {"$select"}, "$count" also rejects the `/$count` path.
+                Defaults to None.
+            failures (dict[int, int] | None, optional): Number of 503 responses per page
+                offset before it is served, e.g. {600: 2}. Defaults to None.
+        """
+        self.rows = rows
+        self.size = len(rows) if rows is not None else size
+        self.make_row = make_row
+        self.server_page_size = server_page_size
+        self.next_host = next_host
+        self.max_top = max_top
+        self.unsupported_options = unsupported_options or set()
+        self.failures = failures if failures is not None else dict()
+        # Index of matching rows per filter, full scans are done once per filter
+        self._matching = lru_cache(maxsize=16)(self._scan)
+
+    def row(self, i: int) -> dict:
+        return self.rows[i] if self.rows is not None else self.make_row(i)
+
+    def _scan(self, odata_filter: str) -> list[int]:
+        predicate = parse_filter(odata_filter)
+        return [i for i in range(self.size) if predicate(self.row(i))]
+
+    def count(self, odata_filter: str | None = None) -> int:
+        if not odata_filter:
+            return self.size
+        return len(self._matching(odata_filter))
+
+    def page(self, skip: int, top: int, odata_filter: str | None = None) -> list[dict]:
+        if not odata_filter:
+            return [self.row(i) for i in range(skip, min(skip + top, self.size))]
+        return [self.row(i) for i in self._matching(odata_filter)[skip : skip + top]]
+
+
+class ODataStandIn:
+    def __init__(
+        self,
+        collections: dict[str, ODataCollection] | None = None,
+        default: ODataCollection | None = None,
+        latency: float = 0.0,
+        latency_per_row: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Local HTTP stand-in of an APIM/SAP OData v2 service, serving collections under
+        `{url}/{name}` with `$skip/$top`, `$filter`, `$select`, `/$count`, next links and
+        `d/results` nesting, and their `{url}/$metadata` document. Pages carry an ETag
+        and are answered with 304 Not Modified on a matching If-None-Match.
+
+        Args:
+            collections (dict[str, ODataCollection] | None, optional): Collection per
+                name. Defaults to None.
+            default (ODataCollection | None, optional): Served for unknown names,
+                404 if None. Defaults to None.
+            latency (float, optional): Seconds added to every response. Defaults to 0.
+            latency_per_row (float, optional): Seconds added per row of a page.
+                Defaults to 0.
+            host (str, optional): Defaults to "127.0.0.1".
+            port (int, optional): Defaults to 0, which picks a free port.
+
+        Example:
+            >>> with ODataStandIn({"Rows": ODataCollection(size=1_000_000)}) as server:
+            >>>     Extractor("key").get_records((f"{server.url}/Rows", "rows", "{id}"))
+        """
+        self.collections = collections if collections is not None else dict()
+        self.default = default
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self.requests: int = 0
+        self.metadata_requests: int = 0
+        self.not_modified: int = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+
+    @property
+    def url(self) -> str:
+        (host, port) = self.server.server_address[:2]
+        return f"http://{host}:{port}/odata"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class ODataHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                stand_in.requests += 1
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+                (name, _, rest) = parsed.path.removeprefix("/odata/").partition("/")
+                if name == "$metadata":
+                    stand_in.metadata_requests += 1
+                    body = metadata_document(stand_in.collections)
+                    return self._send(200, body, "application/xml")
+
+                collection = stand_in.collections.get(name, stand_in.default)
+                if collection is None:
+                    return self._send(404, b"")
+
+                if collection.unsupported_options & set(query):
+                    return self._send(400, b"")
+
+                odata_filter = query.get("$filter")
+                if rest == "$count":
+                    if "$count" in collection.unsupported_options:
+                        return self._send(400, b"")
+                    return self._send(200, str(collection.count(odata_filter)).encode())
+
+                if collection.server_page_size is not None:
+                    skip = int(query.get("$skiptoken", 0))
+                    top = collection.server_page_size
+                else:
+                    skip = int(query.get("$skip", 0))
+                    top = int(query.get("$top", collection.size))
+                    if collection.max_top is not None and top > collection.max_top:
+                        # Gateway rejects pages larger than it can buffer
+                        return self._send(413, b"")
+
+                if collection.failures.get(skip, 0) > 0:
+                    collection.failures[skip] -= 1
+                    return self._send(503, b"")
+
+                rows = collection.page(skip, top, odata_filter)
+                if "$select" in query:
+                    # SAP keeps __metadata in a projection
+                    fields = query["$select"].split(",")
+                    rows = [
+                        {"__metadata": {"type": f"STAND_IN_SRV.{name}Type"}}
+                        | {k: i[k] for k in fields if k in i}
+                        for i in rows
+                    ]
+                results: dict[str, Any] = {"results": rows}
+                if query.get("$inlinecount") == "allpages":
+                    results["__count"] = str(collection.count(odata_filter))
+                if collection.server_page_size is not None:
+                    if skip + top < collection.count(odata_filter):
+                        host = collection.next_host or f"http://{self.headers['Host']}"
+                        link = parsed._replace(query=f"$skiptoken={skip + top}")
+                        results["__next"] = f"{host}{link.path}?{link.query}"
+
+                time.sleep(stand_in.latency + stand_in.latency_per_row * len(rows))
+                body = json.dumps({"d": results}).encode()
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    stand_in.not_modified += 1
+                    return self._send(304, b"", etag=etag)
+
+                self._send(200, body, etag=etag)
+
+            def _send(
+                self,
+                status: int,
+                body: bytes,
+                content_type: str = "application/json",
+                etag: str | None = None,
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return ODataHandler
+
+    def start(self) -> "ODataStandIn":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "ODataStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __str__(self) -> str:
+        return f"OData stand-in: {self.url}"
+
+    def __repr__(self) -> str:
+        return f"OData stand-in: {self.url}"
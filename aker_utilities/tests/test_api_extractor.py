@@ -0,0 +1,366 @@
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+from aker_utilities.api_extractor import (
+    AdaptivePageSize,
+    Extractor,
+    _later_watermark,
+    _match_filters,
+    _merge_odata_filter,
+    _parse_watermark,
+    compile_odata_filter,
+)
+from aker_utilities.events import EventCollector
+from aker_utilities.tests.conftest import MAX_TOP, ROWS
+from aker_utilities.tests.odata_stand_in import (
+    ODataCollection,
+    ODataStandIn,
+    synthetic_row,
+)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_records_all_pages(endpoint, max_workers) -> None:
+    apim = Extractor("key", page_size=100, max_workers=max_workers)
+    df = apim.get_records(endpoint)
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS]
+
+
+@pytest.mark.parametrize("limit", [250, 300])
+def test_get_records_concurrently_with_limit(endpoint, limit) -> None:
+    apim = Extractor("key", page_size=100, max_workers=4)
+    df = apim.get_records(endpoint, limit=limit)
+
+    assert df["id"].tolist() == list(range(limit))
+
+
+@pytest.mark.parametrize("table", ["Rows", "NoCount"])
+def test_get_record_count(server_url, table) -> None:
+    endpoint = (f"{server_url}/{table}", table, "{id}")
+    assert Extractor("key").get_record_count(endpoint) == len(ROWS)
+
+
+def test_get_records_concurrently_without_count(endpoint, monkeypatch) -> None:
+    apim = Extractor("key", page_size=100, max_workers=4)
+    monkeypatch.setattr(apim, "get_record_count", lambda *args, **kwargs: None)
+
+    assert apim.get_records(endpoint)["id"].tolist() == [i["id"] for i in ROWS]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iter_records_yields_pages(endpoint, max_workers) -> None:
+    apim = Extractor("key", page_size=400, max_workers=max_workers)
+    pages = list(apim.iter_records(endpoint, as_records=True))
+
+    assert [len(page) for page in pages] == [400, 400, 250]
+    assert pages[-1][-1] == ROWS[-1]
+
+
+def test_get_records_with_schema(endpoint) -> None:
+    apim = Extractor("key", page_size=500, schemas={"rows": {"name": "string"}})
+    df = apim.get_records(endpoint, limit=10)
+
+    assert df.columns.tolist() == ["name"]
+    assert str(df["name"].dtype) == "string"
+
+
+def test_get_records_incremental(endpoint, tmp_path) -> None:
+    state_path = tmp_path / "state-store.json"
+    state = {"rows": {"field": "id", "type": "number", "high": 999}}
+    state_path.write_text(json.dumps(state))
+
+    apim = Extractor(
+        "key",
+        is_odata=True,
+        page_size=100,
+        state_store=state_path,
+        watermark_fields={"rows": "id"},
+    )
+    df = apim.get_records(endpoint, incremental=True)
+
+    assert df["id"].tolist() == list(range(1_000, 1_050))
+    assert json.loads(state_path.read_text())["rows"]["high"] == 1_049
+    assert apim.get_records(endpoint, incremental=True).empty
+
+
+def test_get_records_incremental_string_watermark(endpoint, tmp_path) -> None:
+    # Written by hand or by another tool, the number is stored as a string
+    state_path = tmp_path / "state-store.json"
+    state = {"rows": {"field": "id", "type": "number", "high": "999"}}
+    state_path.write_text(json.dumps(state))
+
+    apim = Extractor(
+        "key",
+        is_odata=True,
+        page_size=100,
+        state_store=state_path,
+        watermark_fields={"rows": "id"},
+    )
+    df = apim.get_records(endpoint, incremental=True)
+
+    assert df["id"].tolist() == list(range(1_000, 1_050))
+    assert json.loads(state_path.read_text())["rows"]["high"] == 1_049
+    assert [i.name for i in tmp_path.iterdir()] == ["state-store.json"]
+
+
+@pytest.mark.parametrize(
+    "value, high, expected",
+    [
+        (("number", 1_000), ("string", "999"), True),
+        (("datetime", datetime(2024, 11, 21)), ("string", "2024-11-20T00:00:00"), True),
+        (("string", "2024-11-19"), ("datetime", datetime(2024, 11, 20)), False),
+        (("string", "A12"), ("number", 5), True),
+    ],
+)
+def test_later_watermark(value, high, expected) -> None:
+    assert _later_watermark(value, high) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("/Date(1700000000000)/", ("datetime", datetime(2023, 11, 14, 22, 13, 20))),
+        ("2024-11-20T08:00:00", ("datetime", datetime(2024, 11, 20, 8))),
+        ("10000001", ("string", "10000001")),
+        (42, ("number", 42)),
+        (None, None),
+    ],
+)
+def test_parse_watermark(value, expected) -> None:
+    assert _parse_watermark(value) == expected
+
+
+def test_merge_odata_filter() -> None:
+    assert (
+        _merge_odata_filter("$select=id&$filter=id lt 5", "id gt 1")
+        == "$select=id&$filter=(id lt 5) and (id gt 1)"
+    )
+    assert _merge_odata_filter("$select=id", "id gt 1") == "$select=id&$filter=id gt 1"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+@pytest.mark.parametrize("limit", [None, 500])
+def test_get_records_follows_next_links(server_url, max_workers, limit) -> None:
+    apim = Extractor("key", page_size=1_000, max_workers=max_workers)
+    df = apim.get_records((f"{server_url}/Paged", "paged", "{id}"), limit=limit)
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS][:limit]
+
+
+def test_adaptive_page_size() -> None:
+    sizer = AdaptivePageSize(size=1_000, min_size=500, max_size=3_000)
+
+    sizer.update(rows=1_000, top=1_000, seconds=1.0, nbytes=100_000)
+    assert sizer.size == 2_000
+    sizer.update(rows=2_000, top=2_000, seconds=1.0, nbytes=200_000)
+    assert sizer.size == 3_000
+    sizer.update(rows=10, top=3_000, seconds=1.0, nbytes=1_000)
+    assert sizer.size == 3_000
+    sizer.update(rows=3_000, top=3_000, seconds=60.0, nbytes=300_000)
+    assert sizer.size == 1_500
+    assert sizer.shrink() and sizer.size == 750
+    assert sizer.shrink() and sizer.size == 500
+    assert not sizer.shrink()
+
+
+def test_adaptive_page_size_shrinks_once_per_rejected_size() -> None:
+    sizer = AdaptivePageSize(size=1_600, min_size=100, max_size=3_200)
+    barrier = threading.Barrier(8)
+
+    def rejected() -> None:
+        barrier.wait()
+        sizer.shrink(1_600)
+
+    threads = [threading.Thread(target=rejected) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (sizer.size, sizer.max_size) == (800, 800)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_records_shrinks_rejected_pages(server_url, tmp_path, max_workers) -> None:
+    state_path = tmp_path / "state-store.json"
+    apim = Extractor(
+        "key",
+        page_size=800,
+        max_workers=max_workers,
+        state_store=state_path,
+        adaptive_page_size=True,
+        page_size_bounds={"capped": (100, 1_000)},
+    )
+    df = apim.get_records((f"{server_url}/Capped", "capped", "{id}"))
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS]
+    assert json.loads(state_path.read_text())["capped"]["page_size"] <= MAX_TOP
+
+
+def test_get_records_uses_persisted_page_size(endpoint, tmp_path) -> None:
+    state_path = tmp_path / "state-store.json"
+    state_path.write_text(json.dumps({"rows": {"page_size": 250}}))
+
+    apim = Extractor(
+        "key",
+        state_store=state_path,
+        adaptive_page_size=True,
+        page_size_bounds={"rows": (100, 1_000)},
+    )
+    pages = list(apim.iter_records(endpoint, as_records=True))
+
+    assert len(pages[0]) == 250
+    assert sum(len(page) for page in pages) == len(ROWS)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_records_emits_events(endpoint, max_workers) -> None:
+    collector = EventCollector()
+    apim = Extractor("key", page_size=400, max_workers=max_workers, hooks=[collector])
+    apim.get_records(endpoint)
+
+    pages = collector.of_type("page")
+    (summary,) = collector.of_type("endpoint")
+    assert [(i["skip"], i["rows"], i["status"]) for i in pages] == [
+        (0, 400, 200),
+        (400, 400, 200),
+        (800, 250, 200),
+    ]
+    assert summary["pages"] == 3 and summary["rows"] == len(ROWS)
+    assert summary["bytes"] == sum(i["bytes"] for i in pages) > 0
+    assert summary["slowest_page_url"] in [i["url"] for i in pages]
+
+
+def test_get_records_from_multiple_endpoints_compact(endpoint) -> None:
+    collector = EventCollector()
+    apim = Extractor("key", page_size=500, hooks=[collector])
+    data = apim.get_records_from_multiple_endpoints([endpoint], compact=True)
+
+    assert str(data["rows"]["id"].dtype) == "int64"
+    assert str(data["rows"]["name"].dtype) == "string"
+    (event,) = collector.of_type("compact")
+    assert event["memory_after_mb"] < event["memory_before_mb"]
+
+
+def test_get_columns_from_metadata(tmp_path) -> None:
+    services = [
+        ODataStandIn({"Rows": ODataCollection(ROWS)}).start(),
+        ODataStandIn({"Notifications": ODataCollection(size=10)}).start(),
+    ]
+    endpoints = [
+        (f"{services[0].url}/Rows", "rows", "{id}"),
+        (f"{services[1].url}/Notifications", "notifications", "{id}"),
+    ]
+
+    apim = Extractor("key", metadata_cache=tmp_path)
+    column_types = apim.get_column_types_from_multiple_endpoints(endpoints)
+    cached = Extractor("key", metadata_cache=tmp_path)
+    columns = cached.get_columns_from_multiple_endpoints(endpoints, from_metadata=True)
+    expired = Extractor("key", metadata_cache=tmp_path, metadata_ttl=timedelta(0))
+    expired.get_columns(endpoints[0], from_metadata=True)
+
+    for service in services:
+        service.stop()
+
+    assert column_types["rows"] == {"id": "Edm.Int64", "name": "Edm.String"}
+    assert column_types["notifications"]["notChangeDate"] == "Edm.DateTime"
+    assert columns["rows"] == ["id", "name"]
+    assert [i.metadata_requests for i in services] == [2, 1]
+    assert services[0].requests == 2
+
+
+def test_compile_odata_filter() -> None:
+    filters = [
+        ("notType", "in", ["M1", "O'Neil"]),
+        ("notPriority", "le", 2),
+        ("notChangeDate", "ge", datetime(2023, 11, 14, 22, 13, 30)),
+    ]
+
+    assert compile_odata_filter(filters) == (
+        "(notType eq 'M1' or notType eq 'O''Neil') and notPriority le 2 "
+        "and notChangeDate ge datetime'2023-11-14T22:13:30'"
+    )
+    matches = [i for i in range(20) if _match_filters(synthetic_row(i), filters)]
+    assert matches == [12, 18]
+
+
+def test_match_filters_numeric_strings() -> None:
+    rows = [synthetic_row(i) for i in range(20)]
+    filters = [("notNotification", "ge", 10_000_015), ("notPlanningPlant", "in", [1000])]
+    assert [i["id"] for i in rows if _match_filters(i, filters)] == [16, 18]
+
+    with pytest.raises(ValueError, match="notDescription"):
+        _match_filters(rows[0], [("notDescription", "gt", 5)])
+
+
+def test_unsupported_filter_operator(endpoint) -> None:
+    filters = [("name", "like", "row%")]
+    with pytest.raises(ValueError, match="like, use one of eq, ne, gt, ge, lt, le, in"):
+        compile_odata_filter(filters)
+
+    # Not OData, so the filters are only applied client side
+    with pytest.raises(ValueError, match="Unsupported filter operator: like"):
+        Extractor("key", page_size=100).get_records(endpoint, filters=filters)
+
+
+@pytest.mark.parametrize("table", ["Rows", "NoSelect", "NoQuery"])
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_records_pushdown(server_url, table, max_workers) -> None:
+    apim = Extractor("key", is_odata=True, page_size=100, max_workers=max_workers)
+    endpoint = (f"{server_url}/{table}", table, "{id}")
+    filters = [("id", "ge", 990), ("name", "ne", "row-1000")]
+
+    for _ in range(2):
+        df = apim.get_records(endpoint, columns=["id"], filters=filters)
+
+        assert df.columns.tolist() == ["id"]
+        assert df["id"].tolist() == [i for i in range(990, 1_050) if i != 1_000]
+
+    expected = {"Rows": set(), "NoSelect": {"$select"}, "NoQuery": {"$select", "$filter"}}
+    assert apim._unsupported_options[table] == expected[table]
+
+
+def test_get_records_retries_transient_errors() -> None:
+    collection = ODataCollection(ROWS, failures={0: 1, 600: 2})
+    collector = EventCollector()
+
+    with ODataStandIn({"Rows": collection}) as server:
+        apim = Extractor("key", page_size=300, backoff_base=0.0, hooks=[collector])
+        df = apim.get_records((f"{server.url}/Rows", "rows", "{id}"))
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS]
+    assert [i["attempt"] for i in collector.of_type("retry")] == [1, 1, 2]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+@pytest.mark.parametrize("table", ["Rows", "Paged"])
+def test_get_records_resumes_from_spool(tmp_path, max_workers, table) -> None:
+    collections = {
+        "Rows": ODataCollection(ROWS, failures={600: 1}),
+        "Paged": ODataCollection(ROWS, server_page_size=300, failures={600: 1}),
+    }
+
+    with ODataStandIn(collections) as server:
+        endpoint = (f"{server.url}/{table}", table.lower(), "{id}")
+        apim = Extractor(
+            "key",
+            page_size=300,
+            max_workers=max_workers,
+            max_retries=0,
+            spool_dir=tmp_path,
+        )
+        with pytest.raises(requests.HTTPError):
+            apim.get_records(endpoint)
+
+        assert len(list(tmp_path.glob("*/page-*.json"))) == 2
+        requests_before = server.requests
+        df = apim.get_records(endpoint)
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS]
+    assert server.requests - requests_before <= 3
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,152 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from aker_utilities.api_extractor import Extractor
+from aker_utilities.async_api_extractor import AsyncExtractor, _gather_or_cancel
+from aker_utilities.events import EventCollector
+from aker_utilities.tests.conftest import ROWS
+from aker_utilities.tests.odata_stand_in import ODataCollection, ODataStandIn
+
+
+@pytest.mark.parametrize("limit", [None, 250, 300])
+def test_get_records(endpoint, limit) -> None:
+    apim = AsyncExtractor("key", page_size=100)
+    df = asyncio.run(apim.get_records(endpoint, limit=limit))
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS][:limit]
+
+
+def test_get_records_without_count(endpoint, monkeypatch) -> None:
+    apim = AsyncExtractor("key", page_size=100)
+
+    async def no_count(*args, **kwargs) -> None:
+        return None
+
+    monkeypatch.setattr(apim, "_get_record_count_async", no_count)
+
+    df = asyncio.run(apim.get_records(endpoint))
+    assert df["id"].tolist() == [i["id"] for i in ROWS]
+
+
+def test_get_records_from_multiple_endpoints(server_url) -> None:
+    endpoints = [(f"{server_url}/{i}", i, "{id}") for i in ["b", "a", "c"]]
+
+    async def main() -> dict:
+        async with AsyncExtractor("key", page_size=100, limit_per_host=2) as apim:
+            return await apim.get_records_from_multiple_endpoints(endpoints)
+
+    result = asyncio.run(main())
+    expected = Extractor("key").get_records_from_multiple_endpoints(endpoints)
+
+    assert list(result) == ["a", "b", "c"]
+    for table, df in expected.items():
+        assert result[table].equals(df)
+
+
+@pytest.mark.parametrize("limit", [None, 500])
+def test_get_records_follows_next_links(server_url, limit) -> None:
+    apim = AsyncExtractor("key", page_size=1_000)
+    endpoint = (f"{server_url}/Paged", "paged", "{id}")
+    df = asyncio.run(apim.get_records(endpoint, limit=limit))
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS][:limit]
+
+
+def test_get_records_emits_events(endpoint) -> None:
+    collector = EventCollector()
+    apim = AsyncExtractor("key", page_size=400, hooks=[collector])
+    asyncio.run(apim.get_records(endpoint))
+
+    assert [i["skip"] for i in collector.of_type("page")] == [0, 400, 800]
+    assert collector.of_type("endpoint")[0]["rows"] == len(ROWS)
+
+
+def test_get_records_retries_transient_errors() -> None:
+    collection = ODataCollection(ROWS, failures={0: 1, 600: 2})
+    collector = EventCollector()
+
+    with ODataStandIn({"Rows": collection}) as server:
+        apim = AsyncExtractor("key", page_size=300, backoff_base=0.0, hooks=[collector])
+        df = asyncio.run(apim.get_records((f"{server.url}/Rows", "rows", "{id}")))
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS]
+    assert sorted(i["attempt"] for i in collector.of_type("retry")) == [1, 1, 2]
+    assert {i["reason"] for i in collector.of_type("retry")} == {503}
+
+
+def test_get_records_raises_when_retries_run_out() -> None:
+    collection = ODataCollection(ROWS, failures={300: 2})
+
+    with ODataStandIn({"Rows": collection}) as server:
+        apim = AsyncExtractor("key", page_size=300, max_retries=1, backoff_base=0.0)
+        with pytest.raises(aiohttp.ClientResponseError) as e:
+            asyncio.run(apim.get_records((f"{server.url}/Rows", "rows", "{id}")))
+
+    assert e.value.status == 503
+
+
+def test_get_records_raises_client_errors(server_url) -> None:
+    apim = AsyncExtractor("key", page_size=300, backoff_base=0.0)
+    with pytest.raises(aiohttp.ClientResponseError) as e:
+        asyncio.run(apim.get_records((f"{server_url}/Capped", "capped", "{id}")))
+
+    assert e.value.status == 413
+
+
+def test_get_records_shrinks_rejected_pages(server_url) -> None:
+    apim = AsyncExtractor(
+        "key",
+        page_size=800,
+        adaptive_page_size=True,
+        page_size_bounds={"capped": (100, 1_000)},
+    )
+    df = asyncio.run(apim.get_records((f"{server_url}/Capped", "capped", "{id}")))
+
+    assert df["id"].tolist() == [i["id"] for i in ROWS]
+
+
+@pytest.mark.parametrize("table", ["Rows", "NoCount"])
+def test_get_record_count(server_url, table) -> None:
+    endpoint = (f"{server_url}/{table}", table, "{id}")
+
+    async def main() -> int | None:
+        async with AsyncExtractor("key") as apim:
+            return await apim._get_record_count_async(apim.client, endpoint)
+
+    assert asyncio.run(main()) == len(ROWS)
+
+
+def test_get_records_timeout() -> None:
+    async def main(apim: AsyncExtractor, endpoint: tuple[str, str, str]):
+        async with apim:
+            assert apim.client.timeout.total == apim.timeout
+            return await apim.get_records(endpoint)
+
+    with ODataStandIn({"Rows": ODataCollection(ROWS)}, latency=0.2) as server:
+        endpoint = (f"{server.url}/Rows", "rows", "{id}")
+        df = asyncio.run(main(AsyncExtractor("key", page_size=500), endpoint))
+        assert len(df) == len(ROWS)
+
+        apim = AsyncExtractor("key", page_size=500, max_retries=0, timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(main(apim, endpoint))
+
+
+def test_gather_or_cancel() -> None:
+    cancelled: list[bool] = list()
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fail() -> None:
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError, match="failed"):
+        asyncio.run(_gather_or_cancel(slow(), fail()))
+    assert cancelled == [True]
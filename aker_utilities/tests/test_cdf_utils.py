@@ -1,4 +1,40 @@
-from aker_utilities.cdf_utils import create_cognite_db_extractor_config
+import json
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from cognite.client._api.raw import RawRowsAPI
+from cognite.client.data_classes import Row, RowList
+from cognite.client.exceptions import CogniteAPIError
+from cognite.client.testing import CogniteClientMock
+from cognite.client.utils import _json
+
+from aker_utilities.cdf_utils import (
+    CDF,
+    ChunkJournal,
+    PipelineToCDF,
+    SeenKeys,
+    create_cognite_db_extractor_config,
+)
+from aker_utilities.events import EventCollector
+
+
+class Pipeline(PipelineToCDF):
+    def transform(self) -> None:
+        pass
+
+    def validate(self) -> None:
+        super().validate()
+
+
+@pytest.fixture
+def cdf(monkeypatch) -> CDF:
+    monkeypatch.setattr(
+        CDF, "_set_client_connection", lambda *args, **kwargs: CogniteClientMock()
+    )
+    return CDF("test", "akerbp-dev", "client-id", "tenant-id", hooks=[EventCollector()])
 
 
 def test_create_cognite_db_extractor_config() -> None:
@@ -35,3 +71,356 @@ def test_create_cognite_db_extractor_config() -> None:
         dwh_config_key="ods_dm_synergi_prod",
         cdf_config_key="cdf_prod_synergi",
     )) == "{'version': '2.1.2', 'logger': {'file': {'level': 'INFO', 'path': 'logs\\\\info.log', 'retention': 7}}, 'cognite': {'project': 'akerbp', 'idp-authentication': {'token-url': 'https://login.microsoftonline.com/3b7e4170-8348-4aa4-bfae-06a3e1867469/oauth2/v2.0/token', 'client-id': '7ed10d54-11dc-4102-ad65-dcef7ba7cf2d', 'secret': None, 'scopes': ['https://api.cognitedata.com/.default']}}, 'extractor': {'state-store': {'local': {'path': 'state\\\\state-store.json', 'save-interval': 60}}}, 'databases': [{'name': 'BI_DetNor_ODS', 'connection-string': 'DRIVER={ODBC Driver 17 for SQL Server};SERVER=DWH-SQL-PROD;DATABASE=BI_DetNor_ODS;Trusted_Connection=yes'}, {'name': 'DM_Synergi', 'connection-string': 'DRIVER={ODBC Driver 17 for SQL Server};SERVER=DWH-SQL-PROD;DATABASE=DM_Synergi;Trusted_Connection=yes'}], 'queries': [{'name': 'Synergi_3_1_Status', 'database': 'BI_DetNor_ODS', 'query': 'SELECT *, CONVERT(VARCHAR(19), GETDATE(), 126) as _ingestionDT FROM Synergi_3_1_Status', 'primary-key': '{Status_Id}', 'destination-type': 'RAW', 'destination': {'database': 'synergi', 'table': 'Synergi_3_1_Status'}}, {'name': 'Synergi_3_1_StatusDescription', 'database': 'BI_DetNor_ODS', 'query': 'SELECT *, CONVERT(VARCHAR(19), GETDATE(), 126) as _ingestionDT FROM Synergi_3_1_StatusDescription', 'primary-key': '{StatusDescription_Id}', 'destination-type': 'RAW', 'destination': {'database': 'synergi', 'table': 'Synergi_3_1_StatusDescription'}}, {'name': 'Fact_HSSEQ_KPI_Actual', 'database': 'DM_Synergi', 'query': 'SELECT *, CONVERT(VARCHAR(19), GETDATE(), 126) as _ingestionDT FROM Fact_HSSEQ_KPI_Actual', 'primary-key': '{Fact_HSSEQ_KPI_Actual_Id}', 'destination-type': 'RAW', 'destination': {'database': 'synergi', 'table': 'Fact_HSSEQ_KPI_Actual'}}, {'name': 'KPI_HSE', 'database': 'DM_Synergi', 'query': 'SELECT *, CONVERT(VARCHAR(19), GETDATE(), 126) as _ingestionDT FROM KPI_HSE', 'primary-key': '{KPI_HSE_Id}', 'destination-type': 'RAW', 'destination': {'database': 'synergi', 'table': 'KPI_HSE'}}]}"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_records_from_multiple_tables(cdf, max_workers) -> None:
+    tables = [f"table-{i}" for i in range(8)]
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def retrieve_dataframe(db_name, table_name, *args) -> pd.DataFrame:
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        if table_name == "table-3":
+            raise ValueError("bad table")
+        return pd.DataFrame({"table": [table_name] * int(table_name[-1])})
+
+    cdf.client.raw.rows.retrieve_dataframe.side_effect = retrieve_dataframe
+
+    with pytest.raises(RuntimeError, match="1 of 8 tables"):
+        cdf.get_records_from_multiple_tables("db", tables, max_workers=max_workers)
+
+    records = cdf.get_records_from_multiple_tables(
+        "db", tables, max_workers=max_workers, ignore_errors=True
+    )
+
+    assert list(records) == [i for i in tables if i != "table-3"]
+    assert [len(i) for i in records.values()] == [0, 1, 2, 4, 5, 6, 7]
+    assert list(cdf.failed_tables) == ["table-3"]
+    assert peak[0] == max_workers
+
+    events = cdf.hooks[0].by_table("table")
+    assert events["table-3"][-1]["status"] == "failed"
+    assert events["table-7"][-1]["rows"] == 7
+
+
+def test_iter_records_by_partition(cdf, tmp_path) -> None:
+    chunks = [
+        RowList([Row(f"{p}-{i}", {"partition": p, "i": i}) for i in range(3)])
+        for p in range(4)
+    ]
+    cdf.client.raw.rows.side_effect = lambda *args, **kwargs: iter(chunks)
+
+    frames = list(cdf.iter_records("db", "table", partitions=4))
+    dataset = cdf.get_records("db", "table", partitions=4, sink=tmp_path / "table")
+
+    assert [len(i) for i in frames] == [3, 3, 3, 3]
+    assert frames[1].index.tolist() == ["1-0", "1-1", "1-2"]
+    assert cdf.client.raw.rows.call_args.kwargs["partitions"] == 4
+    assert dataset.rows == 12
+    assert dataset.to_pandas().columns.tolist() == ["key", "partition", "i"]
+
+
+def test_get_records_into_sink_sparse_rows(cdf, tmp_path) -> None:
+    chunks = [
+        RowList([Row("a", {"v": 1}), Row("b"), Row("c", {})]),
+        RowList([Row("d", {"v": "x", "w": 2.5}), Row("e", {"v": 3})]),
+    ]
+    cdf.client.raw.rows.side_effect = lambda *args, **kwargs: iter(chunks)
+
+    df = cdf.get_records("db", "table", sink=tmp_path / "table").to_pandas()
+
+    assert df.columns.tolist() == ["key", "v", "w"]
+    assert df["key"].tolist() == ["a", "b", "c", "d", "e"]
+    assert df["v"].tolist() == ["1", None, None, "x", "3"]
+    assert df["w"].fillna(-1).tolist() == [-1, -1, -1, 2.5, -1]
+
+
+def test_get_stale_records(cdf, tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tables = {
+        "fresh": [Row("a", {"_ingestionDT": "2024-01-10T00:00:00"})],
+        "mixed": [
+            Row("a", {"_ingestionDT": "2024-01-10T00:00:00"}),
+            Row("b", {"_ingestionDT": "2024-01-09T20:00:00"}),
+            Row("c", {"_ingestionDT": "2024-01-01T00:00:00"}),
+            Row("d", {}),
+        ],
+        "empty": [],
+    }
+    cdf.client.raw.rows.side_effect = lambda db_name, table, *args, **kwargs: iter(
+        [RowList(tables[table][:2]), RowList(tables[table][2:])]
+    )
+
+    stale = cdf.get_stale_records(
+        "db", list(tables), "_ingestionDT", datetime(2024, 6, 1), export_details=True
+    )
+
+    assert stale == {"empty": [], "fresh": [], "mixed": ["c"]}
+    assert cdf.client.raw.rows.call_args.kwargs["columns"] == ["_ingestionDT"]
+    details = json.loads(next(tmp_path.glob("db_stale_records_*.log")).read_text())
+    assert details["mixed"] == ["c | 2024-01-01T00:00:00"]
+
+    # Rows without the field only on request
+    stale = cdf.get_stale_records(
+        "db", ["mixed"], "_ingestionDT", datetime(2024, 6, 1), missing_is_stale=True
+    )
+    assert stale == {"mixed": ["c", "d"]}
+
+    # Cutoff from records_before when it is earlier than the newest record
+    stale = cdf.get_stale_records(
+        "db", ["mixed"], "_ingestionDT", datetime(2024, 1, 1, 3), missing_is_stale=True
+    )
+    assert stale == {"mixed": ["d"]}
+
+
+def test_delete_records_in_chunks_resumes(cdf, tmp_path) -> None:
+    table_keys = {"a": [f"a-{i}" for i in range(10)], "b": [f"b-{i}" for i in range(5)]}
+    journal = tmp_path / "delete-journal.jsonl"
+    deleted: list[str] = list()
+    failures = {"a-4": [503, 400], "b-0": [429]}
+    lock = threading.Lock()
+
+    def delete(db_name, table_name, key) -> None:
+        with lock:
+            if failures.get(key[0]):
+                raise CogniteAPIError("failed", code=failures[key[0]].pop(0))
+            deleted.extend(key)
+
+    cdf.client.raw.rows.delete.side_effect = delete
+    kwargs = dict(chunk_size=2, max_workers=4, backoff_base=0, journal=journal)
+
+    with pytest.raises(RuntimeError, match="1 of 8 chunks"):
+        cdf.delete_records_in_chunks("db", table_keys, **kwargs)
+
+    assert len(ChunkJournal(journal)) == 7
+    assert sorted(deleted) == sorted(set(sum(table_keys.values(), [])) - {"a-4", "a-5"})
+
+    assert cdf.delete_records_in_chunks("db", table_keys, **kwargs) == {"a": 2, "b": 0}
+    assert sorted(deleted) == sorted(sum(table_keys.values(), []))
+    assert not journal.exists()
+    events = [i for i in cdf.hooks[0].of_type("delete") if i["status"] == "ok"]
+    assert [i["attempts"] for i in events].count(2) == 1
+
+
+@pytest.mark.parametrize(
+    "uid_key_list, hash_key, expected",
+    [
+        (["plant", "order"], False, ["1000-1", "1000-2", "1100-1"]),
+        (["plant", "order"], True, r"[0-9a-f]{16}"),
+        (None, False, r"[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}"),
+    ],
+)
+def test_set_table_key(cdf, uid_key_list, hash_key, expected) -> None:
+    pipeline = Pipeline(None, None, uid_key_list, cdf, "db", "table", hash_key=hash_key)
+    pipeline.data = pd.DataFrame({"plant": ["1000", "1000", "1100"], "order": [1, 2, 1]})
+
+    pipeline.set_table_key()
+
+    if isinstance(expected, list):
+        assert pipeline.data.index.tolist() == expected
+    else:
+        assert pipeline.data.index.str.fullmatch(expected).all()
+        assert pipeline.data.index.is_unique
+
+
+def test_push_data_resumes_from_checkpoint(cdf, tmp_path) -> None:
+    checkpoint = tmp_path / "push-checkpoint.jsonl"
+    data = pd.DataFrame({"value": range(10)}, index=[f"key-{i}" for i in range(10)])
+    pushed: list[str] = list()
+    failures = {"key-4": [400]}
+    lock = threading.Lock()
+
+    def insert_dataframe(db_name, table_name, dataframe, ensure_parent) -> None:
+        with lock:
+            if failures.get(dataframe.index[0]):
+                raise CogniteAPIError("failed", code=failures[dataframe.index[0]].pop(0))
+            pushed.extend(dataframe.index)
+
+    cdf.client.raw.rows.insert_dataframe.side_effect = insert_dataframe
+    kwargs = dict(chunk_rows=2, max_workers=3, checkpoint=checkpoint)
+
+    pipeline = Pipeline(None, None, None, cdf, "db", "table", **kwargs)
+    pipeline.data = data
+    with pytest.raises(RuntimeError, match="1 of 5 chunks"):
+        pipeline.push_data()
+
+    assert len(ChunkJournal(checkpoint)) == 4
+
+    resumed = Pipeline(None, None, None, cdf, "db", "table", **kwargs)
+    resumed.data = data
+    resumed.push_data()
+
+    assert sorted(pushed) == sorted(data.index)
+    assert not checkpoint.exists()
+
+
+def test_push_data_refuses_resume_with_generated_keys(cdf, tmp_path) -> None:
+    checkpoint = tmp_path / "push-checkpoint.jsonl"
+    ChunkJournal(checkpoint).record(ChunkJournal.chunk_id("table", ["key-0"]))
+
+    pipeline = Pipeline(None, None, None, cdf, "db", "table", checkpoint=checkpoint)
+    pipeline.data = pd.DataFrame({"value": range(10)})
+    with pytest.raises(ValueError, match="generated keys"):
+        pipeline.set_table_key()
+
+    pipeline = Pipeline(None, None, "value", cdf, "db", "table", checkpoint=checkpoint)
+    pipeline.data = pd.DataFrame({"value": range(10)})
+    pipeline.set_table_key()
+
+
+def test_insert_dataframe_in_chunks_by_bytes(cdf) -> None:
+    # 8 bytes per row
+    data = pd.DataFrame({"value": range(1_000)}, index=range(1_000))
+
+    assert cdf.insert_dataframe_in_chunks("db", "table", data, chunk_bytes=800) == 1_000
+    sizes = [len(i.args[2]) for i in cdf.client.raw.rows.insert_dataframe.call_args_list]
+    assert max(sizes) in range(95, 101) and sum(sizes) == 1_000
+
+
+@pytest.mark.parametrize("snapshot", [True, False])
+def test_push_data_delta(cdf, tmp_path, snapshot) -> None:
+    raw: dict[str, dict] = dict()
+
+    def insert_dataframe(db_name, table_name, dataframe, ensure_parent) -> None:
+        raw.update(dataframe.to_dict(orient="index"))
+
+    def delete(db_name, table_name, key) -> None:
+        for i in key:
+            raw.pop(i)
+
+    def rows(db_name, table_name, *args, columns=None, **kwargs):
+        yield RowList([Row(k, {c: v[c] for c in columns}) for k, v in raw.items()])
+
+    cdf.client.raw.rows.insert_dataframe.side_effect = insert_dataframe
+    cdf.client.raw.rows.delete.side_effect = delete
+    cdf.client.raw.rows.side_effect = rows
+    kwargs = dict(
+        delta=True,
+        delta_snapshot=tmp_path / "snapshot.parquet" if snapshot else None,
+        delete_vanished=True,
+    )
+
+    def run(orders: list[int], status: list[str]) -> list[str]:
+        pipeline = Pipeline(None, None, ["order"], cdf, "db", "table", **kwargs)
+        pipeline.data = pd.DataFrame({"order": orders, "status": status})
+        pipeline.set_table_key()
+        cdf.client.raw.rows.insert_dataframe.reset_mock()
+        pipeline.push_data()
+        calls = cdf.client.raw.rows.insert_dataframe.call_args_list
+        return sorted(sum([i.args[2].index.tolist() for i in calls], []))
+
+    assert run([1, 2, 3], ["open", "open", "open"]) == ["1", "2", "3"]
+    assert run([1, 2, 3], ["open", "open", "open"]) == []
+    assert run([1, 2, 4], ["open", "closed", "open"]) == ["2", "4"]
+    assert sorted(raw) == ["1", "2", "4"]
+    assert raw["2"]["status"] == "closed"
+
+
+def test_push_data_delta_raw_round_trip(cdf) -> None:
+    raw: dict[str, dict] = dict()
+
+    def insert_dataframe(db_name, table_name, dataframe, ensure_parent) -> None:
+        # Rows are sent as JSON without NaN, the same as RawRowsAPI.insert_dataframe
+        rows = RawRowsAPI._df_to_rows_skip_nans(dataframe)
+        raw.update(json.loads(_json.dumps(rows)))
+
+    def rows(db_name, table_name, *args, columns=None, **kwargs):
+        yield RowList(
+            [Row(k, {c: v[c] for c in columns if c in v}) for k, v in raw.items()]
+        )
+
+    cdf.client.raw.rows.insert_dataframe.side_effect = insert_dataframe
+    cdf.client.raw.rows.side_effect = rows
+    data = pd.DataFrame(
+        {
+            "order": [1, 2, 3],
+            "quantity": [1.0, None, 2.5],
+            "priority": pd.array([1, None, 3], dtype="Int64"),
+            "done": [True, False, True],
+            "plant": ["0001", None, "1100"],
+        }
+    )
+
+    def run(data: pd.DataFrame) -> int:
+        pipeline = Pipeline(None, None, ["order"], cdf, "db", "table", delta=True)
+        pipeline.data = data.copy()
+        pipeline.set_table_key()
+        cdf.client.raw.rows.insert_dataframe.reset_mock()
+        pipeline.push_data()
+        calls = cdf.client.raw.rows.insert_dataframe.call_args_list
+        return sum(len(i.args[2]) for i in calls)
+
+    assert run(data) == 3
+    assert run(data) == 0
+    assert run(data.assign(quantity=[1.0, None, 2.0])) == 1
+
+
+def test_seen_keys() -> None:
+    seen = SeenKeys()
+    for start in range(0, 1_000, 100):
+        keys = pd.Index([f"key-{i}" for i in range(start, start + 100)])
+        assert not seen.contains(keys).any()
+        seen.add(keys)
+
+    assert len(seen) == 1_000 and len(seen._runs) <= 4
+    assert "key-999" in seen and "key-1000" not in seen
+    assert seen.contains(pd.Index(["key-5", "new", "key-500"])).tolist() == [
+        True,
+        False,
+        True,
+    ]
+
+
+def test_seen_keys_empty_chunk() -> None:
+    seen = SeenKeys()
+    for keys in [["a", "b"], [], ["c"]]:
+        assert not seen.contains(pd.Index(keys, dtype=object)).any()
+        seen.add(pd.Index(keys, dtype=object))
+
+    assert len(seen) == 3 and "c" in seen and "d" not in seen
+
+
+def test_run_pipeline_streams_csv(cdf, tmp_path) -> None:
+    source = tmp_path / "orders.csv"
+    pd.DataFrame({"order": range(250), "plant": "Ålgård"}).to_csv(
+        source, sep=";", encoding="latin-1", index=False
+    )
+    pushed: list[int] = list()
+    cdf.client.raw.rows.insert_dataframe.side_effect = (
+        lambda db_name, table_name, dataframe, ensure_parent: pushed.append(
+            len(dataframe)
+        )
+    )
+
+    pipeline = Pipeline(source, None, ["order"], cdf, "db", "table", chunk_rows=100)
+    pipeline.run_pipeline(stream=True)
+
+    assert pushed == [100, 100, 50]
+    assert pipeline.data["plant"].iloc[0] == "Ålgård"
+
+    with source.open("a", encoding="latin-1") as f:
+        f.write("7;Ålgård\n")
+    with pytest.raises(ValueError, match="1 keys of the chunk are in earlier chunks"):
+        pipeline.run_pipeline(stream=True)
+
+
+def test_run_pipeline_reads_parquet(cdf, tmp_path) -> None:
+    source = tmp_path / "orders.parquet"
+    pd.DataFrame({"order": range(250), "priority": 1}).to_parquet(source)
+    pushed: list[pd.DataFrame] = list()
+    cdf.client.raw.rows.insert_dataframe.side_effect = (
+        lambda db_name, table_name, dataframe, ensure_parent: pushed.append(dataframe)
+    )
+    kwargs = dict(chunk_rows=100, dtype={"priority": "int8"})
+
+    Pipeline(source, None, ["order"], cdf, "db", "table", **kwargs).run_pipeline()
+    Pipeline(source, None, ["order"], cdf, "db", "table", **kwargs).run_pipeline(True)
+
+    assert [len(i) for i in pushed] == [100, 100, 50, 100, 100, 50]
+    assert all(str(i["priority"].dtype) == "int8" for i in pushed)
@@ -0,0 +1,82 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from aker_utilities.api_extractor import Extractor
+from aker_utilities.columnar_sink import ColumnarDataset, ColumnarSink
+from aker_utilities.tests.conftest import ROWS
+
+
+@pytest.mark.parametrize("sink_format", ["parquet", "arrow"])
+def test_get_records_into_sink(endpoint, tmp_path, sink_format) -> None:
+    apim = Extractor("key", page_size=100, max_workers=4)
+    dataset = apim.get_records(endpoint, sink=tmp_path / "rows", sink_format=sink_format)
+
+    assert isinstance(dataset, ColumnarDataset)
+    assert dataset.rows == len(ROWS)
+    assert max(len(i) for i in dataset.iter_batches(batch_size=400)) <= 400
+    assert dataset.to_pandas()["id"].tolist() == [i["id"] for i in ROWS]
+
+
+def test_sink_unifies_page_schemas(tmp_path) -> None:
+    with ColumnarSink(tmp_path / "rows", max_rows_per_file=2) as sink:
+        sink.write([{"id": 1, "note": None}, {"id": 2, "note": None}])
+        sink.write([{"id": 3, "note": "text", "extra": 1.5}])
+        sink.write(pd.DataFrame({"id": [4]}))
+
+    dataset = sink.dataset
+    assert len(dataset.files) == 2
+    assert dataset.schema == pa.schema(
+        [("id", pa.int64()), ("note", pa.string()), ("extra", pa.float64())]
+    )
+    df = dataset.to_pandas()
+    assert df["note"].tolist() == [None, None, "text", None]
+    assert df["extra"].tolist()[2] == 1.5
+
+
+@pytest.mark.parametrize(
+    "pages, expected_type, expected",
+    [
+        ([[{"a": None}], [{"a": 1}]], pa.int64(), [-1, 1]),
+        ([[{"a": 1}], [{"a": 1.5}]], pa.float64(), [1.0, 1.5]),
+        ([[{"a": 1}], [{"a": "x"}]], pa.string(), ["1", "x"]),
+        ([[{"a": "x"}], [{"a": 1}]], pa.string(), ["x", "1"]),
+    ],
+)
+def test_sink_promotes_parquet_types(tmp_path, pages, expected_type, expected) -> None:
+    with ColumnarSink(tmp_path / "rows") as sink:
+        for page in pages:
+            sink.write(page)
+
+    for file in sink.dataset.files:
+        assert pq.read_schema(file).field("a").type == expected_type
+    for df in [sink.dataset.to_pandas(), pd.concat(sink.dataset.iter_batches())]:
+        assert df["a"].fillna(-1).tolist() == expected
+
+
+def test_sink_arrow_stream_schema(tmp_path) -> None:
+    with ColumnarSink(tmp_path / "rows", format="arrow") as sink:
+        sink.write([{"id": 1, "note": None, "value": 1.5}])
+        sink.write([{"id": 2, "note": 3, "value": 2}])
+        with pytest.raises(ValueError, match="Arrow stream"):
+            sink.write([{"id": 3, "extra": True}])
+
+    assert sink.dataset.schema == pa.schema(
+        [("id", pa.int64()), ("note", pa.string()), ("value", pa.float64())]
+    )
+    assert sink.dataset.to_pandas()["note"].tolist() == [None, "3"]
+
+
+def test_sink_explicit_schema(tmp_path) -> None:
+    schema = pa.schema([("id", pa.int64()), ("note", pa.string())])
+    with ColumnarSink(tmp_path / "rows", schema=schema) as sink:
+        sink.write([{"id": 1}])
+        sink.write(pd.DataFrame({"id": [2], "note": ["text"]}))
+        with pytest.raises(ValueError, match="extra"):
+            sink.write([{"id": 3, "extra": 1}])
+        with pytest.raises(ValueError, match="id"):
+            sink.write([{"id": "x"}])
+
+    assert sink.dataset.schema == schema
+    assert sink.dataset.to_pandas()["note"].tolist() == [None, "text"]
@@ -0,0 +1,19 @@
+import json
+
+from aker_utilities.events import EventCollector, JsonLinesEventWriter, emit_event
+
+
+def test_emit_event_to_hooks(tmp_path) -> None:
+    path = tmp_path / "events.jsonl"
+    collector = EventCollector()
+
+    def failing_hook(event: dict) -> None:
+        raise RuntimeError("hook is down")
+
+    emit_event([failing_hook, JsonLinesEventWriter(path), collector], "page", table="a")
+    emit_event([JsonLinesEventWriter(path), collector], "endpoint", table="a", rows=3)
+
+    lines = [json.loads(i) for i in path.read_text().splitlines()]
+    assert [i["event"] for i in lines] == ["page", "endpoint"]
+    assert collector.events == lines
+    assert collector.by_table("endpoint") == {"a": [lines[1]]}
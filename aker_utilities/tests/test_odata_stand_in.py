@@ -0,0 +1,30 @@
+import requests
+
+from aker_utilities.tests.odata_stand_in import (
+    ODataCollection,
+    ODataStandIn,
+    parse_filter,
+    synthetic_row,
+)
+
+
+def test_parse_filter() -> None:
+    predicate = parse_filter(
+        "notChangeDate ge datetime'2023-11-14T22:13:30' and notType eq 'M2'"
+    )
+
+    assert [i for i in range(20) if predicate(synthetic_row(i))] == [10, 13, 16, 19]
+
+
+def test_stand_in_serves_synthetic_rows() -> None:
+    collection = ODataCollection(size=100_000)
+
+    with ODataStandIn({"Notifications": collection}, latency=0.01) as server:
+        url = f"{server.url}/Notifications"
+        page = requests.get(f"{url}?$skip=99990&$top=50").json()["d"]["results"]
+        count = requests.get(f"{url}/$count?$filter=id ge 99000").text
+        missing = requests.get(f"{server.url}/Missing")
+
+    assert page == [synthetic_row(i) for i in range(99_990, 100_000)]
+    assert count == "1000"
+    assert missing.status_code == 404
@@ -0,0 +1,166 @@
+import uuid
+
+import pandas as pd
+import pytest
+
+from aker_utilities.pandas_utils import (
+    compact_dtypes,
+    hash_columns,
+    iter_dataframe,
+    join_columns,
+    memory_usage_mb,
+    read_dataframe,
+    uuid4_strings,
+)
+from aker_utilities.tests.odata_stand_in import synthetic_row
+
+
+def test_compact_dtypes() -> None:
+    df = pd.DataFrame.from_records([synthetic_row(i) for i in range(1_000)])
+    df["leadingZeros"] = [f"{i:06d}" for i in range(1_000)]
+    df["isoDate"] = "2024-11-20T08:00:00"
+    df.loc[3, "notDescription"] = None
+
+    compact = compact_dtypes(df)
+
+    assert compact.dtypes.astype(str).to_dict() == {
+        "id": "int64",
+        "notNotification": "Int64",
+        "notType": "category",
+        "notPlanningPlant": "category",
+        "notDescription": "string",
+        "notPriority": "int64",
+        "notChangeDate": "datetime64[ns]",
+        "leadingZeros": "string",
+        "isoDate": "datetime64[ns]",
+    }
+    assert compact.loc[1, "notChangeDate"] == pd.Timestamp("2023-11-14 22:13:21")
+    assert compact.loc[7, "leadingZeros"] == "000007"
+    assert pd.isna(compact.loc[3, "notDescription"])
+    assert memory_usage_mb(compact) < memory_usage_mb(df.astype(str)) / 3
+
+
+def test_compact_dtypes_out_of_bounds_dates() -> None:
+    df = pd.DataFrame(
+        {
+            "odataDate": ["/Date(253402214400000)/", "/Date(1700000000000)/", None],
+            "isoDate": ["9999-12-31T00:00:00", "2024-11-20T08:00:00", None],
+            "isoOffset": ["9999-12-31T00:00:00+01:00", "2024-11-20T08:00:00Z", None],
+            "isoInvalid": ["0000-00-00", "2024-02-30", None],
+            "isoMixed": ["2024-11-20T08:00:00+01:00", "2024-11-20T08:00:00+02:00", None],
+        }
+    )
+
+    compact = compact_dtypes(df)
+
+    assert compact.dtypes.astype(str).to_dict() == {
+        "odataDate": "datetime64[ms]",
+        "isoDate": "datetime64[ms]",
+        "isoOffset": "string",
+        "isoInvalid": "string",
+        "isoMixed": "string",
+    }
+    assert compact.loc[0, "odataDate"] == pd.Timestamp("9999-12-31")
+    assert compact.loc[1, "isoDate"] == pd.Timestamp("2024-11-20 08:00:00")
+    assert compact.loc[0, "isoOffset"] == "9999-12-31T00:00:00+01:00"
+    assert compact.loc[1, "isoInvalid"] == "2024-02-30"
+    assert compact.loc[1, "isoMixed"] == "2024-11-20T08:00:00+02:00"
+    assert compact.loc[2].isna().all()
+
+
+def test_key_builders() -> None:
+    df = pd.DataFrame.from_records([synthetic_row(i) for i in range(1_000)])
+    df.loc[5, "notType"] = None
+    columns = ["notNotification", "notType", "notPriority"]
+
+    joined = join_columns(df, columns)
+    hashed = hash_columns(df, columns)
+    uuids = uuid4_strings(len(df))
+
+    expected = df[columns].apply(lambda row: "-".join(row.values.astype(str)), axis=1)
+    assert joined.equals(expected)
+    assert joined[5] == "10000005-None-1"
+    assert hashed.equals(hash_columns(df.copy(), columns))
+    assert hashed.str.fullmatch(r"[0-9a-f]{16}").all() and hashed.is_unique
+    assert all(str(uuid.UUID(i)) == i and uuid.UUID(i).version == 4 for i in uuids)
+    assert len(set(uuids)) == len(df)
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_read_dataframe_csv(tmp_path, engine) -> None:
+    path = tmp_path / "notifications.csv"
+    df = pd.DataFrame.from_records([synthetic_row(i) for i in range(100)])
+    df["plant"] = ["0001", "Ålgård"] * 50
+    df["date"] = "2024-11-20"
+    df["changed"] = "2024-11-20 08:00:00"
+    df["changedUTC"] = "2024-11-20T08:00:00Z"
+    df["time"] = "08:00:00"
+    df["empty"] = None
+    df.loc[3, "notDescription"] = None
+    df.to_csv(path, sep=";", encoding="latin-1", index=False)
+
+    dtype = {"plant": str, "notPriority": "int32"}
+    read = read_dataframe(path, engine, dtype=dtype)
+
+    assert read.equals(read_dataframe(path, "c", dtype=dtype))
+    assert read.loc[0, "plant"] == "0001" and read.loc[1, "plant"] == "Ålgård"
+    assert read.loc[0, "date"] == "2024-11-20"
+    assert read.loc[0, "changed"] == "2024-11-20 08:00:00"
+    assert read.loc[0, "changedUTC"] == "2024-11-20T08:00:00Z"
+    assert read.loc[0, "time"] == "08:00:00"
+    assert str(read["empty"].dtype) == "float64"
+    assert str(read["notPriority"].dtype) == "int32"
+    assert pd.isna(read.loc[3, "notDescription"])
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_iter_dataframe_csv(tmp_path, engine) -> None:
+    # About 3 MB, more than one pyarrow block
+    path = tmp_path / "notifications.csv"
+    df = pd.DataFrame.from_records([synthetic_row(i) for i in range(20_000)])
+    df["plant"] = ["0001", "Ålgård"] * 10_000
+    df.to_csv(path, sep=";", encoding="latin-1", index=False)
+
+    dtype = {"plant": str, "notPriority": "int32"}
+    chunks = list(iter_dataframe(path, 7_000, engine, dtype=dtype))
+
+    assert [len(i) for i in chunks] == [7_000, 7_000, 6_000]
+    assert pd.concat(chunks).equals(read_dataframe(path, "c", dtype=dtype))
+
+
+def test_iter_dataframe_csv_type_change_in_late_block(tmp_path) -> None:
+    path = tmp_path / "notifications.csv"
+    df = pd.DataFrame.from_records([synthetic_row(i) for i in range(20_000)])
+    df["code"] = [str(i) for i in range(20_000)]
+    df.loc[19_990, "code"] = "A12"
+    df.to_csv(path, sep=";", encoding="latin-1", index=False)
+
+    chunks = list(iter_dataframe(path, 7_000, "pyarrow"))
+    read = pd.concat(chunks)
+
+    assert [len(i) for i in chunks] == [7_000, 7_000, 6_000]
+    assert read.index.equals(pd.RangeIndex(20_000))
+    assert read["code"].astype(str).tolist() == df["code"].astype(str).tolist()
+    expected = read_dataframe(path, "c", dtype={"code": str})
+    assert read.drop(columns="code").equals(expected.drop(columns="code"))
+
+
+def test_read_dataframe_parquet(tmp_path) -> None:
+    path = tmp_path / "notifications.parquet"
+    pd.DataFrame.from_records([synthetic_row(i) for i in range(10)]).to_parquet(path)
+
+    read = read_dataframe(path, dtype={"notPriority": "int8"})
+
+    assert len(read) == 10 and str(read["notPriority"].dtype) == "int8"
+    with pytest.raises(ValueError, match="not supported"):
+        read_dataframe(tmp_path / "notifications.txt")
+
+
+@pytest.mark.parametrize(
+    "file, engine", [("a.csv", "openpyxl"), ("a.xlsx", "c"), ("a.parquet", "calamine")]
+)
+def test_read_dataframe_rejects_engine(tmp_path, file, engine) -> None:
+    with pytest.raises(ValueError, match="engine for .* files must be either one of"):
+        read_dataframe(tmp_path / file, engine)
+    with pytest.raises(ValueError, match="'auto'"):
+        next(iter_dataframe(tmp_path / file, engine=engine))
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import requests
+
+from aker_utilities.api_extractor import Extractor
+from aker_utilities.response_cache import CACHE_HEADER, ResponseCache
+from aker_utilities.tests.conftest import ROWS
+from aker_utilities.tests.odata_stand_in import ODataCollection, ODataStandIn
+
+
+def test_get_records_from_response_cache(tmp_path) -> None:
+    with ODataStandIn({"Rows": ODataCollection(ROWS)}) as server:
+        endpoint = (f"{server.url}/Rows", "rows", "{id}")
+        first = Extractor("key", page_size=400, max_workers=4, response_cache=tmp_path)
+        expected = first.get_records(endpoint)["id"].tolist()
+        requests_made = server.requests
+
+        repeat = Extractor("key", page_size=400, max_workers=4, response_cache=tmp_path)
+        assert repeat.get_records(endpoint)["id"].tolist() == expected
+        assert server.requests == requests_made
+
+    assert expected == [i["id"] for i in ROWS]
+
+
+def test_response_cache_revalidates_expired(tmp_path) -> None:
+    with ODataStandIn({"Rows": ODataCollection(ROWS)}) as server:
+        url = f"{server.url}/Rows?$skip=0&$top=10"
+        cache = ResponseCache(tmp_path, ttl=timedelta(0))
+        with requests.Session() as session:
+            first = cache.get(session, url)
+            revalidated = cache.get(session, url)
+
+        assert CACHE_HEADER not in first.headers
+        assert revalidated.headers[CACHE_HEADER] == "revalidated"
+        assert revalidated.json() == first.json()
+        assert (server.requests, server.not_modified) == (2, 1)
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path) -> None:
+    with ODataStandIn({"Rows": ODataCollection(ROWS)}) as server:
+        urls = [f"{server.url}/Rows?$skip={i}&$top=10" for i in (0, 10, 20)]
+        with requests.Session() as session:
+            size = len(session.get(urls[0]).content)
+            cache = ResponseCache(tmp_path, ttl=None, max_bytes=2 * size + size // 2)
+            cache.get(session, urls[0])
+            cache.get(session, urls[1])
+            cache.get(session, urls[0])
+            cache.get(session, urls[2])
+
+            assert len(cache) == 2
+            assert cache.get(session, urls[0]).headers[CACHE_HEADER] == "hit"
+            assert CACHE_HEADER not in cache.get(session, urls[1]).headers